@@ -31,6 +31,10 @@ class Player(Sprite):
         self.fighting.reset_attack_properties()
         self.properties.reset_properties()
 
+    def release_assets(self) -> None:
+        self.animations.release_assets()
+        self.ui.release_assets()
+
     def collect_items(self, items):
         for item in items:
             self.equipment.add_item(item)
@@ -2,7 +2,8 @@ import pygame
 from tools.settings import PLAYER_SIZE, SHOW_COLLISION_RECTANGLES, SHOW_IMAGE_RECTANGLES, \
     SHOW_PLAYER_STATUS, WHITE, YELLOW, FONT_SMALL, SHOW_STATUS_SPACE, PLAYER_ANIMATIONS_PATH, \
     PLAYER_DEATH_ANIMATION_SPEED, TILE_SIZE, FPS
-from tools.support import import_character_assets, calculate_animation_speed, draw_text
+from tools.support import calculate_animation_speed, draw_text
+from tools.assets import assets
 
 
 class PlayerAnimations:
@@ -12,6 +13,8 @@ class PlayerAnimations:
                                  'shield': [], 'arch': []}
         self.animations = {}
         self.flip_animations = {}
+        self.animations_asset = ('animations', PLAYER_ANIMATIONS_PATH, tuple(self.animations_names), TILE_SIZE / 32)
+        self.loaded = False
         self.image = None
         self.rect = None
         self.frame_index = 0
@@ -33,11 +36,17 @@ class PlayerAnimations:
         self.rect.midbottom = position
 
     def load_animations(self, position: tuple[int, int]) -> None:
-        self.animations = import_character_assets(self.animations_names.copy(), PLAYER_ANIMATIONS_PATH, scale=TILE_SIZE / 32)
-        self.flip_animations = import_character_assets(self.animations_names.copy(), PLAYER_ANIMATIONS_PATH, scale=TILE_SIZE / 32, flip=True)
+        if not self.loaded:
+            self.animations, self.flip_animations = assets.acquire(*self.animations_asset)
+            self.loaded = True
         self.set_image(self.animations['idle'][self.frame_index])
         self.set_rect(self.image.get_rect(midbottom=position))
 
+    def release_assets(self) -> None:
+        if self.loaded:
+            assets.release(*self.animations_asset)
+            self.loaded = False
+
     def animate(self, player_status, player_attack, player_defence, player_movement):  # Animate method
         status = player_status.status
         animation = self.flip_character(player_status)[status]
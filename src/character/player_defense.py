@@ -1,4 +1,3 @@
-import pygame
 from typing import Any
 from tools.settings import PLAYER_IMMUNITY_FROM_HIT, PLAYER_SHIELD_COOLDOWN
 from tools.support import now
@@ -47,14 +46,14 @@ class PlayerDefense:
 
     def kill(self) -> None:
         self.player.properties.set_dead('status', True)
-        self.player.properties.set_dead('time', pygame.time.get_ticks())
+        self.player.properties.set_dead('time', now())
         self.player.animations.set_frame_index(0)
         self.player.movement.set_direction(x=0.0)
         self.player.status.set_status('dead')
 
     def hurt(self, damage) -> bool:
         self.just_hurt = True
-        self.just_hurt_time = pygame.time.get_ticks()
+        self.just_hurt_time = now()
         current_hp = self.player.properties.health['current']
         self.player.properties.set_health('current', current_hp - damage * self.armor_ratio)
         if self.player.properties.health['current'] <= 0:  # Death
@@ -9,6 +9,7 @@ class PlayerMovement:
         self.player = player
         self.direction = None
         self.collision_rect = self.init_movement(pos)
+        self.previous_position = None
         self.speed = PLAYER_SPEED
         self.gravity = PLAYER_GRAVITY
         self.jump_speed = PLAYER_JUMP_SPEED
@@ -22,6 +23,10 @@ class PlayerMovement:
 
     def set_position(self, position) -> None:
         self.collision_rect.midbottom = position
+        self.previous_position = None
+
+    def save_position(self) -> None:
+        self.previous_position = pygame.math.Vector2(self.collision_rect.topleft)
 
     def set_direction(self, x: float = None, y: float = None) -> None:
         if x is not None:
@@ -102,7 +107,7 @@ class PlayerMovement:
                 not self.player.defense.just_hurt: # Player use SHIELD
             self.player.defense.change_shield_status('shielding', True)
             self.player.defense.change_shield_status('able', False)
-            self.player.defense.change_shield_status('start', pygame.time.get_ticks())
+            self.player.defense.change_shield_status('start', now())
         elif keys[pygame.K_a] and \
                 self.not_in_fight() and \
                 self.player.fighting.arch['able'] and \
@@ -139,8 +144,8 @@ class PlayerMovement:
                                 element
                             )
                             self.player.equipment.open(True)
-                        self.player.equipment.loot_window.show_cooldown = pygame.time.get_ticks()
-                        self.player.equipment.show_cooldown = pygame.time.get_ticks()
+                        self.player.equipment.loot_window.show_cooldown = now()
+                        self.player.equipment.show_cooldown = now()
                 elif element.kind == 'portal':
                     self.player.next_level()
         elif keys[pygame.K_f]: # Use item
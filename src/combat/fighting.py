@@ -5,6 +5,7 @@ This module contains classes for handling combat-related elements such as
 attacks, hits, and damage calculation in a game.
 
 Classes:
+    - PooledSprite: A sprite which returns to its pool when it is killed.
     - Hit: Represents a melee hit in the game.
     - Bullet: Represents a ranged attack projectile.
     - Thunder: Represents a powerful area-of-effect attack.
@@ -14,11 +15,33 @@ Classes:
 import pygame
 from math import atan, degrees
 from tools.settings import YELLOW, RED, PLAYER_ATTACK_SIZE, SHOW_HIT_RECTANGLES, BULLET_DEFAULT_SPEED, \
-    SCREEN_HEIGHT, ENEMY_ATTACK_SIZE
+    SCREEN_HEIGHT, ENEMY_ATTACK_SIZE, SOUND_SHIELD_BLOCK_PATH, SOUND_SHIELD_BLOCK_VOLUME, SOUND_SHIELD_BLOCK_VOICES
 from tools.support import now, puts, make_vector
+from tools.assets import assets
+from tools.sounds import sounds
+from terrain.collisions import sweep_grid
+from combat.spatial_hash import SpatialHash
 
 
-class Hit(pygame.sprite.Sprite):
+class PooledSprite(pygame.sprite.Sprite):
+    """
+    A sprite which is reused instead of created again.
+
+    FightManager takes attacks from pools of killed ones and calls `reset` on them,
+    so their images and objects aren't allocated again during the fight.
+    """
+    pool = None
+
+    def kill(self):
+        """
+        Remove the sprite from all groups and put it back into its pool.
+        """
+        if self.alive() and self.pool is not None:
+            self.pool.append(self)
+        super().kill()
+
+
+class Hit(PooledSprite):
     """
     Represents a melee hit in the game.
 
@@ -34,7 +57,7 @@ class Hit(pygame.sprite.Sprite):
             on the provided surface with the given offset.
 
     """
-    def __init__(self, pos, damage, source, source_id):
+    def __init__(self, pos, damage, source, source_id, image=None):
         """
         Initialize a melee hit instance.
 
@@ -43,24 +66,22 @@ class Hit(pygame.sprite.Sprite):
             damage (int): The amount of damage the hit deals.
             source (str): The source of the hit (e.g., 'player' or 'enemy').
             source_id (int): The unique identifier of the source.
+            image (pygame.Surface): The image shared by hits of the source, created if not given.
         """
         super().__init__()
-        # Create surface
+        self.reset(pos, damage, source, source_id, image)
+
+    def reset(self, pos, damage, source, source_id, image=None):
+        """
+        Set up the hit again, for a new attack.
+        """
         self.source = source
         self.source_id = source_id
-        if self.source == 'player':
-            size = PLAYER_ATTACK_SIZE
-        else:
-            size = ENEMY_ATTACK_SIZE[self.source]
-
-        self.image = pygame.Surface(size)
-        self.image.fill(RED)
-        if SHOW_HIT_RECTANGLES: self.image.set_alpha(50)
-        else: self.image.set_alpha(0)
+        self.image = create_hit_image(source) if image is None else image
 
         self.rect = self.image.get_rect(topleft = pos)
 
-        self.attack_time = pygame.time.get_ticks()
+        self.attack_time = now()
         self.attack_duration = 100
 
         self.damage = damage
@@ -85,7 +106,7 @@ class Hit(pygame.sprite.Sprite):
         surface.blit(self.image, pos)
 
 
-class Bullet(pygame.sprite.Sprite):
+class Bullet(PooledSprite):
     """
     Represents a ranged attack projectile.
 
@@ -103,29 +124,39 @@ class Bullet(pygame.sprite.Sprite):
 
     """
 
-    def __init__(self, kind, position, source, target):
+    def __init__(self, kind, position, source, target, image):
         """
         Initialize a ranged attack projectile.
+
+        Args:
+            kind (str): The kind of the projectile (e.g., 'arrow').
+            position (tuple): The starting position of the projectile.
+            source: The character shooting the projectile.
+            target: The position the projectile is aimed at, or None to shoot straight ahead.
+            image (pygame.Surface): The image of projectiles of the kind, facing the same way as the source.
         """
         super().__init__()
+        self.reset(kind, position, source, target, image)
+
+    def reset(self, kind, position, source, target, image):
+        """
+        Set up the projectile again, for a new shot.
+        """
         self.kind = kind
         self.source = source.status.type
         self.source_id = source.status.id
 
-        self.image = pygame.image.load(f'content/graphics/weapons/{self.kind}.png').convert_alpha()
+        self.facing_right = source.status.facing_right
+        self.image = image
         self.rect = self.image.get_rect(topleft=position)
         self.start_rect = self.rect
         self.collision_rect = pygame.Rect(position, (5, 5))
 
-        self.facing_right = source.status.facing_right
         if target is None:
             self.direction = pygame.math.Vector2(1, 0)
         else:
             self.direction = make_vector(target, self.collision_rect.center)
 
-        if self.facing_right:
-            self.image = pygame.transform.flip(self.image, True, False)
-
         self.speed = BULLET_DEFAULT_SPEED[self.kind]
         if self.source == 'player':
             self.attack_range = source.fighting.arch['range']
@@ -136,14 +167,25 @@ class Bullet(pygame.sprite.Sprite):
 
         self.shielded = False
         self.character_collided = []
+        self.stopped = False
 
-    def update(self):
+    def update(self, terrain=None):
         """
            Update the projectile's position and state.
 
+        Args:
+            terrain (TileLayer): Collideable tiles. The projectile is swept along its whole step and stopped
+                where it hits terrain, so it can't pass through a tile between two frames.
         """
+        start = self.collision_rect.copy()
         self.collision_rect.x += self.direction.x * self.speed
         self.collision_rect.y += self.direction.y * self.speed
+        if terrain is not None:
+            dx, dy = self.collision_rect.x - start.x, self.collision_rect.y - start.y
+            impact = sweep_grid(start, dx, dy, terrain)
+            if impact is not None:
+                self.collision_rect.topleft = (round(start.x + dx * impact[0]), round(start.y + dy * impact[0]))
+                self.stopped = True
         if self.facing_right:
             self.rect.topright = self.collision_rect.topright
             self.rect = self.image.get_rect(topright=self.rect.topright)
@@ -159,7 +201,7 @@ class Bullet(pygame.sprite.Sprite):
         surface.blit(self.image, pos)
 
 
-class Thunder(pygame.sprite.Sprite):
+class Thunder(PooledSprite):
     """
     Represents a powerful area-of-effect attack.
 
@@ -175,7 +217,10 @@ class Thunder(pygame.sprite.Sprite):
             on the provided surface with the given offset.
 
     """
-    def __init__(self, pos, damage, source, source_id):
+    start_width = 60
+    start_height = 1500
+
+    def __init__(self, pos, damage, source, source_id, images=None):
         """
         Initialize an area-of-effect attack (thunderstorm).
 
@@ -184,18 +229,25 @@ class Thunder(pygame.sprite.Sprite):
             damage (int): The amount of damage the attack deals.
             source (str): The source of the attack (e.g., 'player' or 'enemy').
             source_id (int): The unique identifier of the source.
+            images (tuple): Full-size images of the charging and the striking thunderstorm, created if not given.
         """
         super().__init__()
+        self.reset(pos, damage, source, source_id, images)
+
+    def reset(self, pos, damage, source, source_id, images=None):
+        """
+        Set up the thunderstorm again, for a new attack.
+        """
         self.source = source
         self.source_id = source_id
 
-        self.width = 60
-        self.height = 1500
+        self.width = self.start_width
+        self.height = self.start_height
         self.position = [pos.centerx - self.width/2, pos.bottom-SCREEN_HEIGHT]
 
-        self.image = pygame.Surface((self.width, self.height))
-        self.image.fill(YELLOW)
-        self.image.set_alpha(30)
+        # Only the part of the image as wide as the shrinking thunderstorm is drawn:
+        self.images = create_thunder_images(self.width, self.height) if images is None else images
+        self.image = self.images[0]
 
         self.collision_rect = pygame.Rect(self.position, (self.width, self.height))
         self.rect = self.collision_rect
@@ -203,7 +255,7 @@ class Thunder(pygame.sprite.Sprite):
         self.speed = 1.5
 
         self.attack = False
-        self.attack_time = pygame.time.get_ticks()
+        self.attack_time = now()
         self.attack_duration = 600
 
         self.damage = damage
@@ -217,27 +269,64 @@ class Thunder(pygame.sprite.Sprite):
         if self.width > 10:
             self.width -= self.speed
             self.position[0] += (self.speed / 2)
-            self.image = pygame.Surface((self.width, self.height))
-            self.image.fill(YELLOW)
-            self.image.set_alpha(30)
             self.collision_rect = pygame.Rect((self.position), (self.width, self.height))
             self.rect = self.collision_rect
         else:
-            self.image = pygame.Surface((self.width, self.height))
-            self.image.fill(RED)
-            self.image.set_alpha(80)
+            self.image = self.images[1]
             self.collision_rect = pygame.Rect(self.position, (self.width, self.height))
             self.rect = self.collision_rect
             if not self.attack:
                 self.attack = True
-                self.attack_time = pygame.time.get_ticks()
+                self.attack_time = now()
 
     def draw(self, surface, offset):
         """
         Draw the attack area (thunderstorm) on a surface with an offset.
         """
         pos = self.rect.topleft - offset
-        surface.blit(self.image, pos)
+        surface.blit(self.image, pos, (0, 0, self.width, self.height))
+
+
+def create_hit_image(source):
+    """
+    Create the image of melee hits of a source.
+
+    Args:
+        source (str): The source of hits (e.g., 'player' or an enemy type).
+
+    Returns:
+        pygame.Surface: The image of hits, transparent unless SHOW_HIT_RECTANGLES is set.
+    """
+    if source == 'player':
+        size = PLAYER_ATTACK_SIZE
+    else:
+        size = ENEMY_ATTACK_SIZE[source]
+
+    image = pygame.Surface(size)
+    image.fill(RED)
+    if SHOW_HIT_RECTANGLES: image.set_alpha(50)
+    else: image.set_alpha(0)
+    return image
+
+
+def create_thunder_images(width, height):
+    """
+    Create images of the charging and the striking thunderstorm.
+
+    Args:
+        width (int): The starting width of the thunderstorm.
+        height (int): The height of the thunderstorm.
+
+    Returns:
+        tuple: The charging (yellow) and the striking (red) image.
+    """
+    charging = pygame.Surface((width, height))
+    charging.fill(YELLOW)
+    charging.set_alpha(30)
+    striking = pygame.Surface((width, height))
+    striking.fill(RED)
+    striking.set_alpha(80)
+    return charging, striking
 
 
 class FightManager():
@@ -255,7 +344,9 @@ class FightManager():
         - thunder_attack(source, source_id, position, damage, can_attack):
         Perform a thunder attack.
 
-        - attack_update(surface, offset): Update combat-related elements.
+        - attack_update(): Update combat-related elements.
+
+        - draw(surface, offset): Draw combat-related elements.
 
         - check_damage(player, enemies): Check and apply damage to characters.
 
@@ -271,14 +362,56 @@ class FightManager():
         self.bullet_hits = pygame.sprite.Group()
         self.thunder_hits = pygame.sprite.Group()
 
+        # Killed attacks by kind, reused for new attacks, and images shared by attacks of a kind:
+        self.pools = {}
+        self.images = {}
+
+        # Enemies near hits, sorted again in every check of damage:
+        self.enemy_hash = SpatialHash()
+
         # Sounds:
-        self.shield_block_sound = pygame.mixer.Sound('content/sounds/character/shield_block.mp3')
-        self.shield_block_sound.set_volume(0.05)
+        sounds.load(SOUND_SHIELD_BLOCK_PATH)
 
     def clear_groups(self) -> None:
-        pygame.sprite.Group.empty(self.sword_hits)
-        pygame.sprite.Group.empty(self.bullet_hits)
-        pygame.sprite.Group.empty(self.thunder_hits)
+        for group in (self.sword_hits, self.bullet_hits, self.thunder_hits):
+            for attack in group.sprites():
+                attack.kill()
+
+    def spawn(self, attack_class, kind: tuple, *params):
+        """
+        Take an attack from the pool of its kind and set it up again, or create a new one if the pool is empty.
+
+        Args:
+            attack_class: The class of the attack (Hit, Bullet or Thunder).
+            kind (tuple): The kind of the attack, which selects the pool.
+            params: Parameters of the attack, passed to `reset` or to the constructor.
+
+        Returns:
+            PooledSprite: The attack, which goes back to the pool when it is killed.
+        """
+        pool = self.pools.setdefault(kind, [])
+        if pool:
+            attack = pool.pop()
+            attack.reset(*params)
+        else:
+            attack = attack_class(*params)
+            attack.pool = pool
+        return attack
+
+    def image(self, kind: tuple, create):
+        """
+        Get the image shared by attacks of a kind, creating it with the first attack.
+
+        Args:
+            kind (tuple): The kind of attacks.
+            create: Function creating the image.
+
+        Returns:
+            The image of attacks of the kind, kept for the life of the manager.
+        """
+        if kind not in self.images:
+            self.images[kind] = create()
+        return self.images[kind]
 
     def sword_attack(self, character):
         """
@@ -304,7 +437,9 @@ class FightManager():
                     rect.bottom - attack['size'][1]
                 )
 
-            hit = Hit(position, attack['damage'], character.status.type, character.status.id)
+            source = character.status.type
+            image = self.image(('sword', source), lambda: create_hit_image(source))
+            hit = self.spawn(Hit, ('sword', source), position, attack['damage'], source, character.status.id, image)
             self.sword_hits.add(hit)
 
     def arch_attack(self, kind, character, target = None):
@@ -330,9 +465,11 @@ class FightManager():
             else:
                 position = (rect.left + 20, rect.top + rect.height / 3)
 
-            bullet = Bullet(
-                kind, position, character, target
-            )
+            facing_right = character.status.facing_right
+            image = self.image(('bullet', kind, facing_right), lambda: assets.acquire(
+                'image', f'content/graphics/weapons/{kind}.png', None, facing_right
+            ))
+            bullet = self.spawn(Bullet, ('bullet', kind), kind, position, character, target, image)
             self.bullet_hits.add(bullet)
 
     def thunder_attack(self, source, source_id, position, damage, can_attack):
@@ -349,39 +486,66 @@ class FightManager():
         This method creates and manages a thunderstorm attack based on the provided parameters.
         """
         if can_attack:
-            thunder = Thunder(position, damage, source, source_id)
+            images = self.image(('thunder',), lambda: create_thunder_images(Thunder.start_width, Thunder.start_height))
+            thunder = self.spawn(Thunder, ('thunder',), position, damage, source, source_id, images)
             self.thunder_hits.add(thunder)
 
-    def attack_update(self, surface, offset: pygame.Vector2):
+    def attack_update(self, terrain=None):
         """
         Update combat-related elements.
 
-        Args:
-            surface (pygame.Surface): The surface on which to update combat elements.
-            offset (pygame.Vector2): The offset to apply to combat elements' positions.
-
         This method updates the state and position of melee hits,
         projectiles, and area-of-effect attacks.
         It also handles the removal of expired attacks.
+
+        Args:
+            terrain (TileLayer): Collideable tiles which stop projectiles.
         """
         self.sword_hits.update()
         for hit in self.sword_hits:
-            hit.draw(surface, offset)
             if now() - hit.attack_time > hit.attack_duration:
                 hit.kill()
 
-        self.bullet_hits.update()
+        for bullet in self.bullet_hits:  # Stopped by terrain during the previous step, after it could hit a character
+            if bullet.stopped:
+                bullet.kill()
+        self.bullet_hits.update(terrain)
         for bullet in self.bullet_hits:
-            bullet.draw(surface, offset)
             if bullet.rect.x - bullet.start_rect.x > bullet.attack_range:
                 bullet.kill()
 
         self.thunder_hits.update()
         for thunder in self.thunder_hits:
-            thunder.draw(surface, offset)
             if now() - thunder.attack_time > thunder.attack_duration and thunder.attack is True:
                 thunder.kill()
 
+    def draw(self, surface, offset: pygame.Vector2):
+        """
+        Draw combat-related elements.
+
+        Args:
+            surface (pygame.Surface): The surface on which to draw combat elements.
+            offset (pygame.Vector2): The offset to apply to combat elements' positions.
+        """
+        for hit in self.sword_hits:
+            hit.draw(surface, offset)
+        for bullet in self.bullet_hits:
+            bullet.draw(surface, offset)
+        for thunder in self.thunder_hits:
+            thunder.draw(surface, offset)
+
+    def changed_rects(self) -> list:
+        """
+        Get areas of the map covered by currently drawn attacks.
+
+        Returns:
+            list: Rectangles of hits, projectiles and area-of-effect attacks.
+        """
+        rects = [hit.rect for hit in self.sword_hits]
+        rects.extend(bullet.rect for bullet in self.bullet_hits)
+        rects.extend(thunder.rect for thunder in self.thunder_hits)
+        return rects
+
     def check_damage(self, player, enemies):
         """
         Check and apply damage to characters.
@@ -394,6 +558,8 @@ class FightManager():
         and applies damage to characters accordingly.
         It also handles experience points and character status updates.
         """
+        self.enemy_hash.rebuild(enemies)
+
         # Hit groups:
         sword_collisions = []
         arrow_collisions = []
@@ -417,54 +583,56 @@ class FightManager():
         """
         for hit in hits:  # Check for any hits collisions
             point = False  # if kind of hits is 'bullets'
-            for enemy in enemies:
-                if hit.rect.colliderect(enemy.movement.collision_rect) and \
-                        hit.source == 'player' and \
-                        not enemy.properties.dead['status']:  # If enemy get hit by player
-                    if kind == 'thunder' and hit.attack is False:
-                        break
-                    elif kind == 'thunder' and hit.attack is True and player.status.id in hit.character_collided:
-                        break
-                    else:
-                        collisions_group.append((enemy, hit.damage, hit.source))
-                        hit.character_collided.append(enemy.status.id)
-                        if kind == 'bullet': point = True
+            if hit.source == 'player':
+                for enemy in self.enemy_hash.query(hit.rect):
+                    if hit.rect.colliderect(enemy.movement.collision_rect) and \
+                            not enemy.properties.dead['status']:  # If enemy get hit by player
+                        if kind == 'thunder' and hit.attack is False:
+                            break
+                        elif kind == 'thunder' and hit.attack is True and player.status.id in hit.character_collided:
+                            break
+                        else:
+                            collisions_group.append((enemy, hit.damage, hit.source))
+                            hit.character_collided.append(enemy.status.id)
+                            if kind == 'bullet': point = True
 
             if hit.rect.colliderect(player.movement.collision_rect) and \
                     not hit.shielded and \
                     hit.source != 'player' and \
                     not player.properties.dead['status']:  # If player get hit by enemy
-                for enemy in enemies:
-                    if enemy.status.id != hit.source_id:
-                        continue
-                    if kind == 'thunder':
-                        if hit.attack is False:
-                            break
-                        if hit.attack is True and player.status.id in hit.character_collided:
-                            break
-                        if hit.attack is True and player.status.id not in hit.character_collided:
-                            hit.character_collided.append(player.status.id)
-                            collisions_group.append((player, hit.damage, hit.source))
-                            break
-                    if player.defense.shield['shielding']:
-                        if ((player.status.facing_right and enemy.movement.collision_rect.x > player.movement.collision_rect.x) or
-                            (not player.status.facing_right and enemy.movement.collision_rect.x < player.movement.collision_rect.x)):
-                            self.shield_block_sound.play()
-                            hit.shielded = True
-                            if not enemy.fighting.combat['stunned'] and kind == 'sword':
-                                enemy.defense.get_stunned()
-                                break
-                        else:
-                            hit.character_collided.append(player.status.id)
-                            collisions_group.append((player, hit.damage, hit.source))
-                    else:
-                        hit.character_collided.append(player.status.id)
-                        collisions_group.append((player, hit.damage, hit.source))
+                enemy = self.enemy_hash.get(hit.source_id)
+                if enemy is not None:
+                    self.player_search_hit_collision(kind, hit, player, enemy, collisions_group)
                 if kind == 'bullet': point = True
 
             if point and kind == 'bullet':  # Destroy bullet after collision with anyone
                 hit.kill()
 
+    def player_search_hit_collision(self, kind, hit, player, enemy, collisions_group) -> None:
+        """
+        Check and handle a collision between the player and a hit of the given enemy.
+
+        This method records damage dealt to the player, unless the hit is blocked by the shield.
+        """
+        if kind == 'thunder':
+            if hit.attack is True and player.status.id not in hit.character_collided:
+                hit.character_collided.append(player.status.id)
+                collisions_group.append((player, hit.damage, hit.source))
+            return
+        if player.defense.shield['shielding']:
+            if ((player.status.facing_right and enemy.movement.collision_rect.x > player.movement.collision_rect.x) or
+                (not player.status.facing_right and enemy.movement.collision_rect.x < player.movement.collision_rect.x)):
+                sounds.play(SOUND_SHIELD_BLOCK_PATH, SOUND_SHIELD_BLOCK_VOLUME, SOUND_SHIELD_BLOCK_VOICES)
+                hit.shielded = True
+                if not enemy.fighting.combat['stunned'] and kind == 'sword':
+                    enemy.defense.get_stunned()
+            else:
+                hit.character_collided.append(player.status.id)
+                collisions_group.append((player, hit.damage, hit.source))
+        else:
+            hit.character_collided.append(player.status.id)
+            collisions_group.append((player, hit.damage, hit.source))
+
     def character_hit_collisions(self, collisions, player) -> None:
         """
         Handle character hit collisions and apply damage.
@@ -0,0 +1,71 @@
+"""
+spatial_hash.py - Module for finding characters near attacks.
+
+Characters are sorted into buckets by the x coordinates of their collision
+rectangles once per frame, so a hit is tested only against characters in the
+buckets it overlaps, instead of against every enemy of the level.
+"""
+from tools.settings import FIGHT_HASH_BUCKET_SIZE
+
+
+class SpatialHash:
+    """
+    Characters bucketed by x coordinate, with a lookup of characters by id.
+    """
+    def __init__(self, bucket_size: int = FIGHT_HASH_BUCKET_SIZE) -> None:
+        """
+        Initialize the SpatialHash object.
+
+        Args:
+            bucket_size (int): The width of a bucket in pixels.
+        """
+        self.bucket_size = bucket_size
+        self.buckets = {}
+        self.by_id = {}
+
+    def rebuild(self, characters) -> None:
+        """
+        Sort living characters into buckets again. Dead characters can still be found by id.
+
+        Args:
+            characters: Characters in the order they should be returned in.
+        """
+        self.buckets = {}
+        self.by_id = {}
+        size = self.bucket_size
+        for order, character in enumerate(characters):
+            self.by_id[character.status.id] = character
+            if character.properties.dead['status']:
+                continue
+            rect = character.movement.collision_rect
+            for bucket in range(rect.left // size, (rect.right - 1) // size + 1):
+                self.buckets.setdefault(bucket, []).append((order, character))
+
+    def query(self, rect) -> list:
+        """
+        Get characters from the buckets overlapped by a rectangle.
+
+        Args:
+            rect (pygame.Rect): The rectangle to check.
+
+        Returns:
+            list: Characters which may overlap the rectangle, in the order they were given to `rebuild`.
+        """
+        first, last = rect.left // self.bucket_size, (rect.right - 1) // self.bucket_size
+        if first == last:
+            return [character for _, character in self.buckets.get(first, ())]
+        found = {}
+        for bucket in range(first, last + 1):
+            for order, character in self.buckets.get(bucket, ()):
+                found[order] = character
+        return [found[order] for order in sorted(found)]
+
+    def get(self, character_id):
+        """
+        Args:
+            character_id: The id of the character.
+
+        Returns:
+            The character with the given id, or None.
+        """
+        return self.by_id.get(character_id)
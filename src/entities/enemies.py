@@ -1,6 +1,7 @@
 import random
 import pygame
 from tools.settings import ENEMY_ULTIMATE_ATTACK_COOLDOWN
+from tools.support import now
 from entities.enemy_animations import EnemyAnimations
 from entities.enemy_status import EnemyStatus
 from entities.enemy_defense import EnemyDefense
@@ -82,7 +83,7 @@ class Wizard(Enemy):
     def __init__(self, enemy_lvl, enemy_id, pos, frames, arch_attack, thunder_attack):
         super().__init__(enemy_lvl, enemy_id, pos, 'wizard', frames)
         self.thunder = {
-            'time': pygame.time.get_ticks(),
+            'time': now(),
             'cooldown': ENEMY_ULTIMATE_ATTACK_COOLDOWN[self.status.type]
         }
         # Methods:
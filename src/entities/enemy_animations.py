@@ -131,11 +131,37 @@ class EnemyAnimations:
         if not self.enemy.properties.dead['status']:
             rect = self.enemy.movement.collision_rect
             health = self.enemy.properties.health
-            hp_max = pygame.Surface((rect.width, 5))
-            hp_max.fill(GREY)
-            cur = pygame.Surface(
-                (health['current'] / health['max'] * rect.width, 5)
-            )
-            cur.fill(RED)
-            screen.blit(hp_max, (rect.left - offset.x, rect.top - 15 - offset.y))
-            screen.blit(cur, (rect.left - offset.x, rect.top - 15 - offset.y))
+            position = (rect.left - offset.x, rect.top - 15 - offset.y)
+            screen.blit(bar_strip(GREY, rect.width), position, (0, 0, rect.width, 5))
+            screen.blit(bar_strip(RED, rect.width), position, (0, 0, health['current'] / health['max'] * rect.width, 5))
+
+
+_bar_strips = {}
+
+
+def bar_strip(color, width) -> pygame.Surface:
+    """
+    Returns a shared strip filled with the color, at least as wide as given width.
+    Bars are blitted from a part of the strip, so no surface is created while drawing.
+
+    :param color: color of the strip
+    :param width: minimal width of the strip
+    :return: surface of the strip
+    """
+    strip = _bar_strips.get(color)
+    if strip is None or strip.get_width() < width:
+        strip = pygame.Surface((max(int(width) + 1, 128), 5))
+        strip.fill(color)
+        _bar_strips[color] = strip
+    return strip
+
+
+def draw_health_bars(screen, enemies) -> None:
+    """
+    Draws health bars of living enemies in one pass. Each bar is blitted from a part of the shared strips of `bar_strip`.
+
+    :param screen: surface to draw on
+    :param enemies: pairs of an enemy and the camera offset to draw it with
+    """
+    for enemy, offset in enemies:
+        enemy.animations.draw_health_bar(screen, offset)
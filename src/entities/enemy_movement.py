@@ -8,6 +8,7 @@ class EnemyMovement:
 
         self.collision_rect = None
         self.position = None
+        self.previous_position = None
 
         self.on_right = False
         self.on_left = False
@@ -23,6 +24,9 @@ class EnemyMovement:
     def set_position(self, key: str, value: int) -> None:
         self.position[key] = value
 
+    def save_position(self) -> None:
+        self.previous_position = Vector2(self.collision_rect.topleft)
+
     def set_on_right(self, new_value: bool) -> None:
         self.on_right = new_value
 
@@ -1,6 +1,6 @@
-from pygame.mixer import Sound
 from random import choice
-from tools.settings import SOUND_SPAWN_VOLUME, SOUND_SPAWN_PATH
+from tools.settings import SOUND_SPAWN_VOLUME, SOUND_SPAWN_PATH, SOUND_SPAWN_VOICES
+from tools.sounds import sounds
 
 
 class EnemyStatus:
@@ -10,8 +10,7 @@ class EnemyStatus:
         self.status = 'idle'
         self.facing_right = True
         self.spawned = False
-        self.spawn_sound = Sound(SOUND_SPAWN_PATH)
-        self.spawn_sound.set_volume(SOUND_SPAWN_VOLUME)
+        sounds.load(SOUND_SPAWN_PATH)
 
     def set_status(self, new_status: str) -> None:
         self.status = new_status
@@ -20,7 +19,7 @@ class EnemyStatus:
         self.facing_right = facing
 
     def set_spawned(self) -> None:
-        self.spawn_sound.play()
+        sounds.play(SOUND_SPAWN_PATH, SOUND_SPAWN_VOLUME, SOUND_SPAWN_VOICES)
         self.spawned = True
 
     def reset_status(self) -> None:
@@ -3,11 +3,14 @@ import sys
 import tracemalloc
 from tools.settings import SCREEN_WIDTH, SCREEN_HEIGHT, GREY, BLACK, \
     WHITE, SKY, FPS, FONT_FPS, FPS_SHOW_POS, SOUND_PLAY_MUSIC, \
-    FONT_BIG, MASK_ALPHA, SOUND_MUSIC_VOLUME
+    FONT_BIG, MASK_ALPHA, SOUND_MUSIC_VOLUME, SIMULATION_STEP, SIMULATION_MAX_STEPS, PROFILER_TOGGLE_KEY, \
+    LOADING_BAR_SIZE, LOADING_BAR_SPACE, LOADING_REFRESH_TIME, SOUND_MUSIC_PATH
 from tools.support import draw_text
+from tools.sounds import sounds
 from terrain.level import Level
 from terrain.images_manager import ImagesManager
 from menu.overworld import Pause, MainMenu, DeathScene
+from management.presentation import Presentation
 
 
 class Game:
@@ -16,6 +19,7 @@ class Game:
         self.screen = screen
         self.loading_screen = ImagesManager.load_background(self.screen.get_size(), 'content/graphics/overworld/loading_screen.png')
         self.clock = clock
+        self.loading_drawn = 0
         self.main_menu = MainMenu(self.screen, ['Start', 'Exit'], self.create_level, self.exit_game, 0)
         self.status = 'main_menu'
 
@@ -25,14 +29,35 @@ class Game:
         self.paused = False
         self.death_scene = None
 
-        # Sounds:
-        self.level_bg_music = pygame.mixer.Sound('content/sounds/background.mp3')
-        self.level_bg_music.set_volume(SOUND_MUSIC_VOLUME)
+        # Display:
+        self.presentation = Presentation(self.screen)
+        self.presented_status = None
 
-    def create_level(self, respawn: bool = False) -> None:
+        # Sounds:
+        sounds.load(SOUND_MUSIC_PATH)
+
+    def show_loading(self, done: int = 0, total: int = 0) -> None:
+        """
+        Draw the loading screen with the progress bar of loading.
+
+        :param done: number of loaded parts
+        :param total: number of all parts, 0 if unknown
+        """
+        if 0 < done < total and pygame.time.get_ticks() - self.loading_drawn < LOADING_REFRESH_TIME:
+            return
+        self.loading_drawn = pygame.time.get_ticks()
         self.screen.blit(self.loading_screen, (0, 0))
         draw_text(self.screen, 'Loading...', FONT_BIG, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        if total:
+            bar = pygame.Rect((0, 0), LOADING_BAR_SIZE)
+            bar.center = (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + LOADING_BAR_SPACE)
+            self.screen.fill(BLACK, bar)
+            self.screen.fill(WHITE, (bar.x, bar.y, bar.width * done / total, bar.height))
+        pygame.event.pump()
         pygame.display.update()
+
+    def create_level(self, respawn: bool = False) -> None:
+        self.show_loading()
         if respawn:
             print('DUPA')
             self.level.clear_groups(player=False)
@@ -44,17 +69,15 @@ class Game:
         else:
             self.level = Level(1, self.screen, self)
         self.status = 'level'
-        if SOUND_PLAY_MUSIC: self.level_bg_music.play(loops=-1)
+        if SOUND_PLAY_MUSIC: sounds.play(SOUND_MUSIC_PATH, SOUND_MUSIC_VOLUME, 1, loops=-1)
 
     def next_level(self) -> None:
-        self.screen.blit(self.loading_screen, (0, 0))
-        draw_text(self.screen, 'Loading...', FONT_BIG, WHITE, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-        pygame.display.update()
+        self.show_loading()
         self.level.current_level += 1
         self.level.clear_groups(player=True)
         self.level.configure_level(player=True)
         self.status = 'level'
-        if SOUND_PLAY_MUSIC: self.level_bg_music.play(loops=-1)
+        if SOUND_PLAY_MUSIC: sounds.play(SOUND_MUSIC_PATH, SOUND_MUSIC_VOLUME, 1, loops=-1)
 
     def create_main_menu(self) -> None:
         self.main_menu = MainMenu(self.screen, ['Start', 'Exit'], self.create_level, self.exit_game, 0)
@@ -71,20 +94,55 @@ class Game:
         self.death_scene = DeathScene(self.screen, ['Respawn', 'Main Menu', 'Exit'], self.create_main_menu, self.create_level, self.exit_game, 70)
         self.status = 'dead'
 
-    def run_loop(self) -> None:
+    def update(self) -> None:
+        """
+        Advance the game simulation by one fixed step.
+        """
         if self.status == 'level':
-            self.level.run()
+            self.level.update()
+        elif self.status == 'dead':
+            if not self.death_scene.end:
+                self.level.update()
+            self.death_scene.update()
+
+    def run_loop(self, alpha: float = 1.0) -> None:
+        """
+        Draw the current scene.
+
+        :param alpha: position between the previous and the current simulation step
+        """
+        if self.status == 'level':
+            self.presentation.add(self.level.draw(alpha))
         elif self.status == 'main_menu':
-            self.main_menu.run()
+            self.presentation.add(self.main_menu.run())
         elif self.status == 'pause':
-            self.pause.run()
+            self.presentation.add(self.pause.run())
         elif self.status == 'dead':
             if not self.death_scene.end:
-                self.level.run()
-            self.death_scene.run()
+                self.presentation.add(self.level.draw(alpha))
+            self.presentation.add(self.death_scene.run())
 
     def show_fps(self) -> None:
-        draw_text(self.screen, f'FPS: {str(int(self.clock.get_fps()))}', FONT_FPS, GREY, FPS_SHOW_POS[0], FPS_SHOW_POS[1])
+        fps_rect = draw_text(self.screen, f'FPS: {str(int(self.clock.get_fps()))}', FONT_FPS, GREY, FPS_SHOW_POS[0], FPS_SHOW_POS[1])
+        self.presentation.add([fps_rect])
+
+    def present(self) -> None:
+        """
+        Update the display with the areas changed in this frame.
+        The whole screen is updated after switching between scenes.
+        """
+        if self.status != self.presented_status:
+            self.presentation.add(None)
+            self.presented_status = self.status
+        self.presentation.present()
+
+    def toggle_profiler(self) -> None:
+        """
+        Show or hide the profiler overlay of the level.
+        """
+        if self.level is not None:
+            self.level.profiler.toggle()
+            self.presentation.add(None)
 
     @staticmethod
     def exit_game() -> None:
@@ -110,12 +168,22 @@ def start_game():
 
     # Start game:
     game = Game(SCREEN, CLOCK)
+    accumulator = 0.0
 
     # Game loop:
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 game.exit_game()
+            elif event.type == pygame.KEYDOWN and event.key == PROFILER_TOGGLE_KEY:
+                game.toggle_profiler()
+
+        # Fixed step simulation:
+        accumulator = min(accumulator + CLOCK.get_time() / 1000, SIMULATION_STEP * SIMULATION_MAX_STEPS)
+        while accumulator >= SIMULATION_STEP:
+            game.update()
+            accumulator -= SIMULATION_STEP
+
         if game.status == 'main_menu':
             SCREEN.fill(BLACK)
             game.paused = False
@@ -128,11 +196,11 @@ def start_game():
         elif game.status == 'dead':
             SCREEN.fill(SKY)
 
-        game.run_loop()
+        game.run_loop(accumulator / SIMULATION_STEP)
 
         game.show_fps()
 
-        pygame.display.update()
+        game.present()
 
         CLOCK.tick(FPS)
 
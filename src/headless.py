@@ -0,0 +1,124 @@
+"""
+This module runs the level simulation without a window and without drawing.
+
+SDL's dummy video and audio drivers are used, so it works on machines without
+a display (e.g. CI servers). Game time comes from a simulated clock advanced by
+one fixed step per update, so the simulation runs as fast as the CPU allows
+and the results don't depend on the real time.
+
+Usage:
+    python headless.py --steps 10000
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import random
+import time
+import pygame
+from tools.settings import SCREEN_WIDTH, SCREEN_HEIGHT, SIMULATION_FPS
+from tools.support import set_clock, puts
+from terrain.level import Level
+
+
+class HeadlessGame:
+    """
+    Replacement of the Game class for the headless simulation.
+    There are no menus, so the player respawns at the start of the step after death.
+    """
+    def __init__(self) -> None:
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.steps = 0
+        self.deaths = 0
+        self.levels_completed = 0
+        self.respawn = False
+        set_clock(self.ticks)
+        self.level = Level(1, self.screen, self)
+
+    def ticks(self) -> int:
+        """
+        :return: simulated time in milliseconds
+        """
+        return self.steps * 1000 // SIMULATION_FPS
+
+    def update(self) -> None:
+        """
+        Advance the simulation by one fixed step.
+        """
+        if self.respawn:
+            # The level is rebuilt outside of Level.update, which sets game_over after calling create_death_scene:
+            self.respawn = False
+            self.level.clear_groups(player=False)
+            self.level.configure_level(player=False)
+        self.level.update()
+        self.level.profiler.end_frame()
+        self.steps += 1
+
+    def create_pause(self) -> None:
+        pass
+
+    def show_loading(self, done: int = 0, total: int = 0) -> None:
+        pass
+
+    def create_main_menu(self) -> None:
+        pass
+
+    def create_death_scene(self) -> None:
+        self.deaths += 1
+        self.respawn = True
+
+    def next_level(self) -> None:
+        self.levels_completed += 1
+        self.level.current_level += 1
+        self.level.clear_groups(player=True)
+        self.level.configure_level(player=True)
+
+
+def run_headless(steps: int, seed: int | None = None) -> dict:
+    """
+    Run the level simulation for a given number of steps.
+
+    :param steps: number of fixed simulation steps
+    :param seed: seed of the random generator used by the map and loot generators
+    :return: statistics of the run
+    """
+    if seed is not None:
+        random.seed(seed)
+    pygame.init()
+    # Images are converted to the display format, so a display mode has to be set:
+    pygame.display.set_mode((1, 1))
+
+    game = HeadlessGame()
+    start = time.perf_counter()
+    for _ in range(steps):
+        game.update()
+    elapsed = time.perf_counter() - start
+    set_clock(None)
+
+    return {
+        'steps': steps,
+        'seconds': elapsed,
+        'steps_per_second': steps / elapsed if elapsed else float('inf'),
+        'simulated_seconds': game.ticks() / 1000,
+        'deaths': game.deaths,
+        'levels_completed': game.levels_completed,
+        'enemies_alive': len(game.level.enemy_sprites),
+        'player_position': tuple(game.level.get_player().movement.collision_rect.topleft),
+        'phases_ms': {phase: round(game.level.profiler.stats(phase)[0], 4) for phase in game.level.profiler.phases}
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run the level simulation without a display.')
+    parser.add_argument('--steps', type=int, default=SIMULATION_FPS * 60, help='number of simulation steps')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the random generator')
+    args = parser.parse_args()
+
+    stats = run_headless(args.steps, args.seed)
+    for key, value in stats.items():
+        puts(f'{key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
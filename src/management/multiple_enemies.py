@@ -1,10 +1,11 @@
 from pygame.surface import Surface
+from pygame.rect import Rect
 from pygame.math import Vector2
 from tools.support import draw_text
 from tools.settings import FONT_SMALL, RED
 
 
-def show_multiple_enemies(enemies: list, screen: Surface, distance: int, offset: Vector2) -> None:
+def show_multiple_enemies(enemies: list, screen: Surface, distance: int, offset: Vector2) -> Rect | None:
     """
     This function displays information if several opponents are overlapped.
 
@@ -12,10 +13,10 @@ def show_multiple_enemies(enemies: list, screen: Surface, distance: int, offset:
     :param screen: display screen
     :param distance: distance to calculate
     :param offset: offset of camera
-    :return: none
+    :return: area changed by the information, if it was shown
     """
     if len(enemies) < 2:
-        return
+        return None
 
     max_distance = distance
     nearest_distance = distance
@@ -41,4 +42,5 @@ def show_multiple_enemies(enemies: list, screen: Surface, distance: int, offset:
         middle_y = (rect_r.centery + rect_l.centery) / 2
 
         enemies_within_radius = sum(1 for enemy in enemies if abs(enemy.movement.collision_rect.centerx - middle_x) < max_distance)
-        draw_text(screen, f'{enemies_within_radius}', FONT_SMALL, RED, middle_x - offset.x, middle_y - offset.y - 100, left=True)
+        return draw_text(screen, f'{enemies_within_radius}', FONT_SMALL, RED, middle_x - offset.x, middle_y - offset.y - 100, left=True)
+    return None
@@ -0,0 +1,52 @@
+"""
+This module defines the Presentation class, which decides
+which parts of the screen are pushed to the display after each frame.
+
+With dirty rectangles enabled, scenes report the areas they have changed,
+and only those areas (and the areas changed in the previous frame) are updated.
+Otherwise, or when a scene reports that the whole screen has changed, the full
+surface is pushed to the display.
+"""
+import pygame
+from tools.settings import DIRTY_RECTS
+
+
+class Presentation:
+    """
+    Collects screen areas changed during a frame and updates the display.
+    """
+    def __init__(self, screen: pygame.Surface, dirty_rects: bool = DIRTY_RECTS) -> None:
+        self.screen_rect = screen.get_rect()
+        self.dirty_rects = dirty_rects
+        self.full = True
+        self.rects = []
+        self.previous_rects = []
+
+    def add(self, rects: list | None) -> None:
+        """
+        Report screen areas changed by a scene.
+
+        :param rects: list of changed rectangles, or None if the whole screen has changed
+        :return: None
+        """
+        if rects is None:
+            self.full = True
+            return
+        for rect in rects:
+            if rect is not None:
+                self.rects.append(self.screen_rect.clip(rect))
+
+    def present(self) -> None:
+        """
+        Push the changed parts of the screen to the display.
+
+        Areas from the previous frame are updated too, so things
+        which moved or disappeared are erased from the display.
+        """
+        if not self.dirty_rects or self.full:
+            pygame.display.update()
+        else:
+            pygame.display.update(self.previous_rects + self.rects)
+        self.previous_rects = self.rects
+        self.rects = []
+        self.full = False
@@ -0,0 +1,118 @@
+"""
+This module defines the Profiler class, which measures how long each phase of
+the level takes and shows the results as a bar graph overlay.
+"""
+from collections import deque
+from contextlib import contextmanager
+from math import ceil
+from time import perf_counter
+from pygame.surface import Surface
+from pygame.rect import Rect
+from tools.support import draw_text
+from tools.settings import FONT_SMALL, GREY, YELLOW, RED, SHOW_PROFILER, PROFILER_PHASES, PROFILER_HISTORY, \
+    PROFILER_POSITION, PROFILER_BAR_WIDTH, PROFILER_FRAME_BUDGET
+
+ROW_HEIGHT = 18
+LABEL_WIDTH = 70
+
+
+class Profiler:
+    """
+    Measures time of level phases in every frame and keeps the history of the last frames.
+    """
+    def __init__(self, phases: tuple = PROFILER_PHASES, history: int = PROFILER_HISTORY, show: bool = SHOW_PROFILER) -> None:
+        """
+        :param phases: names of measured phases, in display order
+        :param history: number of frames used for averages and percentiles
+        :param show: whether the overlay is visible
+        """
+        self.phases = phases
+        self.show = show
+        self.current = dict.fromkeys(phases, 0.0)
+        self.history = {phase: deque(maxlen=history) for phase in phases}
+
+    @contextmanager
+    def measure(self, phase: str):
+        """
+        Measure the time of the code inside the `with` block and add it to the phase time of the current frame.
+        A phase can be measured several times in a frame (e.g. when more than one simulation step is run).
+
+        :param phase: name of the phase
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.current[phase] += (perf_counter() - start) * 1000
+
+    def end_frame(self) -> None:
+        """
+        Move times of the current frame to the history.
+        """
+        for phase, time in self.current.items():
+            self.history[phase].append(time)
+            self.current[phase] = 0.0
+
+    def toggle(self) -> None:
+        self.show = not self.show
+
+    def stats(self, phase: str) -> tuple[float, float, float]:
+        """
+        :param phase: name of the phase
+        :return: average, 95th and 99th percentile of the phase time in milliseconds
+        """
+        times = self.history[phase]
+        if not times:
+            return 0.0, 0.0, 0.0
+        ordered = sorted(times)
+        return sum(ordered) / len(ordered), percentile(ordered, 95), percentile(ordered, 99)
+
+    def draw(self, surface: Surface, info: list[str]) -> Rect | None:
+        """
+        Draw the bar graph of phase times with additional information lines under it.
+        Bars show the average time, the marker shows the 99th percentile. The whole bar width is one frame budget.
+
+        :param surface: surface to draw on
+        :param info: additional lines of text
+        :return: area changed by the overlay, if it was shown
+        """
+        if not self.show:
+            return None
+        x_pos, y_pos = PROFILER_POSITION
+        bar_x = x_pos + LABEL_WIDTH
+        changed = Rect(x_pos, y_pos, 0, 0)
+        total = 0.0
+        for row, phase in enumerate(self.phases):
+            average, p95, p99 = self.stats(phase)
+            total += average
+            row_y = y_pos + row * ROW_HEIGHT
+            changed.union_ip(draw_text(surface, phase, FONT_SMALL, GREY, x_pos, row_y, left=True))
+            surface.fill(GREY, (bar_x, row_y + 3, PROFILER_BAR_WIDTH, 1))
+            surface.fill(YELLOW, (bar_x, row_y + 4, bar_width(average), ROW_HEIGHT - 8))
+            surface.fill(RED, (bar_x + bar_width(p99), row_y + 2, 2, ROW_HEIGHT - 4))
+            changed.union_ip(draw_text(surface, f'{average:.2f} / {p95:.2f} / {p99:.2f} ms', FONT_SMALL, GREY,
+                                       bar_x + PROFILER_BAR_WIDTH + 10, row_y, left=True))
+        changed.union_ip(Rect(bar_x, y_pos, PROFILER_BAR_WIDTH + 2, len(self.phases) * ROW_HEIGHT))
+        info_y = y_pos + len(self.phases) * ROW_HEIGHT
+        lines = [f'Total: {total:.2f} ms of {PROFILER_FRAME_BUDGET:.2f} ms (avg / p95 / p99)'] + info
+        for row, line in enumerate(lines):
+            changed.union_ip(draw_text(surface, line, FONT_SMALL, GREY, x_pos, info_y + row * ROW_HEIGHT, left=True))
+        return changed
+
+
+def bar_width(time: float) -> int:
+    """
+    :param time: time in milliseconds
+    :return: width of the bar, which shows the time, limited to the frame budget
+    """
+    return int(min(time / PROFILER_FRAME_BUDGET, 1.0) * PROFILER_BAR_WIDTH)
+
+
+def percentile(ordered: list, percent: float) -> float:
+    """
+    :param ordered: sorted values
+    :param percent: percentile to find (0 - 100)
+    :return: the smallest value greater than or equal to given percent of values
+    """
+    index = max(ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
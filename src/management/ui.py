@@ -5,11 +5,16 @@ including health bars, cooldowns, equipment, and more.
 It provides methods to display and update these UI elements during gameplay.
 """
 import pygame
-from tools.support import create_bar, draw_text, import_image, scale_image, now
+from tools.support import create_bar, draw_text, now
+from tools.assets import assets
 from tools.settings import GREY, RED, YELLOW, BLACK, FONT_NORMAL, UI_ACTIVE_EQUIPMENT_POSITION, \
     UI_FRAME_SIZE, FONT_UI_FRAME, UI_ITEM_IMAGE_SIZE, UI_HP_BAR_POSITION, UI_SKELETON_POINTS_SPACE
 
 
+HP_BAR_ASSET = ('image', 'content/graphics/ui/bar_hp.png', (400, 45), False)
+SKELETONS_ASSET = ('image', 'content/graphics/overworld/skeletons.png', None, False)
+
+
 class UI:
     """
     This class represents the user interface (UI) elements in the game,
@@ -27,8 +32,7 @@ class UI:
             None
         """
         # Health bar size:
-        self.hp_bar_image = import_image('content/graphics/ui/bar_hp.png')
-        self.hp_bar_image = scale_image(self.hp_bar_image, (400, 45))
+        self.hp_bar_image = assets.acquire(*HP_BAR_ASSET)
         self.health_bar_size = [345, 15]
 
         # Experience:
@@ -36,8 +40,14 @@ class UI:
         self.exp_visible = 0
 
         # Skeletons:
-        self.skeletons_image = pygame.image.load(
-            'content/graphics/overworld/skeletons.png').convert_alpha()
+        self.skeletons_image = assets.acquire(*SKELETONS_ASSET)
+
+    def release_assets(self) -> None:
+        """
+        Release images of the UI when the player is removed.
+        """
+        assets.release(*HP_BAR_ASSET)
+        assets.release(*SKELETONS_ASSET)
 
     def show_health(self, surface: pygame.surface.Surface, hp_max: int, current: int) -> None:
         """
@@ -49,17 +59,18 @@ class UI:
             current: The current health points.
 
         Returns:
-            None
+            pygame.Rect: The area changed by the health bar.
         """
         # surface.blit(
         #     create_bar((self.health_bar_size[0], self.health_bar_size[1]), GREY),
         #     (20, 50)
         # )
-        surface.blit(self.hp_bar_image, UI_HP_BAR_POSITION)
+        area = surface.blit(self.hp_bar_image, UI_HP_BAR_POSITION)
         surface.blit(
             create_bar((current / hp_max * self.health_bar_size[0], self.health_bar_size[1]), RED),
             (UI_HP_BAR_POSITION[0]+50, UI_HP_BAR_POSITION[1]+15)
         )
+        return area
 
     def show_attack_cooldown(self, surface: pygame.surface.Surface,
                             attack_time: int, attack_cooldown: int,
@@ -75,7 +86,7 @@ class UI:
             offset: The offset for rendering.
 
         Returns:
-            None
+            pygame.Rect: The area changed by the cooldown bar, or None.
         """
         pass
         # ****************************************************************************
@@ -86,7 +97,8 @@ class UI:
             cd_max = pygame.Surface((collision_rect.width - collision_rect.width * ratio, 5))
             cd_max.fill(YELLOW)
 
-            surface.blit(cd_max, (collision_rect.left - offset.x, collision_rect.top - 15 - offset.y))
+            return surface.blit(cd_max, (collision_rect.left - offset.x, collision_rect.top - 15 - offset.y))
+        return None
 
     def show_skeleton_points(self, surface: pygame.surface.Surface) -> None:
         """
@@ -96,16 +108,17 @@ class UI:
             surface: The surface to display skeleton points information on.
 
         Returns:
-            None
+            pygame.Rect: The area changed by skeleton points information.
         """
         x_pos = surface.get_width() - UI_SKELETON_POINTS_SPACE[0]
         y_pos = surface.get_height() - UI_SKELETON_POINTS_SPACE[1]
         background = pygame.Surface((110, 45))
         background.fill(BLACK)
         background.set_alpha(180)
-        surface.blit(background, (x_pos, y_pos - 5))
-        surface.blit(self.skeletons_image, (x_pos, y_pos))
-        draw_text(surface, str(int(self.exp_visible)), FONT_NORMAL, GREY, x_pos + 80, y_pos + 20)
+        area = surface.blit(background, (x_pos, y_pos - 5))
+        area.union_ip(surface.blit(self.skeletons_image, (x_pos, y_pos)))
+        area.union_ip(draw_text(surface, str(int(self.exp_visible)), FONT_NORMAL, GREY, x_pos + 80, y_pos + 20))
+        return area
 
     def show_active_equipment(self, surface: pygame.surface.Surface,
                               active_equipment: dict) -> None:
@@ -117,14 +130,14 @@ class UI:
             active_equipment: Dictionary containing active equipment items.
 
         Returns:
-            None
+            pygame.Rect: The area changed by the active equipment frames.
         """
         pos_x = UI_ACTIVE_EQUIPMENT_POSITION[0]
         pos_y = UI_ACTIVE_EQUIPMENT_POSITION[1]
         width = UI_FRAME_SIZE[0]
         height = UI_FRAME_SIZE[1]
 
-        frame = import_image('content/graphics/ui/item_frame.png')
+        frame = assets.get('image', 'content/graphics/ui/item_frame.png', None, False)
         space = 10
 
         active_items_frames_positions = {
@@ -135,8 +148,10 @@ class UI:
         }
         # for position in active_items_frames_positions:
         #     surface.blit(frame, active_items_frames_positions[position])  # Draw squares
+        area = None
         for _, position in active_items_frames_positions.items():
-            surface.blit(frame, position)  # Draw squares
+            frame_area = surface.blit(frame, position)  # Draw squares
+            area = frame_area if area is None else area.union(frame_area)
 
         def show_item_name(key, name):
             draw_text(surface, name,
@@ -175,6 +190,7 @@ class UI:
                     get_active_item_position(active_items_frames_positions['item_pos'])
                 )  # Square nr 4 - Item
                 show_item_name('item_pos', 'Item')
+        return area
 
     def add_experience(self, current: int, amount: int) -> None:
         """
@@ -216,30 +232,31 @@ class UI:
             player: Object Player containing all statistics
 
         Returns:
-            None
+            list: Screen areas changed by the user interface.
         """
+        changed_rects = []
 
         # Health bar:
-        self.show_health(
+        changed_rects.append(self.show_health(
             screen,
             player.properties.health['max'],
             player.properties.health['current']
-        )
+        ))
 
         # Sword cooldown:
         #if not player.fighting.attack['attacking']:
         if 0 < now() - player.fighting.attack['end'] < player.fighting.attack['cooldown']:
-            self.show_attack_cooldown(
+            changed_rects.append(self.show_attack_cooldown(
                 screen,
                 player.fighting.attack['end'],
                 player.fighting.attack['cooldown'],
                 player.movement.collision_rect,
                 offset
-            )
+            ))
 
         # Skeletons:
-        self.show_skeleton_points(screen)
-        self.update_experience()
+        changed_rects.append(self.show_skeleton_points(screen))
 
         # Outfit
-        self.show_active_equipment(screen, player.equipment.active_items)
+        changed_rects.append(self.show_active_equipment(screen, player.equipment.active_items))
+        return changed_rects
@@ -1,5 +1,6 @@
 import pygame
-from tools.support import draw_text, scale_image, import_image
+from tools.support import draw_text
+from tools.assets import assets
 from tools.settings import WHITE, BUTTON_BASIC_COLOR, BUTTON_ACTIVE_COLOR, BUTTON_SIZE
 
 
@@ -22,10 +23,9 @@ class Button(pygame.sprite.Sprite):
 
     def set_image(self, active):
         if not active:
-            self.image = import_image('content/graphics/ui/button.png')
+            self.image = assets.get('image', 'content/graphics/ui/button.png', BUTTON_SIZE, False)
         else:
-            self.image = import_image('content/graphics/ui/button_active.png')
-        self.image = scale_image(self.image, BUTTON_SIZE)
+            self.image = assets.get('image', 'content/graphics/ui/button_active.png', BUTTON_SIZE, False)
         self.rect = self.image.get_rect(center=self.position)
 
     def draw_content(self, SCREEN):
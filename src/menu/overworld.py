@@ -1,6 +1,6 @@
 from menu.buttons import *
 from tools.settings import SCREEN_WIDTH, SCREEN_HEIGHT, BUTTON_SIZE, BUTTONS_SPACE, RED, FONT_BUTTON, FONT_DEATH
-from tools.support import draw_text, scale_image
+from tools.support import draw_text, scale_image, import_image
 
 
 class Overworld:
@@ -8,7 +8,7 @@ class Overworld:
 
         # Setup
         self.display_surface = surface
-        self.wallpaper = pygame.image.load('content/graphics/ui/wallpaper.png').convert_alpha()
+        self.wallpaper = import_image('content/graphics/ui/wallpaper.png')
         self.wallpaper = scale_image(self.wallpaper, (SCREEN_WIDTH, SCREEN_HEIGHT))
 
         # Buttons:
@@ -81,11 +81,18 @@ class Overworld:
         if self.action == 'Exit':
             self.exit_game()
 
+    def changed_rects(self) -> list:
+        """
+        Get screen areas which can change between frames (only buttons, wallpaper is static).
+        """
+        return [button.rect for button in self.buttons_sprite]
+
     def run(self):
         self.click_timer()
         self.draw_wallpaper()
         self.draw_buttons()
         self.check_action()
+        return self.changed_rects()
 
 
 class MainMenu(Overworld):
@@ -133,7 +140,12 @@ class DeathScene(Overworld):
         if self.action == 'Respawn':
             self.create_level(respawn=True)
 
+    def update(self):
+        if self.alpha < 255:
+            self.alpha += 2
+
     def run(self):
+        fading = not self.end
 
         draw_text(self.image, self.text, FONT_DEATH, RED, self.image.get_width() / 2,
                   self.image.get_height() / 2 - 100)
@@ -141,10 +153,11 @@ class DeathScene(Overworld):
         self.image.set_alpha(self.alpha)
         self.display_surface.blit(self.image, (0, 0))
 
-        if self.alpha < 255:
-            self.alpha += 2
-        else:
+        if self.alpha >= 255:
             self.click_timer()
             self.draw_buttons()
             self.check_action()
             self.end = True
+        if fading:
+            return None
+        return self.changed_rects()
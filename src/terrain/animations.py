@@ -1,5 +1,5 @@
 import pygame
-from tools.support import import_character_assets
+from tools.assets import assets
 from tools.settings import TILE_SIZE
 
 
@@ -11,13 +11,15 @@ class Animation(pygame.sprite.Sprite):
         self.image = None
         self.animations_names = {'default': []}
         self.animations = {}
+        self.animations_asset = None
         self.rect = None
         self.frame_index = 0
         self.animation_speed = 0.15
         self.finish = False
 
     def load_animations(self, position, path):
-        self.animations = import_character_assets(self.animations_names, path, scale=TILE_SIZE / 32)
+        self.animations_asset = ('animations', path, tuple(self.animations_names), TILE_SIZE / 32)
+        self.animations = assets.acquire(*self.animations_asset)[0]
         self.image = self.animations['default'][self.frame_index]
         self.rect = self.image.get_rect(topleft=position)
 
@@ -31,6 +33,12 @@ class Animation(pygame.sprite.Sprite):
     def update(self, offset=None):
         self.animate()
 
+    def release(self) -> None:
+        """Release frames of the animation when it is removed."""
+        if self.animations_asset is not None:
+            assets.release(*self.animations_asset)
+            self.animations_asset = None
+
     def draw(self, surface: pygame.Surface, offset: pygame.math.Vector2) -> None:
         """
         Draw the tile on the given surface with the specified offset.
@@ -6,6 +6,7 @@ from tools.support import puts
 class Camera():
     def __init__(self, border_right, border_bottom):
         self.offset = pygame.math.Vector2(0, 0)
+        self.previous_offset = pygame.math.Vector2(0, 0)
         self.border = {
             'left': 0,
             'right': border_right,
@@ -42,3 +43,9 @@ class Camera():
 
         self.offset.x = offset_x
         self.offset.y = offset_y
+
+    def save_offset(self):
+        self.previous_offset = self.offset.copy()
+
+    def interpolate(self, alpha):
+        return self.previous_offset.lerp(self.offset, alpha)
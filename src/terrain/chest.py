@@ -1,6 +1,6 @@
 import math
 from terrain.tiles import AnimatedTile, TileEquipment
-from terrain.items_generator import generate_content_amount, generate_loot_content
+from terrain.items_generator import generate_content_amount, generate_loot_content, create_items
 from tools.support import puts
 from tools.settings import LEVEL_AREA_DISTANCE
 
@@ -30,7 +30,7 @@ class Chest(AnimatedTile):
 
     chests = []
 
-    def __init__(self, id: int, size: tuple[int, int], x: int, y: int, images: list, level_ref) -> None:
+    def __init__(self, id: int, size: tuple[int, int], x: int, y: int, images: list, level_ref, loot: list = None) -> None:
         """
         Initialize a Chest object.
 
@@ -41,13 +41,14 @@ class Chest(AnimatedTile):
             y (int): The y-coordinate of the chest's top-left corner.
             images (list): List of item images
             level_ref: reference to level map object
+            loot (list): Pre-rolled parameters of items in the chest, drawn here if not given
         """
         super().__init__(id, size, x, y, images)
         self.kind = 'chest'
         self.level = level_ref.current_level
         self.animated = False
         self.equipment = TileEquipment(True)
-        self.equipment.content = create_content([self, 'chest'], level_ref)
+        self.equipment.content = create_content([self, 'chest'], level_ref, loot)
         Chest.chests.append(self)
 
     def animate_once(self) -> None:
@@ -67,14 +68,27 @@ class Chest(AnimatedTile):
             self.animate_once()
 
 
-def create_content(owner: list, level_ref) -> list:
+def create_content(owner: list, level_ref, loot: list = None) -> list:
     """
     Create the content (items) for the container.
 
     :param owner: object and kind of object in tuple - (object, 'kind')
     :param level_ref: reference to level map object
+    :param loot: pre-rolled parameters of items, drawn here if not given
     :return: list of items
     """
-    owner[0].level = math.floor(owner[0].rect.x / LEVEL_AREA_DISTANCE + 1)
+    owner[0].level = content_level(owner[0].rect.x)
+    if loot is not None:
+        return create_items(level_ref, loot, owner)
     content = generate_loot_content(level_ref, generate_content_amount(), owner)
     return content
+
+
+def content_level(x_pos: int) -> int:
+    """
+    Level of the container content depends on the distance from the start of the map.
+
+    :param x_pos: x coordinate of the container
+    :return: level of the content
+    """
+    return math.floor(x_pos / LEVEL_AREA_DISTANCE + 1)
@@ -0,0 +1,83 @@
+"""
+This module defines the TerrainChunks class, which pre-renders static terrain
+into fixed-size surfaces (chunks), so the level can draw whole parts of the map
+with a single blit instead of drawing every tile separately.
+"""
+import pygame
+from tools.settings import TILE_SIZE, TERRAIN_CHUNK_SIZE
+
+
+class TerrainChunks:
+    """
+    Stores static terrain layers baked into square chunks of the map.
+
+    Only chunks which contain at least one tile are created, so the empty sky
+    above the terrain doesn't take any memory.
+    """
+    def __init__(self, groups: tuple, chunk_size: int = TERRAIN_CHUNK_SIZE) -> None:
+        """
+        Initialize the TerrainChunks object.
+
+        Args:
+            groups (tuple): Tile layers (or sprite groups) with static tiles, in drawing order.
+            chunk_size (int): The width and height of one chunk in tiles.
+        """
+        self.chunk_size = chunk_size * TILE_SIZE
+        self.chunks = {}
+        self.bake(groups)
+
+    def bake(self, groups: tuple) -> None:
+        """
+        Render tiles of given groups into chunk surfaces.
+
+        Args:
+            groups (tuple): Tile layers, sprite groups or lists of tiles with `rect` and `image`, in drawing order.
+        """
+        for group in groups:
+            for sprite in group:
+                key = (sprite.rect.x // self.chunk_size, sprite.rect.y // self.chunk_size)
+                if key not in self.chunks:
+                    self.chunks[key] = pygame.Surface((self.chunk_size, self.chunk_size), flags=pygame.SRCALPHA)
+                self.chunks[key].blit(
+                    sprite.image,
+                    (sprite.rect.x - key[0] * self.chunk_size, sprite.rect.y - key[1] * self.chunk_size)
+                )
+
+    def unbake(self, left: int, right: int, layers: tuple) -> None:
+        """
+        Remove chunks overlapping a part of the map, then bake again the tiles
+        of given layers which are left in these chunks.
+
+        Args:
+            left (int): The left x coordinate of the removed part.
+            right (int): The right x coordinate of the removed part (exclusive).
+            layers (tuple): Tile layers with the remaining static tiles, in drawing order.
+        """
+        first_col = left // self.chunk_size
+        last_col = (right - 1) // self.chunk_size
+        for key in [key for key in self.chunks if first_col <= key[0] <= last_col]:
+            del self.chunks[key]
+        tiles_per_chunk = self.chunk_size // TILE_SIZE
+        for chunk_col in {first_col, last_col}:
+            self.bake(tuple(
+                layer.tiles_in_columns(chunk_col * tiles_per_chunk, (chunk_col + 1) * tiles_per_chunk - 1)
+                for layer in layers
+            ))
+
+    def draw(self, surface: pygame.Surface, offset: pygame.math.Vector2) -> None:
+        """
+        Draw chunks visible through the camera on the given surface.
+
+        Args:
+            surface (pygame.Surface): The surface to draw the chunks on.
+            offset (pygame.math.Vector2): The camera offset.
+        """
+        first_col = int(offset.x // self.chunk_size)
+        last_col = int((offset.x + surface.get_width()) // self.chunk_size)
+        first_row = int(offset.y // self.chunk_size)
+        last_row = int((offset.y + surface.get_height()) // self.chunk_size)
+        for col in range(first_col, last_col + 1):
+            for row in range(first_row, last_row + 1):
+                chunk = self.chunks.get((col, row))
+                if chunk is not None:
+                    surface.blit(chunk, (col * self.chunk_size - offset.x, row * self.chunk_size - offset.y))
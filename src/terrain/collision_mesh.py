@@ -0,0 +1,109 @@
+"""
+This module defines the CollisionMesh class, which merges contiguous solid
+cells of the collideable tile layer into larger rectangles, so characters are
+collided against platforms instead of single tiles.
+
+Cells are merged only along rows, into runs one tile high. The collision
+rules push a character by comparing its center with the center of what it
+hit, and a run has the same vertical center as each of its tiles, so the
+vertical check gives the same result for a run as for its tiles. Horizontal
+pushes are resolved by `horizontal_movement_collision` tile by tile inside
+the run, for the few tiles overlapping the character. Runs are kept in row
+order, left to right, which is the order the tiles were checked in before.
+"""
+from bisect import bisect_right
+import pygame
+from terrain.tile_layer import EMPTY
+from tools.settings import TILE_SIZE
+
+
+class CollisionMesh:
+    """
+    Rows of merged rectangles built from a tile layer.
+    """
+    def __init__(self, layer) -> None:
+        """
+        Initialize the CollisionMesh object.
+
+        Args:
+            layer (TileLayer): The collideable tile layer to merge.
+        """
+        self.rows = layer.rows
+        self.runs = [[] for _ in range(layer.rows)]
+        self.rights = [[] for _ in range(layer.rows)]
+        self.update_columns(layer, layer.first_col, layer.end_col() - 1)
+
+    def __len__(self) -> int:
+        return sum(len(runs) for runs in self.runs)
+
+    def __iter__(self):
+        return (rect for runs in self.runs for rect in runs)
+
+    def update_columns(self, layer, first: int, last: int) -> None:
+        """
+        Merge the cells of a range of columns again, after tiles were put into or removed from the layer.
+
+        Args:
+            layer (TileLayer): The collideable tile layer.
+            first (int): The first changed column.
+            last (int): The last changed column (inclusive).
+        """
+        first, last = max(first, layer.first_col), min(last, layer.end_col() - 1)
+        if first > last:
+            return
+        for row in range(self.rows):
+            runs, rights = self.runs[row], self.rights[row]
+            # Runs touching the changed columns may grow into them or be split, so they're merged again too:
+            start = bisect_right(rights, first * TILE_SIZE - 1)
+            end = start
+            while end < len(runs) and runs[end].left <= (last + 1) * TILE_SIZE:
+                end += 1
+            left_col = min(first, runs[start].left // TILE_SIZE) if start < end else first
+            right_col = max(last, runs[end - 1].right // TILE_SIZE - 1) if start < end else last
+            runs[start:end] = merge_cells(layer.cells[row], row, left_col, right_col, layer.first_col)
+            rights[start:] = [rect.right for rect in runs[start:]]
+
+    def rects_in_rect(self, rect: pygame.Rect) -> list:
+        """
+        Get merged rectangles overlapping the given rectangle.
+
+        Args:
+            rect (pygame.Rect): The rectangle to check.
+
+        Returns:
+            list: Rectangles overlapping the given one, row by row, from left to right.
+        """
+        rects = []
+        for row in range(max(rect.top // TILE_SIZE, 0), min((rect.bottom - 1) // TILE_SIZE, self.rows - 1) + 1):
+            runs = self.runs[row]
+            index = bisect_right(self.rights[row], rect.left)
+            while index < len(runs) and runs[index].left < rect.right:
+                rects.append(runs[index])
+                index += 1
+        return rects
+
+
+def merge_cells(cells, row: int, first: int, last: int, first_cell: int = 0) -> list:
+    """
+    Merge contiguous solid cells of a row into rectangles.
+
+    Args:
+        cells (array): Tile ids of the row.
+        row (int): Index of the row.
+        first (int): The first column to merge.
+        last (int): The last column to merge (inclusive).
+        first_cell (int): The column of the first cell of the row, when the layer holds a window of the map.
+
+    Returns:
+        list: Rectangles of runs of solid cells, from left to right.
+    """
+    rects = []
+    start = None
+    for col in range(first, last + 2):
+        solid = col <= last and cells[col - first_cell] != EMPTY
+        if solid and start is None:
+            start = col
+        elif not solid and start is not None:
+            rects.append(pygame.Rect(start * TILE_SIZE, row * TILE_SIZE, (col - start) * TILE_SIZE, TILE_SIZE))
+            start = None
+    return rects
@@ -1,58 +1,289 @@
-def check_collisions(character_movement, sprites):
+import math
+import pygame
+from terrain.tile_layer import EMPTY
+from tools.settings import TILE_SIZE
+
+
+def check_collisions(character_movement, rects):
+    """
+    This function checks horizontal and vertical collisions of character with terrain
+
+    :param character_movement: movement object of character
+    :param rects: the nearest terrain rectangles, runs of square tiles one tile high (see CollisionMesh)
+    :return: none
     """
-    This function checks horizontal and vertical collisions of character with terrain sprites
+    horizontal_movement_collision(character_movement, rects)
+    vertical_movement_collision(character_movement, rects)
+
+
+def check_grid_collisions(character_movement, layer):
+    """
+    This function checks horizontal and vertical collisions of character with terrain,
+    looking up only the cells of the tile layer which are under the character
 
     :param character_movement: movement object of character
-    :param sprites: the nearest character sprites
+    :param layer: the collideable tile layer
     :return: none
     """
-    horizontal_movement_collision(character_movement, sprites)
-    vertical_movement_collision(character_movement, sprites)
+    horizontal_grid_collision(character_movement, layer)
+    vertical_grid_collision(character_movement, layer)
 
 
-def horizontal_movement_collision(character, sprites):
+def horizontal_movement_collision(character, rects):
     """
-    This function checks horizontal collisions of character with terrain sprites
+    This function checks horizontal collisions of character with terrain
+
+    A run is pushed against tile by tile, walking only the tiles which overlap the character,
+    so a wide run pushes the character the same way as the separate tiles it's made of.
 
     :param character: movement object of character
-    :param sprites: the nearest character sprites
+    :param rects: the nearest terrain rectangles, row by row
     :return: none
     """
     character.collision_rect.x += character.direction.x * character.speed
-    collidable_sprites = sprites.sprites()
 
-    for sprite in collidable_sprites:
-        if sprite.rect.colliderect(character.collision_rect):
-            if sprite.rect.centerx < character.collision_rect.centerx:
-                character.collision_rect.left = sprite.rect.right
-                character.on_right = False
-                character.on_left = True
+    for rect in rects:
+        if rect.colliderect(character.collision_rect):
+            size = rect.height
+            tile = pygame.Rect(rect.left, rect.top, size, size)
+            if character.collision_rect.left > rect.left:
+                tile.x += (character.collision_rect.left - rect.left) // size * size
+            while tile.left < rect.right and tile.left < character.collision_rect.right:
+                push_horizontally(character, tile)
+                tile.x += size
 
-            elif sprite.rect.centerx > character.collision_rect.centerx:
-                character.collision_rect.right = sprite.rect.left
-                character.on_right = True
-                character.on_left = False
 
+def vertical_movement_collision(character, rects):
+    """
+    This function checks vertical collisions of character with terrain
 
-def vertical_movement_collision(character, sprites):
+    :param character: movement object of character
+    :param rects: the nearest terrain rectangles, row by row
+    :return: none
+    """
+    start_y = character.collision_rect.y
+    character.apply_gravity()
+
+    for rect in rects:
+        if push_vertically(character, rect):
+            break
+    else:
+        stop_tunneling(character, start_y, rects)
+    update_on_ground(character)
+
+
+def horizontal_grid_collision(character, layer):
     """
-    This function checks vertical collisions of character with terrain sprites
+    This function checks horizontal collisions of character with the cells of a tile layer under the character
 
     :param character: movement object of character
-    :param sprites: the nearest character sprites
+    :param layer: the collideable tile layer
     :return: none
     """
+    character.collision_rect.x += character.direction.x * character.speed
+    collision_rect = character.collision_rect
+
+    for row in cell_rows(collision_rect, layer):
+        cells = layer.cells[row]
+        col = max(collision_rect.left // TILE_SIZE, layer.first_col)
+        while col < layer.end_col() and col * TILE_SIZE < collision_rect.right:
+            if cells[col - layer.first_col] != EMPTY:
+                push_horizontally(character, pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+            col += 1
+
+
+def vertical_grid_collision(character, layer):
+    """
+    This function checks vertical collisions of character with the cells of a tile layer under the character
+
+    :param character: movement object of character
+    :param layer: the collideable tile layer
+    :return: none
+    """
+    start_y = character.collision_rect.y
     character.apply_gravity()
-    collidable_sprites = sprites.sprites()
-
-    for sprite in collidable_sprites:
-        if sprite.rect.colliderect(character.collision_rect):
-            if character.direction.y > 0 and sprite.rect.centery > character.collision_rect.centery:  # Falling
-                character.collision_rect.bottom = sprite.rect.top
-                character.direction.y = 0
-                character.on_ground = True
-            elif character.direction.y < 0 and sprite.rect.centery < character.collision_rect.centery:
-                character.collision_rect.top = sprite.rect.bottom
-                character.direction.y = 0
+    collision_rect = character.collision_rect
+    first_col = max(collision_rect.left // TILE_SIZE, layer.first_col)
+    last_col = min((collision_rect.right - 1) // TILE_SIZE, layer.end_col() - 1)
+
+    for row in cell_rows(collision_rect, layer):
+        cells = layer.cells[row]
+        for col in range(first_col, last_col + 1):
+            if cells[col - layer.first_col] != EMPTY and \
+                    push_vertically(character, pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)):
+                update_on_ground(character)
+                return
+    if abs(collision_rect.y - start_y) >= TILE_SIZE / 2:
+        passed = collision_rect.union(collision_rect.move(0, start_y - collision_rect.y))
+        stop_tunneling(character, start_y, [tile.rect for tile in layer.tiles_in_rect(passed)])
+    update_on_ground(character)
+
+
+def push_horizontally(character, rect):
+    """
+    This function pushes character out of a terrain rectangle it has walked into
+
+    :param character: movement object of character
+    :param rect: terrain rectangle
+    :return: none
+    """
+    if rect.colliderect(character.collision_rect):
+        if rect.centerx < character.collision_rect.centerx:
+            character.collision_rect.left = rect.right
+            character.on_right = False
+            character.on_left = True
+
+        elif rect.centerx > character.collision_rect.centerx:
+            character.collision_rect.right = rect.left
+            character.on_right = True
+            character.on_left = False
+
+
+def push_vertically(character, rect):
+    """
+    This function puts character on a terrain rectangle it has fallen on, or under one it has jumped into
+
+    Once character is pushed, its vertical direction is 0, so no other rectangle can push it in the same check.
+
+    :param character: movement object of character
+    :param rect: terrain rectangle
+    :return: True if character has been pushed
+    """
+    if rect.colliderect(character.collision_rect):
+        if character.direction.y > 0 and rect.centery > character.collision_rect.centery:  # Falling
+            character.collision_rect.bottom = rect.top
+            character.direction.y = 0
+            character.on_ground = True
+            return True
+        elif character.direction.y < 0 and rect.centery < character.collision_rect.centery:
+            character.collision_rect.top = rect.bottom
+            character.direction.y = 0
+            return True
+    return False
+
+
+def stop_tunneling(character, start_y, rects):
+    """
+    This function stops character which has fallen or jumped through terrain during one long step
+
+    A step shorter than half a tile ends before the center of any tile it has entered, so push_vertically
+    has caught it already. Longer steps are swept from the position before gravity was applied.
+
+    :param character: movement object of character, after gravity was applied
+    :param start_y: y coordinate of character's collision rectangle before gravity was applied
+    :param rects: terrain rectangles around the path of character
+    :return: none
+    """
+    step = character.collision_rect.y - start_y
+    if abs(step) < TILE_SIZE / 2:
+        return
+    impact = sweep(character.collision_rect.move(0, -step), 0, step, rects)
+    if impact is not None:
+        rect = impact[1]
+        if step > 0:
+            character.collision_rect.bottom = rect.top
+            character.on_ground = True
+        else:
+            character.collision_rect.top = rect.bottom
+        character.direction.y = 0
+
+
+def sweep(rect, dx, dy, rects):
+    """
+    This function finds the first of terrain rectangles which a rectangle moving by (dx, dy) runs into
+
+    :param rect: moving rectangle at the start of the move
+    :param dx: horizontal move
+    :param dy: vertical move
+    :param rects: terrain rectangles
+    :return: time of impact (0 at the start, 1 at the end of the move) and the rectangle hit, or None
+    """
+    impact = None
+    for obstacle in rects:
+        time = time_of_impact(rect, dx, dy, obstacle)
+        if time is not None and (impact is None or time < impact[0]):
+            impact = (time, obstacle)
+    return impact
+
+
+def sweep_grid(rect, dx, dy, layer):
+    """
+    This function finds the first solid cell of a tile layer which a rectangle moving by (dx, dy) runs into
+
+    :param rect: moving rectangle at the start of the move
+    :param dx: horizontal move
+    :param dy: vertical move
+    :param layer: the collideable tile layer
+    :return: time of impact (0 at the start, 1 at the end of the move) and the rectangle of the cell, or None
+    """
+    passed = rect.union(rect.move(dx, dy))
+    return sweep(rect, dx, dy, [tile.rect for tile in layer.tiles_in_rect(passed)])
+
+
+def time_of_impact(rect, dx, dy, obstacle):
+    """
+    This function computes when a rectangle moving by (dx, dy) starts to overlap an obstacle
+
+    Rectangles which overlap already at the start of the move are left to the regular collision checks.
+
+    :param rect: moving rectangle at the start of the move
+    :param dx: horizontal move
+    :param dy: vertical move
+    :param obstacle: static rectangle
+    :return: time of impact, from 0 (start) up to but excluding 1 (end of the move), or None
+    """
+    entry_x, exit_x = axis_overlap(rect.left, rect.right, obstacle.left, obstacle.right, dx)
+    entry_y, exit_y = axis_overlap(rect.top, rect.bottom, obstacle.top, obstacle.bottom, dy)
+    entry, leave = max(entry_x, entry_y), min(exit_x, exit_y)
+    if entry < leave and 0 <= entry < 1:
+        return entry
+    return None
+
+
+def axis_overlap(start, end, obstacle_start, obstacle_end, delta):
+    """
+    This function returns the time range in which a segment moving by delta overlaps a static one
+
+    :return: times of entry and exit, infinite if the segments always overlap, an empty range if never
+    """
+    if delta > 0:
+        return (obstacle_start - end) / delta, (obstacle_end - start) / delta
+    if delta < 0:
+        return (obstacle_end - start) / delta, (obstacle_start - end) / delta
+    if start < obstacle_end and end > obstacle_start:
+        return -math.inf, math.inf
+    return math.inf, -math.inf
+
+
+def update_on_ground(character):
+    """
+    This function clears the on_ground flag of character which is jumping or falling
+
+    :param character: movement object of character
+    :return: none
+    """
     if character.on_ground and character.direction.y < 0 or character.direction.y > 1:
         character.on_ground = False
+
+
+def cell_rows(rect, layer):
+    """
+    This function returns rows of tile layer cells overlapping a rectangle
+
+    :param rect: the rectangle to check
+    :param layer: the tile layer
+    :return: range of row indexes
+    """
+    return range(max(rect.top // TILE_SIZE, 0), min((rect.bottom - 1) // TILE_SIZE, layer.rows - 1) + 1)
+
+
+def collision_area(character):
+    """
+    This function returns the area which character can reach during the next collisions check
+
+    :param character: movement object of character
+    :return: rectangle covering current position and both movement steps
+    """
+    step_x = abs(character.direction.x * character.speed) + 1
+    step_y = abs(character.direction.y + character.gravity) + 1
+    return character.collision_rect.inflate(2 * step_x, 2 * step_y)
@@ -1,20 +1,33 @@
 import pygame
-from tools.support import import_image, scale_image, import_cut_graphics, import_folder, import_character_assets
+from tools.support import import_image, scale_image
+from tools.loading import ParallelLoader
+from tools.atlas import pack_animations
+from tools.flipped_frames import FlippedFrames
 from tools.settings import TERRAIN_PATH, PRIMAL_TILE_SIZE, TILE_SIZE, CHEST_PATH, FIREPLACE_PATH, \
     SCALE, ENEMY_ANIMATIONS_PATH, ITEM_PATH, UI_ITEM_IMAGE_SIZE, PORTAL_PATH, CORPSE_PATH
 
 
 class ImagesManager:
     """
-    This class is used to store and manage all the images in the game
+    This class is used to store and manage all the images in the game.
+    Images are decoded on a thread pool, the progress of loading is reported to the given callback.
     """
-    def __init__(self, screen):
+    def __init__(self, screen, progress=None):
         self.display_surface = screen
-        self.background = self.load_background(self.display_surface.get_size(), 'content/graphics/overworld/background.png')
-        self.terrain_tiles = self.load_terrain()
-        self.terrain_elements = self.load_terrain_elements()
-        self.enemies = self.load_enemies_animations()
-        self.items = self.load_items()
+        loader = ParallelLoader(progress)
+        background = loader.image('content/graphics/overworld/background.png', self.display_surface.get_size())
+        terrain_tiles = self.queue_terrain(loader)
+        terrain_elements = self.queue_terrain_elements(loader)
+        enemies = self.queue_enemies_animations(loader)
+        items = self.queue_items(loader)
+        loader.run()
+
+        self.background = loader.frames(background)[0]
+        self.terrain_tiles = loader.frames(terrain_tiles)
+        self.terrain_elements = {name: loader.frames(jobs) for name, jobs in terrain_elements.items()}
+        self.terrain_elements['corpse'] = self.terrain_elements['corpse'][0]
+        self.enemies = self.build_enemies_animations(loader, enemies)
+        self.items = {item: loader.frames(jobs)[0] for item, jobs in items.items()}
 
     @staticmethod
     def load_background(size, path) -> pygame.surface.Surface:
@@ -28,61 +41,63 @@ class ImagesManager:
         return background
 
     @staticmethod
-    def load_terrain() -> list:
+    def queue_terrain(loader: ParallelLoader) -> list:
         """
-        This method loads terrain tiles
+        This method adds loading of terrain tiles to the loader
 
-        :return: list of images
+        :return: list of jobs
         """
-        terrain_tiles = import_cut_graphics(TERRAIN_PATH, (PRIMAL_TILE_SIZE, PRIMAL_TILE_SIZE))
-        scaled_tiles = []
-        for tile in terrain_tiles:
-            scaled = scale_image(tile, (TILE_SIZE, TILE_SIZE))
-            scaled_tiles.append(scaled)
-        return scaled_tiles
+        return loader.cut_graphics(TERRAIN_PATH, (PRIMAL_TILE_SIZE, PRIMAL_TILE_SIZE), (TILE_SIZE, TILE_SIZE))
 
     @staticmethod
-    def load_terrain_elements() -> dict:
+    def queue_terrain_elements(loader: ParallelLoader) -> dict:
         """
-        This method loads terrain elements tiles
+        This method adds loading of terrain elements tiles to the loader
 
-        :return: Returns a dictionary containing lists of images
+        :return: Returns a dictionary containing lists of jobs
         """
-        images = {
-            'bonfire': import_folder(FIREPLACE_PATH),
-            'chest': import_folder(CHEST_PATH),
-            'portal': import_folder(PORTAL_PATH),
-            'corpse': import_image(CORPSE_PATH)
+        return {
+            'bonfire': loader.folder(FIREPLACE_PATH),
+            'chest': loader.folder(CHEST_PATH),
+            'portal': loader.folder(PORTAL_PATH),
+            'corpse': loader.image(CORPSE_PATH)
         }
-        return images
 
     @staticmethod
-    def load_enemies_animations() -> tuple[dict, dict]:
+    def queue_enemies_animations(loader: ParallelLoader) -> dict:
         """
-        This method loads enemies animation frames.
+        This method adds loading of enemies animation frames to the loader.
 
-        :return: Returns a two dictionary containing dictionary of animations and flipped animations.
+        :return: Returns a dictionary of enemies containing dictionaries of animation jobs.
         """
         enemies = {'sceleton': (SCALE*1.0, False), 'ninja': (SCALE*1.0, False), 'wizard': (SCALE*1.0, False), 'dark_knight': (SCALE*0.2, True)}
-        positions = {'idle': [], 'run': [], 'jump': [], 'fall': [], 'attack': [], 'dead': [], 'hit': [], 'stun': []}
-        animations = {'sceleton': positions.copy(), 'ninja': positions.copy(), 'wizard': positions.copy(), 'dark_knight': positions.copy()}
-        flip_animations = {'sceleton': positions.copy(), 'ninja': positions.copy(), 'wizard': positions.copy(), 'dark_knight': positions.copy()}
-        for enemy, frames in animations.items():
-            import_character_assets(frames, f'{ENEMY_ANIMATIONS_PATH}/{enemy}/', scale=enemies[enemy][0], flip=enemies[enemy][1])
-        enemies = {'sceleton': (SCALE*1.0, True), 'ninja': (SCALE*1.0, True), 'wizard': (SCALE*1.0, True), 'dark_knight': (SCALE*0.2, False)}
-        for enemy, frames in flip_animations.items():
-            import_character_assets(frames, f'{ENEMY_ANIMATIONS_PATH}/{enemy}/', scale=enemies[enemy][0], flip=enemies[enemy][1])
+        positions = ('idle', 'run', 'jump', 'fall', 'attack', 'dead', 'hit', 'stun')
+        return {
+            enemy: {position: loader.folder(f'{ENEMY_ANIMATIONS_PATH}/{enemy}/{position}', scale, flip) for position in positions}
+            for enemy, (scale, flip) in enemies.items()
+        }
+
+    @staticmethod
+    def build_enemies_animations(loader: ParallelLoader, jobs: dict) -> tuple[dict, dict]:
+        """
+        This method builds enemies animations from loaded frames.
+
+        :return: Returns a two dictionary containing dictionary of animations and flipped animations.
+        Flipped animations are mirrored from the loaded frames when they are used for the first time.
+        """
+        animations = {}
+        flip_animations = {}
+        for enemy, positions in jobs.items():
+            frames = {position: loader.frames(position_jobs) for position, position_jobs in positions.items()}
+            animations[enemy] = pack_animations((frames,))[0]
+            flip_animations[enemy] = FlippedFrames(animations[enemy])
         return animations, flip_animations
 
     @staticmethod
-    def load_items() -> dict:
+    def queue_items(loader: ParallelLoader) -> dict:
         """
-        This method loads items images.
+        This method adds loading of items images to the loader.
 
-        :return: Returns a dictionary containing item images.
+        :return: Returns a dictionary containing item jobs.
         """
-        items = {}
-        for item, path in ITEM_PATH.items():
-            items[item] = pygame.image.load(path).convert_alpha()
-            items[item] = scale_image(items[item], UI_ITEM_IMAGE_SIZE)
-        return items
+        return {item: loader.image(path, UI_ITEM_IMAGE_SIZE) for item, path in ITEM_PATH.items()}
@@ -4,10 +4,11 @@ from tools.settings import ITEM_LEVEL_WEIGHT, ITEM_DMG_MULTIPLIERS, ITEM_BASE_DM
 from terrain.items import Item, Sword, Bow, Shield, Potion
 
 
-def generate_content_amount() -> int:
+def generate_content_amount(rng=random) -> int:
     """
     This function generates the number of items in chest or hat have fallen off the opponent
 
+    :param rng: random number generator
     :return: amount of items
     """
     weights = []
@@ -15,26 +16,27 @@ def generate_content_amount() -> int:
     for key, value in ITEM_LOOT_ODDS_1.items():
         amounts.append(key)
         weights.append(value)
-    amount = random.choices(amounts, weights=weights)[0]  # How many items dropped
+    amount = rng.choices(amounts, weights=weights)[0]  # How many items dropped
     return amount
 
 
-def generate_item(level: int, kind: str) -> dict:
+def generate_item(level: int, kind: str, rng=random) -> dict:
     """
     Generating dictionary with parameters for new item
 
+    :param rng: random number generator
     :return: dict with parameters
     """
     levels = [level, level+1, level+2]
-    item_lvl = random.choices(levels, weights=ITEM_LEVEL_WEIGHT)[0]  # What item dropped
+    item_lvl = rng.choices(levels, weights=ITEM_LEVEL_WEIGHT)[0]  # What item dropped
     start = ITEM_DMG_MULTIPLIERS[0]
     end = ITEM_DMG_MULTIPLIERS[1]
     step = ITEM_DMG_MULTIPLIERS[2]
     multipliers = [round(x, 1) for x in [start + i * step for i in range(int((end - start) / step) + 1)]]
-    multiplier = random.choices(multipliers)[0]
+    multiplier = rng.choices(multipliers)[0]
     item_dmg = int(ITEM_BASE_DMG[kind] + item_lvl * multiplier)
     item_price = int(ITEM_BASE_PRICE[kind] + item_lvl * multiplier)
-    item_name = random.choices(ITEM_NAMES[kind])[0]
+    item_name = rng.choices(ITEM_NAMES[kind])[0]
     item = {
         'name': item_name,
         'kind': kind,
@@ -53,6 +55,21 @@ def generate_loot_content(level, amount: int, owner: list) -> list:
     :param owner: corpse for which a list is generated [object, 'kind of object']
     :return: list of items
     """
+    items_generated = roll_loot(owner[0].level, amount)
+    content = []
+    for element in create_items(level, items_generated, owner):
+        content.append(element)
+    return content
+
+
+def roll_loot(level: int, amount: int, rng=random) -> list:
+    """
+    This function draws parameters of items, without creating them, so it can run on a worker thread
+    :param level: level of the loot owner
+    :param amount: items amount
+    :param rng: random number generator
+    :return: list of dicts with parameters of items
+    """
     items_generated = []
     for place in range(0, amount):
         weights = []
@@ -60,12 +77,9 @@ def generate_loot_content(level, amount: int, owner: list) -> list:
         for key, value in ITEM_LOOT_ODDS_2.items():
             items.append(key)
             weights.append(value)
-        item_kind = random.choices(items, weights=weights)[0]  # What item dropped
-        items_generated.append(generate_item(owner[0].level, item_kind))
-    content = []
-    for element in create_items(level, items_generated, owner):
-        content.append(element)
-    return content
+        item_kind = rng.choices(items, weights=weights)[0]  # What item dropped
+        items_generated.append(generate_item(level, item_kind, rng))
+    return items_generated
 
 
 def create_items(level_ref, item_list: list, owner: list) -> list:
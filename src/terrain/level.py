@@ -9,25 +9,47 @@ handling player actions and movements, and managing enemy interactions.
 It provides essential functions for running the game loop
 and updating the game state during gameplay.
 """
+import random
+from concurrent.futures import ThreadPoolExecutor
 import pygame
 import tracemalloc
 from terrain.images_manager import ImagesManager
-from terrain.map_generator import generate_map, generate_enemies, create_tile_group
-from tools.support import import_csv_file, now, draw_text, puts
+from terrain.map_generator import create_tile_group
+from terrain.level_blueprint import LevelBlueprint, StreamBlueprint
+from terrain.level_stream import LevelStream
+from tools.support import import_csv_file, now, puts, text_cache_info
 from tools.game_data import levels
-from tools.settings import TILE_SIZE, PLAYER_DEATH_LATENCY, ENEMY_DEATH_LATENCY, GREY, \
-    FONT_SMALL, PLAYER_SPAWN_POSITION
+from tools.assets import assets
+from tools.settings import TILE_SIZE, PLAYER_DEATH_LATENCY, ENEMY_DEATH_LATENCY, \
+    PLAYER_SPAWN_POSITION, LEVEL_PREGENERATE_DISTANCE, LEVEL_STREAMING, COLLISION_MODE
 from terrain.tiles import check_for_usable_elements
 from terrain.chest import Chest
 from terrain.corpse import create_corpse
-from terrain.collisions import check_collisions
+from terrain.collisions import check_collisions, check_grid_collisions, collision_area
 from terrain.items import Item
 from terrain.items_generator import clean_items
 from character.player import Player
 from combat.fighting import FightManager
+from entities.enemy_animations import draw_health_bars
 from terrain.camera import Camera
+from terrain.chunks import TerrainChunks
+from terrain.tile_layer import TileLayer
+from terrain.collision_mesh import CollisionMesh
 from terrain.animations import SoulAnimation
 from management.multiple_enemies import show_multiple_enemies
+from management.profiler import Profiler
+
+# One worker thread, shared by all levels, draws the next level in the background:
+blueprint_generator = ThreadPoolExecutor(1, thread_name_prefix='level_blueprint')
+
+
+def blueprint_class():
+    """
+    Returns:
+        type: StreamBlueprint, which draws segments while the level is played, if LEVEL_STREAMING is on,
+            otherwise LevelBlueprint.
+    """
+    return StreamBlueprint if LEVEL_STREAMING else LevelBlueprint
 
 
 class Level:
@@ -50,6 +72,7 @@ class Level:
         self.create_main_menu = game.create_main_menu
         self.create_death_scene = game.create_death_scene
         self.next_level = game.next_level
+        self.show_loading = game.show_loading
 
         # Check for game loading time
         loading_counter = pygame.time.get_ticks()
@@ -57,18 +80,30 @@ class Level:
         # Fighting:
         self.fight_manager = FightManager()
 
+        # Profiling:
+        self.profiler = Profiler()
+
         # Images:
-        self.images = ImagesManager(self.display_surface)
+        self.images = ImagesManager(self.display_surface, self.show_loading)
+
+        # Next level, drawn in the background when the player gets close to the portal:
+        self.next_blueprint = None
+        self.portal_position = None
+        self.stream = None
 
         self.animations = []
         self.player = pygame.sprite.GroupSingle()
-        self.terrain_sprite = pygame.sprite.Group()
-        self.ter_near_sprites = pygame.sprite.Group()
-        self.collideable_sprites = pygame.sprite.Group()
-        self.col_near_sprites = pygame.sprite.Group()
+        self.terrain_tiles = None
+        self.collideable_tiles = None
+        self.collision_mesh = None
+        self.near_tiles = 0
         self.terrain_elements_sprite = pygame.sprite.Group()
         self.enemy_sprites = pygame.sprite.Group()
+        self.near_enemies = []
+        self.near_elements = []
+        self.terrain_chunks = None
         self.camera = None
+        self.presented_offset = None
 
         self.configure_level()
 
@@ -80,16 +115,26 @@ class Level:
         clean_items(Item.items)
         if not player:
             puts('There has been a reset of the player')
+            for sprite in self.player:
+                sprite.release_assets()
             pygame.sprite.GroupSingle.empty(self.player)
+        for animation in self.animations:
+            animation.release()
         self.animations = []
+        self.near_enemies = []
+        self.near_elements = []
 
-        pygame.sprite.Group.empty(self.terrain_sprite)
-        pygame.sprite.Group.empty(self.ter_near_sprites)
-        pygame.sprite.Group.empty(self.collideable_sprites)
-        pygame.sprite.Group.empty(self.col_near_sprites)
+        self.terrain_tiles = None
+        self.collideable_tiles = None
+        self.collision_mesh = None
+        self.near_tiles = 0
         pygame.sprite.Group.empty(self.terrain_elements_sprite)
         pygame.sprite.Group.empty(self.enemy_sprites)
+        self.terrain_chunks = None
         self.camera = None
+        self.presented_offset = None
+        self.portal_position = None
+        self.stream = None
         Chest.chests = []
 
         self.fight_manager.clear_groups()
@@ -111,20 +156,54 @@ class Level:
             self.player_setup(player_layout)
         self.get_player().reset_position(PLAYER_SPAWN_POSITION)
 
+        # Level generation (pre-generated in the background, if the player has come close to the portal)
+        if self.next_blueprint is not None:
+            blueprint = self.next_blueprint.result()
+        else:
+            blueprint = blueprint_class()(random)
+        self.next_blueprint = None
+        self.portal_position = blueprint.portal_position
+
+        # Map camera configuration (a streamed map gets wider as its segments are drawn):
+        self.camera = Camera(blueprint.map_width(), blueprint.map_height())
+
+        if LEVEL_STREAMING:
+            # Segments are drawn, and their tiles and sprites created, only around the player:
+            self.terrain_tiles = TileLayer(0, blueprint.rows, self.images.terrain_tiles)
+            self.collideable_tiles = TileLayer(0, blueprint.rows, self.images.terrain_tiles)
+            self.collision_mesh = CollisionMesh(self.collideable_tiles) if COLLISION_MODE == 'mesh' else None
+            self.terrain_chunks = TerrainChunks(())
+            self.terrain_elements_sprite = pygame.sprite.Group()
+            self.enemy_sprites = pygame.sprite.Group()
+            self.stream = LevelStream(self, blueprint)
+            self.stream.update(self.get_player().movement.collision_rect.centerx)
+            return
+
         # Terrain import
-        terrain_layout, terrain_elements_layout = generate_map()
-        self.terrain_sprite = create_tile_group(terrain_layout, 'terrain', self.images, self, self.fight_manager)
-        self.collideable_sprites = create_tile_group(terrain_layout, 'collideable', self.images, self, self.fight_manager)
+        terrain_layout = blueprint.terrain_layout
+        self.terrain_tiles = TileLayer(len(terrain_layout[0]), len(terrain_layout), self.images.terrain_tiles,
+                                       terrain_layout, 'terrain')
+        self.collideable_tiles = TileLayer(len(terrain_layout[0]), len(terrain_layout), self.images.terrain_tiles,
+                                           terrain_layout, 'collideable')
+        self.terrain_chunks = TerrainChunks((self.collideable_tiles, self.terrain_tiles))
+        self.collision_mesh = CollisionMesh(self.collideable_tiles) if COLLISION_MODE == 'mesh' else None
 
         # Terrain elements import
-        self.terrain_elements_sprite = create_tile_group(terrain_elements_layout, 'terrain_elements', self.images, self, self.fight_manager)
+        self.terrain_elements_sprite = create_tile_group(blueprint.terrain_elements_layout, 'terrain_elements', self.images, self, self.fight_manager, blueprint)
 
         # Enemy
-        enemy_layout = generate_enemies(len(terrain_layout[0]) * TILE_SIZE)
-        self.enemy_sprites = create_tile_group(enemy_layout, 'enemies', self.images, self, self.fight_manager)
+        self.enemy_sprites = create_tile_group(blueprint.enemy_layout, 'enemies', self.images, self, self.fight_manager, blueprint)
 
-        # Map camera configuration:
-        self.camera = Camera(len(terrain_layout[0]) * TILE_SIZE, len(terrain_layout) * TILE_SIZE)
+    def pregenerate_next_level(self, player_pos: int):
+        """
+        Start drawing the next level on a worker thread when the player gets close to the portal.
+
+        Args:
+            player_pos (int): The x-coordinate of the player's center.
+        """
+        if self.next_blueprint is None and self.portal_position is not None and \
+                abs(self.portal_position[0] + TILE_SIZE / 2 - player_pos) < LEVEL_PREGENERATE_DISTANCE:
+            self.next_blueprint = blueprint_generator.submit(blueprint_class(), random.Random(random.getrandbits(64)))
 
     def player_setup(self, layout):
         """
@@ -155,106 +234,234 @@ class Level:
             return player
 
     def find_near_tiles(self, player_pos):
-        pygame.sprite.Group.empty(self.col_near_sprites)
-        pygame.sprite.Group.empty(self.ter_near_sprites)
+        left = player_pos + self.camera.view[0]
+        right = player_pos + self.camera.view[1]
+        self.near_tiles = self.collideable_tiles.count_between(left, right) + self.terrain_tiles.count_between(left, right)
 
-        for sprite in self.collideable_sprites:
-            if self.camera.view[0] < sprite.rect.centerx - player_pos < self.camera.view[1]:
-                self.col_near_sprites.add(sprite)
-        for sprite in self.terrain_sprite:
-            if self.camera.view[0] < sprite.rect.centerx - player_pos < self.camera.view[1]:
-                self.ter_near_sprites.add(sprite)
+    def collide(self, movement):
+        """
+        Check collisions of a character with terrain: against merged runs of tiles near the character,
+        or against the cells under the character if COLLISION_MODE is 'grid'.
 
-    def run(self):
+        Args:
+            movement: The movement object of the character.
         """
-        Run the game loop for the level.
+        if self.collision_mesh is None:
+            check_grid_collisions(movement, self.collideable_tiles)
+        else:
+            check_collisions(movement, self.collision_mesh.rects_in_rect(collision_area(movement)))
+
+    def changed_rects(self, offset: pygame.math.Vector2, world_rects: list, screen_rects: list) -> list | None:
         """
-        drawing_all = now()
-        self.display_surface.blit(self.images.background, (0, 0))
+        Get screen areas changed in this frame.
+
+        Args:
+            offset (pygame.math.Vector2): The camera offset used for drawing.
+            world_rects (list): Changed areas in map coordinates.
+            screen_rects (list): Changed areas in screen coordinates.
+
+        Returns:
+            list: Changed rectangles, or None if the camera has scrolled and the whole screen has changed.
+        """
+        if self.presented_offset != offset:
+            self.presented_offset = offset.copy()
+            return None
+        changed = [rect.move(-int(offset.x), -int(offset.y)) for rect in world_rects]
+        changed.extend(screen_rects)
+        return changed
+
+    def update(self):
+        """
+        Advance the level simulation by one fixed step.
+        """
+        self.near_enemies = []
+        self.camera.save_offset()
 
         player = self.get_player()
         player_pos = player.movement.collision_rect.centerx
+        if self.stream is not None:
+            self.stream.update(player_pos)
         self.find_near_tiles(player_pos)
+        self.pregenerate_next_level(player_pos)
+
+        # Fighting:
+        with self.profiler.measure('fight'):
+            self.fight_manager.attack_update(self.collideable_tiles)
+        with self.profiler.measure('damage'):
+            self.fight_manager.check_damage(player, self.enemy_sprites)
+
+        with self.profiler.measure('elements'):
+            # Terrain elements:
+            self.near_elements = []
+            for sprite in self.terrain_elements_sprite:
+                if self.camera.view[0] < sprite.rect.centerx - player_pos < self.camera.view[1]:
+                    sprite.update()
+                    self.near_elements.append(sprite)
+            # Animations:
+            for index, animation in enumerate(self.animations):
+                animation.update(self.camera.offset)
+                if animation.finish:
+                    animation.release()
+                    del animation
+                    self.animations.pop(index)
+
+        # Player -----------------------------------------------------------
+        with self.profiler.measure('player'):
+            if not self.game_over:
+                player.movement.save_position()
+                self.player.update(self.display_surface)
+                self.collide(player.movement)
+                self.camera.scroll_camera(self.display_surface.get_size(), player.movement)
+
+                player.status.can_use_object = check_for_usable_elements(
+                    player,
+                    self.terrain_elements_sprite
+                )
+                player.status.check_for_pickable()
+
+                if player.properties.dead['status'] and \
+                        now() - player.properties.dead['time'] > PLAYER_DEATH_LATENCY:
+                    self.create_death_scene()
+                    self.game_over = True
+        # Enemies -----------------------------------------------------------
+        with self.profiler.measure('enemies'):
+            for enemy in self.enemy_sprites:
+                if self.camera.view[0] < enemy.animations.rect.centerx - player_pos < self.camera.view[1]:
+                    self.near_enemies.append(enemy)
+                    enemy.movement.save_position()
+                    enemy.update()
+                    self.collide(enemy.movement)
+                    if not enemy.properties.dead['status']:
+                        enemy.fighting.check_for_combat(player)
+                    elif enemy.properties.dead['status'] and \
+                            now() - enemy.properties.dead['time'] > ENEMY_DEATH_LATENCY:
+                        soul_animation = SoulAnimation(
+                            enemy.animations.rect.center,
+                            'soul',
+                            self.display_surface.get_size()
+                        )
+                        self.animations.append(soul_animation)
+                        create_corpse(self, enemy, self.terrain_elements_sprite)
+                        enemy.kill()
+        # UI -----------------------------------------------------------
+        with self.profiler.measure('ui'):
+            if not player.properties.dead['status']:
+                player.ui.update_experience()
+
+    def draw(self, alpha: float = 1.0):
+        """
+        Draw the level.
+
+        Args:
+            alpha (float): Position between the previous and the current simulation step,
+                used to interpolate camera and characters.
+
+        Returns:
+            list: Screen areas changed in this frame, or None if the whole screen has changed.
+        """
+        world_rects = []
+        screen_rects = []
+        offset = self.camera.interpolate(alpha)
+
+        player = self.get_player()
+
+        with self.profiler.measure('terrain'):
+            self.display_surface.blit(self.images.background, (0, 0))
 
         # Fighting:
-        self.fight_manager.attack_update(self.display_surface, self.camera.offset)
-        self.fight_manager.check_damage(self.get_player(), self.enemy_sprites)
+        with self.profiler.measure('fight'):
+            self.fight_manager.draw(self.display_surface, offset)
+            world_rects.extend(self.fight_manager.changed_rects())
 
         # Draw terrain  -----------------------------------------------------------
-        for sprite in self.col_near_sprites:
-            sprite.update()
-            sprite.draw(self.display_surface, self.camera.offset)
-        for sprite in self.ter_near_sprites:
-            sprite.update()
-            sprite.draw(self.display_surface, self.camera.offset)
-        for sprite in self.terrain_elements_sprite:
-            if self.camera.view[0] < sprite.rect.centerx - player_pos < self.camera.view[1]:
-                sprite.update()
-                sprite.draw(self.display_surface, self.camera.offset)
-        # Animations:
-        for index, animation in enumerate(self.animations):
-            animation.update(self.camera.offset)
-            animation.draw(self.display_surface, self.camera.offset)
-            if animation.finish:
-                del animation
-                self.animations.pop(index)
+        with self.profiler.measure('terrain'):
+            self.terrain_chunks.draw(self.display_surface, offset)
+        with self.profiler.measure('elements'):
+            for sprite in self.near_elements:
+                if not sprite.alive():
+                    continue
+                sprite.draw(self.display_surface, offset)
+                world_rects.append(sprite.rect)
+            # Animations:
+            for animation in self.animations:
+                animation.draw(self.display_surface, offset)
+                world_rects.append(animation.rect)
 
         # Draw player -----------------------------------------------------------
-        if not self.game_over:
-            self.player.update(self.display_surface)
-            check_collisions(player.movement, self.col_near_sprites)
-            self.camera.scroll_camera(self.display_surface.get_size(), player.movement)
-
-            player.status.can_use_object = check_for_usable_elements(
-                player,
-                self.terrain_elements_sprite
-            )
-            player.status.check_for_pickable()
-
-            player.animations.draw(self.display_surface, self.camera.offset, player.status, player.movement)
-            if player.properties.dead['status'] and \
-                    now() - player.properties.dead['time'] > PLAYER_DEATH_LATENCY:
-                self.create_death_scene()
-                self.game_over = True
+        with self.profiler.measure('player'):
+            if not self.game_over:
+                player.animations.draw(self.display_surface, interpolate_offset(player.movement, offset, alpha),
+                                       player.status, player.movement)
+                world_rects.append(player.animations.rect.union(player.movement.collision_rect).inflate(200, 80))
         # Draw enemies -----------------------------------------------------------
-        enemy_counter = 0
-        near_enemy = []
-        for enemy in self.enemy_sprites:
-            if self.camera.view[0] < enemy.animations.rect.centerx - player_pos < self.camera.view[1]:
-                near_enemy.append(enemy)
-                enemy_counter += 1
-                enemy.update()
-                check_collisions(enemy.movement, self.col_near_sprites)
-                if not enemy.properties.dead['status']:
-                    enemy.animations.draw_health_bar(self.display_surface, self.camera.offset)
-                    enemy.fighting.check_for_combat(self.get_player())
-                elif enemy.properties.dead['status'] and \
-                        now() - enemy.properties.dead['time'] > ENEMY_DEATH_LATENCY:
-                    soul_animation = SoulAnimation(
-                        enemy.animations.rect.center,
-                        'soul',
-                        self.display_surface.get_size()
-                    )
-                    self.animations.append(soul_animation)
-                    create_corpse(self, enemy, self.terrain_elements_sprite)
-                    enemy.kill()
-                enemy.animations.draw(self.display_surface, self.camera.offset)
+        with self.profiler.measure('enemies'):
+            visible_enemies = [(enemy, interpolate_offset(enemy.movement, offset, alpha))
+                               for enemy in self.near_enemies if enemy.alive()]
+            draw_health_bars(self.display_surface, visible_enemies)
+            for enemy, enemy_offset in visible_enemies:
+                enemy.animations.draw(self.display_surface, enemy_offset)
+                world_rects.append(enemy.animations.rect.union(enemy.movement.collision_rect).inflate(200, 80))
         # Show UI -----------------------------------------------------------
-        if not player.properties.dead['status']:
-            player.ui.show_ui(self.display_surface, self.camera.offset, player)
-        player.equipment.update_show(self.display_surface)
+        with self.profiler.measure('ui'):
+            if not player.properties.dead['status']:
+                screen_rects.extend(player.ui.show_ui(self.display_surface, offset, player))
+            player.equipment.update_show(self.display_surface)
+            if player.equipment.show:
+                self.presented_offset = None
 
-        show_multiple_enemies(near_enemy, self.display_surface, 30, self.camera.offset)
+            screen_rects.append(show_multiple_enemies(self.near_enemies, self.display_surface, 30, offset))
 
         # Developing
-        memory_stats = tracemalloc.get_traced_memory()
-        used_memory = round(memory_stats[0] / (1024 ** 2), 4)
-        all_time = str((now() - drawing_all) / 1000)
+        with self.profiler.measure('debug'):
+            screen_rects.append(self.show_profiler())
+        self.profiler.end_frame()
 
-        show_info(self.display_surface, f'Terrain elements: {self.terrain_elements_sprite}, lvl: {self.current_level}', 0)
-        show_info(self.display_surface, f'Klocków: {len(self.col_near_sprites) + len(self.ter_near_sprites)}, enemies: {enemy_counter}/{len(self.enemy_sprites)}', 1)
-        show_info(self.display_surface, f'Memory use [MB]: {used_memory}, loop time: {all_time} s.', 2)
-        show_info(self.display_surface, f'Damage: {player.fighting.attack["damage"]}, skrzynie: {len(Chest.chests)}', 3)
+        return self.changed_rects(offset, world_rects, screen_rects)
+
+    def show_profiler(self) -> pygame.Rect | None:
+        """
+        Draw the profiler overlay with level statistics.
+
+        Returns:
+            pygame.Rect: The area changed by the overlay, or None if the overlay is hidden.
+        """
+        if not self.profiler.show:
+            return None
+        player = self.get_player()
+        used_memory = round(tracemalloc.get_traced_memory()[0] / (1024 ** 2), 4)
+        text_cache = text_cache_info()
+        return self.profiler.draw(self.display_surface, [
+            f'Terrain elements: {len(self.terrain_elements_sprite)}, lvl: {self.current_level}',
+            f'Klocków: {self.near_tiles}, enemies: {len(self.near_enemies)}/{len(self.enemy_sprites)}',
+            f'Memory use [MB]: {used_memory}, assets [MB]: {round(assets.memory() / (1024 ** 2), 2)}, damage: {player.fighting.attack["damage"]}, skrzynie: {len(Chest.chests)}',
+            f'Text cache: {text_cache["hits"]} hits, {text_cache["misses"]} misses, {text_cache["size"]} texts'
+        ])
+
+    def run(self):
+        """
+        Run one simulation step of the level and draw it.
+
+        Returns:
+            list: Screen areas changed in this frame, or None if the whole screen has changed.
+        """
+        self.update()
+        return self.draw()
+
+
+def interpolate_offset(movement, offset: pygame.math.Vector2, alpha: float) -> pygame.math.Vector2:
+    """
+    Get drawing offset which places a character between its previous and current position.
+
+    Args:
+        movement: The movement object of the character.
+        offset (pygame.math.Vector2): The camera offset.
+        alpha (float): Position between the previous and the current simulation step.
+
+    Returns:
+        pygame.math.Vector2: The offset to draw the character with.
+    """
+    if movement.previous_position is None:
+        return offset
+    delta = pygame.math.Vector2(movement.collision_rect.topleft) - movement.previous_position
+    return offset + delta * (1 - alpha)
 
-def show_info(screen, info, place) -> None:
-    draw_text(screen, f'{info}', FONT_SMALL, GREY, 750, 800 + 20 * place, left=True)
@@ -0,0 +1,157 @@
+"""
+This module defines the LevelBlueprint class, which draws everything random
+about a level (map segments, chest content, enemy positions and kinds)
+without creating any sprites.
+
+A blueprint does no pygame work, so the next level can be drawn on a worker
+thread while the current one is played. Sprites are created from the
+blueprint later, on the main thread, by `create_tile_group`.
+
+A `StreamBlueprint` draws a streamed level segment by segment, while it is
+played. Every segment gets its own random generator, seeded with the seed of
+the level and the index of the segment, so a segment dropped behind the
+player is drawn the same again when the player comes back. Only the first
+column and the first enemy id of every segment drawn so far are kept, so a
+level can be very long, or endless.
+"""
+import random
+from terrain.map_generator import generate_segments, join_segments, generate_enemies, generate_enemy_kind, \
+    generate_segment_enemies, SEGMENT_RENDERS
+from terrain.items_generator import generate_content_amount, roll_loot
+from terrain.chest import content_level
+from tools.segments import load_segment
+from tools.game_data import level_render
+from tools.settings import TILE_SIZE, LEVEL_RANDOM_SEGMENTS
+
+
+class LevelBlueprint:
+    """
+    Layouts of a level with pre-rolled chest loot and enemy kinds.
+    """
+    def __init__(self, rng=random) -> None:
+        """
+        :param rng: random number generator, a separate random.Random instance when drawn on a worker thread
+        """
+        segments, elements = generate_segments(rng)
+        self.segment_columns = [len(segment[0]) for segment in segments]
+        self.terrain_layout = join_segments(segments)
+        self.terrain_elements_layout = join_segments(elements)
+
+        self.chest_loot = {}
+        self.portal_position = None
+        for row_index, row in enumerate(self.terrain_elements_layout):
+            for col_index, val in enumerate(row):
+                x = col_index * TILE_SIZE
+                y = row_index * TILE_SIZE
+                if val == 0:
+                    self.chest_loot[(x, y)] = roll_loot(content_level(x), generate_content_amount(rng), rng)
+                elif val == 2:
+                    self.portal_position = (x, y)
+
+        self.enemy_layout = generate_enemies(self.map_width(), rng)
+        last = len(self.enemy_layout[0]) - 1
+        self.enemy_kinds = [generate_enemy_kind(col_index == last, rng) for col_index in range(last + 1)]
+
+    def map_width(self) -> int:
+        """
+        :return: width of the map in pixels
+        """
+        return len(self.terrain_layout[0]) * TILE_SIZE
+
+    def map_height(self) -> int:
+        """
+        :return: height of the map in pixels
+        """
+        return len(self.terrain_layout) * TILE_SIZE
+
+
+class SegmentBlueprint:
+    """
+    Layouts of one segment of a streamed level, with pre-rolled chest loot and enemy kinds.
+    """
+    def __init__(self, name: str, first_col: int, first_enemy: int, end: bool, rng) -> None:
+        """
+        :param name: name of the segment in level_render
+        :param first_col: column of the map where the segment starts
+        :param first_enemy: id of the first enemy of the segment
+        :param end: True if it's the last segment of the level
+        :param rng: random number generator of the segment
+        """
+        self.first_col = first_col
+        self.terrain_layout = load_segment(level_render[name])
+        self.terrain_elements_layout = load_segment(level_render[f'{name}_elements'])
+        self.columns = len(self.terrain_layout[0])
+
+        self.chest_loot = {}
+        self.portal_position = None
+        for row_index, row in enumerate(self.terrain_elements_layout):
+            for col_index, val in enumerate(row, first_col):
+                x = col_index * TILE_SIZE
+                y = row_index * TILE_SIZE
+                if val == 0:
+                    self.chest_loot[(x, y)] = roll_loot(content_level(x), generate_content_amount(rng), rng)
+                elif val == 2:
+                    self.portal_position = (x, y)
+
+        self.first_enemy = first_enemy
+        self.enemy_layout = generate_segment_enemies(first_col * TILE_SIZE, (first_col + self.columns) * TILE_SIZE,
+                                                     end, rng)
+        last = len(self.enemy_layout[0]) - 1
+        self.enemy_kinds = {first_enemy + index: generate_enemy_kind(end and index == last, rng)
+                            for index in range(last + 1)}
+
+
+class StreamBlueprint:
+    """
+    A level drawn segment by segment: start, random segments and end, or random segments without an end.
+    """
+    def __init__(self, rng=random, random_segments: int | None = LEVEL_RANDOM_SEGMENTS) -> None:
+        """
+        :param rng: random number generator, which draws the seed of the level
+        :param random_segments: number of segments between the start and the end, None for an endless level
+        """
+        self.seed = rng.getrandbits(64)
+        self.random_segments = random_segments
+        self.portal_position = None
+        # First column and first enemy id of every drawn segment, and of the next segment at the end:
+        self.bounds = [0]
+        self.first_enemies = [0]
+        self.rows = len(self.segment(0).terrain_layout)
+
+    def segment_count(self) -> int | None:
+        """
+        :return: number of segments of the level, None if the level is endless
+        """
+        return None if self.random_segments is None else self.random_segments + 2
+
+    def segment(self, index: int) -> SegmentBlueprint:
+        """
+        Draw a segment. Segments before it are drawn first if they haven't been yet, to find where it starts.
+
+        :param index: index of the segment
+        :return: the segment
+        """
+        for earlier in range(len(self.bounds) - 1, index):
+            self.segment(earlier)
+        rng = random.Random(self.seed + index)
+        end = index == self.segment_count() - 1 if self.random_segments is not None else False
+        name = 'start' if index == 0 else 'end' if end else rng.choice(SEGMENT_RENDERS)
+        segment = SegmentBlueprint(name, self.bounds[index], self.first_enemies[index], end, rng)
+        if index == len(self.bounds) - 1:
+            self.bounds.append(segment.first_col + segment.columns)
+            self.first_enemies.append(segment.first_enemy + len(segment.enemy_layout[0]))
+            if segment.portal_position is not None:
+                self.portal_position = segment.portal_position
+        return segment
+
+    def map_width(self) -> int:
+        """
+        :return: width of the drawn part of the map in pixels
+        """
+        return self.bounds[-1] * TILE_SIZE
+
+    def map_height(self) -> int:
+        """
+        :return: height of the map in pixels
+        """
+        return self.rows * TILE_SIZE
@@ -0,0 +1,218 @@
+"""
+This module defines the LevelStream class, which keeps tiles and sprites
+only for the segments of the level around the player.
+
+Segments are drawn by a `StreamBlueprint` when the player comes within
+LEVEL_STREAM_AHEAD segments of them, and their tiles, terrain elements and
+enemies are created then. They are removed when the player is more than
+LEVEL_STREAM_BEHIND segments past them. Tile layers hold only the columns of
+loaded segments, so the memory doesn't grow with the length of the level.
+
+Enemies belong to the segment they currently stand in, so an enemy following
+the player is removed with the segment it has walked into. A removed segment
+leaves only a small record behind: the ids of killed enemies, and the content
+of chests the player has looted from. Chests which weren't touched are created
+again from the blueprint loot. Corpses are dropped together with their segment.
+"""
+from bisect import bisect_right
+from terrain.map_generator import create_tile_group
+from terrain.chest import Chest
+from terrain.items import Item
+from tools.settings import TILE_SIZE, LEVEL_STREAM_AHEAD, LEVEL_STREAM_BEHIND
+
+
+class LevelStream:
+    """
+    Creates tiles and sprites of segments near the player and removes those of segments far from the player.
+    """
+    def __init__(self, level, blueprint) -> None:
+        """
+        Initialize the LevelStream object. Call `update` to create sprites of the first segments.
+
+        Args:
+            level (Level): The level which groups, layers and chunks receive the sprites.
+            blueprint (StreamBlueprint): The blueprint of the level, which draws segments.
+        """
+        self.level = level
+        self.blueprint = blueprint
+        self.bounds = blueprint.bounds  # First column of every drawn segment, and the end of the last one
+
+        self.loaded = {}
+        self.dead_enemies = set()
+        self.looted_chests = {}
+
+    def segment_at(self, x_pos: float) -> int:
+        """
+        Args:
+            x_pos (float): The x coordinate on the map.
+
+        Returns:
+            int: Index of the segment containing the coordinate.
+        """
+        segment = bisect_right(self.bounds, x_pos // TILE_SIZE) - 1
+        return min(max(segment, 0), len(self.bounds) - 2)
+
+    def update(self, player_pos: float) -> None:
+        """
+        Create tiles and sprites of segments close to the player and remove those of segments far behind or ahead.
+
+        Args:
+            player_pos (float): The x coordinate of the player's center.
+        """
+        current = self.segment_at(player_pos)
+        last = current + LEVEL_STREAM_AHEAD
+        if self.blueprint.segment_count() is not None:
+            last = min(last, self.blueprint.segment_count() - 1)
+        wanted = range(max(current - LEVEL_STREAM_BEHIND, 0), last + 1)
+        for segment in [segment for segment in self.loaded if segment not in wanted]:
+            self.unload(segment)
+        for segment in wanted:
+            if segment not in self.loaded:
+                self.load(segment)
+
+    def load(self, segment: int) -> None:
+        """
+        Create tiles and sprites of a segment and add them to the level.
+
+        Args:
+            segment (int): Index of the segment.
+        """
+        level = self.level
+        blueprint = self.blueprint.segment(segment)
+        first, last = self.bounds[segment], self.bounds[segment + 1]
+        self.move_window(set(self.loaded) | {segment})
+        level.camera.border['right'] = self.blueprint.map_width()
+        if blueprint.portal_position is not None:
+            level.portal_position = blueprint.portal_position
+
+        level.terrain_tiles.fill(blueprint.terrain_layout, 'terrain', first)
+        level.collideable_tiles.fill(blueprint.terrain_layout, 'collideable', first)
+        if level.collision_mesh is not None:
+            level.collision_mesh.update_columns(level.collideable_tiles, first, last - 1)
+        level.terrain_chunks.bake((level.collideable_tiles.tiles_in_columns(first, last - 1),
+                                   level.terrain_tiles.tiles_in_columns(first, last - 1)))
+
+        elements = create_tile_group(blueprint.terrain_elements_layout, 'terrain_elements', level.images, level,
+                                     level.fight_manager, blueprint, first)
+        chests = {}
+        for sprite in elements:
+            if sprite.kind == 'chest':
+                looted = self.looted_chests.pop(sprite.rect.topleft, None)
+                if looted is not None:
+                    restore_chest(sprite, looted)
+                chests[sprite] = list(sprite.equipment.content)
+        level.terrain_elements_sprite.add(elements)
+
+        # Enemies which have walked into other loaded segments are still on the map:
+        present = {enemy.status.id for parts in self.loaded.values() for enemy in parts['enemies']}
+        enemy_layout = [[-1 if index in self.dead_enemies or index in present else position
+                         for index, position in enumerate(blueprint.enemy_layout[0], blueprint.first_enemy)]]
+        enemies = create_tile_group(enemy_layout, 'enemies', level.images, level, level.fight_manager,
+                                    blueprint, blueprint.first_enemy)
+        level.enemy_sprites.add(enemies)
+
+        self.loaded[segment] = {
+            'chests': chests,
+            'enemies': enemies.sprites()
+        }
+
+    def unload(self, segment: int) -> None:
+        """
+        Remove tiles and sprites of a segment from the level, keeping the record of looted chests and killed enemies.
+
+        Args:
+            segment (int): Index of the segment.
+        """
+        level = self.level
+        parts = self.loaded.pop(segment)
+        left, right = self.bounds[segment] * TILE_SIZE, self.bounds[segment + 1] * TILE_SIZE
+
+        level.terrain_tiles.clear_columns(self.bounds[segment], self.bounds[segment + 1] - 1)
+        level.collideable_tiles.clear_columns(self.bounds[segment], self.bounds[segment + 1] - 1)
+        if level.collision_mesh is not None:
+            level.collision_mesh.update_columns(level.collideable_tiles, self.bounds[segment], self.bounds[segment + 1] - 1)
+        level.terrain_chunks.unbake(left, right, (level.collideable_tiles, level.terrain_tiles))
+
+        for sprite in [sprite for sprite in level.terrain_elements_sprite if left <= sprite.rect.x < right]:
+            if sprite.kind == 'chest':
+                initial = parts['chests'].get(sprite, [])
+                if sprite.equipment.collected or \
+                        [id(item) for item in sprite.equipment.content] != [id(item) for item in initial]:
+                    self.looted_chests[sprite.rect.topleft] = (sprite.equipment.collected, sprite.equipment.content)
+                else:
+                    discard_items(sprite.equipment.content)
+                if sprite in Chest.chests:
+                    Chest.chests.remove(sprite)
+            elif sprite.kind == 'corpse':
+                discard_items(sprite.equipment.content)
+            sprite.kill()
+
+        # Enemies are removed by their current position, not by the segment they were spawned in:
+        leaving = []
+        for other in self.loaded.values():
+            staying = []
+            for enemy in other['enemies']:
+                (leaving if self.segment_at(enemy.movement.collision_rect.centerx) == segment else staying).append(enemy)
+            other['enemies'] = staying
+        for enemy in parts['enemies']:
+            current = self.segment_at(enemy.movement.collision_rect.centerx)
+            if current != segment and current in self.loaded:
+                self.loaded[current]['enemies'].append(enemy)
+            else:
+                leaving.append(enemy)
+
+        for enemy in leaving:
+            if not enemy.alive() or enemy.properties.dead['status']:
+                self.dead_enemies.add(enemy.status.id)
+            enemy.kill()
+
+        self.move_window(self.loaded)
+
+    def move_window(self, segments) -> None:
+        """
+        Make tile layers hold the columns from the first to the last of given segments.
+
+        Args:
+            segments: Indexes of loaded segments.
+        """
+        if segments:
+            first, last = self.bounds[min(segments)], self.bounds[max(segments) + 1] - 1
+        else:
+            first, last = 0, -1
+        self.level.terrain_tiles.set_window(first, last)
+        self.level.collideable_tiles.set_window(first, last)
+
+    def loaded_segments(self) -> list:
+        """
+        Returns:
+            list: Indexes of segments which have sprites, in order of the map.
+        """
+        return sorted(self.loaded)
+
+
+def restore_chest(chest: Chest, looted: tuple) -> None:
+    """
+    Replace the content of a new chest with the content left in the chest the player has looted from.
+
+    Args:
+        chest (Chest): The new chest.
+        looted (tuple): Whether the chest was collected and the list of items left in it.
+    """
+    collected, content = looted
+    discard_items(chest.equipment.content)
+    chest.equipment.collected = collected
+    chest.equipment.content = content
+    for item in content:
+        item.owner = [chest, 'chest']
+
+
+def discard_items(items: list) -> None:
+    """
+    Remove items of a removed container from the list of all items.
+
+    Args:
+        items (list): Items of the container.
+    """
+    for item in items:
+        if item in Item.items:
+            Item.items.remove(item)
@@ -1,51 +1,65 @@
 import random
+from array import array
 from pygame.sprite import Group
-from tools.support import import_csv_file
+from tools.segments import load_segment
 from tools.game_data import level_render
-from tools.settings import LEVEL_SPAWN, SCREEN_WIDTH, LEVEL_SPAWN_SPACE, TILE_SIZE, LEVEL_SPAWN_HEIGHT
+from tools.settings import LEVEL_SPAWN, SCREEN_WIDTH, LEVEL_SPAWN_SPACE, TILE_SIZE, LEVEL_SPAWN_HEIGHT, \
+    LEVEL_RANDOM_SEGMENTS
 from entities.enemies import Sceleton, Ninja, Wizard, DarkKnight
-from terrain.tiles import StaticTile, Bonfire
+from terrain.tiles import Bonfire
 from terrain.chest import Chest
 from terrain.portal import Portal
 
+SEGMENT_RENDERS = ['1', '2', '3', '4']  # Names of random segments in level_render
 
-def generate_map() -> tuple[list, list]:
+
+def generate_map(rng=random) -> tuple[list, list]:
     """
     This function generate map and map elements.
 
-    :return: tuple that contains map and elements like chest or bonfire.
+    :param rng: random number generator
+    :return: tuple that contains map and elements like chest or bonfire, as lists of rows of tile ids.
+    """
+    loaded_segments, loaded_elements = generate_segments(rng)
+    return join_segments(loaded_segments), join_segments(loaded_elements)
+
+
+def generate_segments(rng=random) -> tuple[list, list]:
+    """
+    This function draws segments of the map: start, LEVEL_RANDOM_SEGMENTS random segments and end.
+
+    :param rng: random number generator
+    :return: tuple that contains lists of terrain segments and segments of elements, in order of the map
     """
     level_map = ['start']
-    renders = ['1', '2', '3', '4']
-    for x in range(0, 4):
-        level_map.append(random.choice(renders)[0])
+    for x in range(0, LEVEL_RANDOM_SEGMENTS):
+        level_map.append(rng.choice(SEGMENT_RENDERS)[0])
     level_map.append('end')
-    loaded_segments = {}
-    loaded_elements = {}
-    index = 0
-    for segment in level_map:
-        loaded_segments[f'{index}_{segment}'] = import_csv_file(level_render[segment])
-        loaded_elements[f'{index}_{segment}'] = import_csv_file(level_render[f'{segment}_elements'])
-        index += 1
-    final_map = loaded_segments['0_start']
-    final_map_elements = loaded_elements['0_start']
-    for key, segment in loaded_segments.items():
-        if key == '0_start':
-            continue
-        final_map = [row_final + row_segment for row_final, row_segment in zip(final_map, segment)]
-    for key, segment in loaded_elements.items():
-        if key == '0_start':
-            continue
-        final_map_elements = [row_final + row_segment for row_final, row_segment in zip(final_map_elements, segment)]
-    return final_map, final_map_elements
-
-
-def generate_enemies(map_length):
+    loaded_segments = [load_segment(level_render[segment]) for segment in level_map]
+    loaded_elements = [load_segment(level_render[f'{segment}_elements']) for segment in level_map]
+    return loaded_segments, loaded_elements
+
+
+def join_segments(segments: list) -> list:
+    """
+    This function joins segments side by side.
+
+    :param segments: segments, lists of rows (arrays of tile ids)
+    :return: list of rows of the joined map
+    """
+    rows = [array('h') for _ in range(min(len(segment) for segment in segments))]
+    for segment in segments:
+        for row, segment_row in zip(rows, segment):
+            row.extend(segment_row)
+    return rows
+
+
+def generate_enemies(map_length, rng=random):
     spawn_point = LEVEL_SPAWN
     spawn_list = [[spawn_point]]
 
     while spawn_point < map_length - LEVEL_SPAWN / 2:
-        amount = random.randint(1, 3)
+        amount = rng.randint(1, 3)
         for multiplier in range(amount):
             spawn_list[0].append(spawn_point + multiplier * LEVEL_SPAWN_SPACE)
         spawn_point += LEVEL_SPAWN
@@ -54,60 +68,77 @@ def generate_enemies(map_length):
     return spawn_list
 
 
-def generate_enemy_kind(boss: bool = False):
+def generate_segment_enemies(left, right, end, rng=random):
+    """
+    This function draws enemy positions of one segment, on the same spawn points as `generate_enemies`.
+
+    :param left: x coordinate of the left side of the segment
+    :param right: x coordinate of the right side of the segment
+    :param end: True if it's the last segment of the level, which ends with the boss
+    :param rng: random number generator
+    :return: list with the list of enemy positions
+    """
+    spawn_list = [[LEVEL_SPAWN]] if left <= LEVEL_SPAWN < right else [[]]
+    spawn_point = max(-(-left // LEVEL_SPAWN), 1) * LEVEL_SPAWN
+    while spawn_point < right and not (end and spawn_point >= right - LEVEL_SPAWN / 2):
+        amount = rng.randint(1, 3)
+        for multiplier in range(amount):
+            spawn_list[0].append(spawn_point + multiplier * LEVEL_SPAWN_SPACE)
+        spawn_point += LEVEL_SPAWN
+    if end:
+        spawn_list[0].append(right - SCREEN_WIDTH / 2)
+    return spawn_list
+
+
+def generate_enemy_kind(boss: bool = False, rng=random):
     if not boss:
-        return random.choice(['0', '1', '2'])[0]
+        return rng.choice(['0', '1', '2'])[0]
     else:
         return '3'
 
 
-def create_tile_group(layout, kind, images, level_map, fighting):
+def create_tile_group(layout, kind, images, level_map, fighting, blueprint=None, first_col=0):
     """
-    Create a group of tiles from a layout.
+    Create a group of terrain elements or enemies from a layout. Static terrain tiles are kept in tile layers.
 
     Args:
         layout (list): The layout specifying the arrangement of tiles.
-        kind (str): The kind of tiles to create.
+        kind (str): The kind of tiles to create, 'terrain_elements' or 'enemies'.
+        blueprint (LevelBlueprint): Pre-rolled enemy kinds and chest loot, drawn here if not given.
+        first_col (int): Column of the map (or index of the enemy) where the layout starts,
+            when the layout is a part of the map.
 
     Returns:
         pygame.sprite.Group: A group of sprite objects representing the tiles.
     """
     sprite_group = Group()
-    enemy_id: int = 0
     tile_id: int = 0
     sprite: object = None
 
     for row_index, row in enumerate(layout):
         for col_index, val in enumerate(row):
-            if val != str(-1):
-                x = col_index * TILE_SIZE
+            if val != -1:
+                x = (first_col + col_index) * TILE_SIZE
                 y = row_index * TILE_SIZE
 
-                if kind == 'terrain':
-                    if int(val) == 11:
-                        tile_surface = images.terrain_tiles[int(val)]
-                        sprite = StaticTile(tile_id, TILE_SIZE, x, y, tile_surface)
-                        tile_id += 1
-
-                elif kind == 'collideable':
-                    if int(val) != 11:
-                        tile_surface = images.terrain_tiles[int(val)]
-                        sprite = StaticTile(tile_id, TILE_SIZE, x, y, tile_surface)
-                        tile_id += 1
-                elif kind == 'terrain_elements':
-                    if val == '0':
-                        sprite = Chest(tile_id, TILE_SIZE, x, y, images.terrain_elements['chest'], level_map)
+                if kind == 'terrain_elements':
+                    if val == 0:
+                        loot = blueprint.chest_loot.get((x, y)) if blueprint is not None else None
+                        sprite = Chest(tile_id, TILE_SIZE, x, y, images.terrain_elements['chest'], level_map, loot)
                         tile_id += 1
-                    elif val == '1':
+                    elif val == 1:
                         sprite = Bonfire(tile_id, TILE_SIZE, x, y, images.terrain_elements['bonfire'])
                         tile_id += 1
-                    elif val == '2':
+                    elif val == 2:
                         sprite = Portal(tile_id, TILE_SIZE, (x, y), images.terrain_elements['portal'])
                         tile_id += 1
 
                 elif kind == 'enemies':
                     pos = (int(val), LEVEL_SPAWN_HEIGHT)
-                    if col_index < len(layout[0]) - 1:
+                    enemy_id = first_col + col_index
+                    if blueprint is not None:
+                        value = blueprint.enemy_kinds[enemy_id]
+                    elif col_index < len(layout[0]) - 1:
                         value = generate_enemy_kind()
                     else:
                         value = generate_enemy_kind(boss=True)
@@ -119,7 +150,6 @@ def create_tile_group(layout, kind, images, level_map, fighting):
                             (images.enemies[0]['sceleton'], images.enemies[1]['sceleton']),
                             fighting.sword_attack
                         )
-                        enemy_id += 1
                     elif value == '1':
                         sprite = Ninja(
                             level_map.current_level,
@@ -128,7 +158,6 @@ def create_tile_group(layout, kind, images, level_map, fighting):
                             (images.enemies[0]['ninja'], images.enemies[1]['ninja']),
                             fighting.arch_attack
                         )
-                        enemy_id += 1
                     elif value == '2':
                         sprite = Wizard(
                             level_map.current_level,
@@ -138,7 +167,6 @@ def create_tile_group(layout, kind, images, level_map, fighting):
                             fighting.arch_attack,
                             fighting.thunder_attack
                         )
-                        enemy_id += 1
                     elif value == '3':
                         sprite = DarkKnight(
                             level_map.current_level,
@@ -147,7 +175,6 @@ def create_tile_group(layout, kind, images, level_map, fighting):
                             (images.enemies[0]['dark_knight'], images.enemies[1]['dark_knight']),
                             fighting.sword_attack
                         )
-                        enemy_id += 1
                 if sprite is not None:
                     sprite_group.add(sprite)
     return sprite_group
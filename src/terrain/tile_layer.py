@@ -0,0 +1,192 @@
+"""
+This module defines the TileLayer class, which stores static tiles of the map
+as tile ids in rows of a 2D array instead of one sprite per tile.
+
+Tile images are shared from `ImagesManager.terrain_tiles`, and rectangles of
+tiles are created only when tiles are asked for, e.g. by collision checks or
+by baking terrain chunks. The layer is also a uniform spatial index: tiles can
+be taken from a range of columns or from a rectangle without scanning the
+whole map.
+
+A layer can hold only a window of the map's columns, starting at `first_col`
+(see `set_window`), so a streamed level keeps cells only for the segments
+around the player. Columns are always given in map coordinates; columns
+outside the window are empty.
+"""
+from array import array
+from collections import namedtuple
+import pygame
+from tools.settings import TILE_SIZE
+
+BACKGROUND_TILE = 11  # Tile drawn behind characters, without collisions
+EMPTY = -1
+
+LayerTile = namedtuple('LayerTile', ['rect', 'image'])
+
+
+class TileLayer:
+    """
+    Static tiles of one layer of the map, stored as tile ids by column and row.
+    """
+    def __init__(self, columns: int, rows: int, images: list, layout: list = None, kind: str = 'collideable') -> None:
+        """
+        Initialize the TileLayer object.
+
+        Args:
+            columns (int): The width of the map in tiles.
+            rows (int): The height of the map in tiles.
+            images (list): Images of tiles, indexed by tile ids.
+            layout (list): Optional layout (rows of tile ids) to fill the layer with.
+            kind (str): The kind of the layer: 'terrain' takes background tiles, 'collideable' all the others.
+        """
+        self.first_col = 0
+        self.columns = columns
+        self.rows = rows
+        self.images = images
+        self.cells = [array('h', [EMPTY]) * columns for _ in range(rows)]
+        self.column_counts = array('i', [0]) * columns
+        if layout is not None:
+            self.fill(layout, kind)
+
+    def __len__(self) -> int:
+        return sum(self.column_counts)
+
+    def __iter__(self):
+        return iter(self.tiles_in_columns(self.first_col, self.end_col() - 1))
+
+    def end_col(self) -> int:
+        """
+        Returns:
+            int: The map column after the last column of the window.
+        """
+        return self.first_col + self.columns
+
+    def set_window(self, first: int, last: int) -> None:
+        """
+        Keep cells only for a range of map columns. Tiles of columns which are left out are dropped,
+        so they should be cleared (and their collision runs updated) first.
+
+        Args:
+            first (int): The first column of the window.
+            last (int): The last column of the window (inclusive).
+        """
+        columns = max(last - first + 1, 0)
+        start, end = max(first, self.first_col), min(first + columns, self.end_col())
+        cells = []
+        for old_cells in self.cells:
+            new_cells = array('h', [EMPTY]) * columns
+            if start < end:
+                new_cells[start - first:end - first] = old_cells[start - self.first_col:end - self.first_col]
+            cells.append(new_cells)
+        column_counts = array('i', [0]) * columns
+        if start < end:
+            column_counts[start - first:end - first] = self.column_counts[start - self.first_col:end - self.first_col]
+        self.cells, self.column_counts = cells, column_counts
+        self.first_col, self.columns = first, columns
+
+    def fill(self, layout: list, kind: str, first_col: int = 0) -> None:
+        """
+        Put tiles of the given kind from a layout into the layer.
+
+        Args:
+            layout (list): Rows of tile ids.
+            kind (str): The kind of the layer, which selects tiles from the layout.
+            first_col (int): Column of the map where the layout starts.
+        """
+        background = kind == 'terrain'
+        start = first_col - self.first_col
+        skipped = max(-start, 0)
+        for row_index, row in enumerate(layout[:self.rows]):
+            cells = self.cells[row_index]
+            for col_index, tile_id in enumerate(row[skipped:self.columns - start], start + skipped):
+                if tile_id != EMPTY and (tile_id == BACKGROUND_TILE) == background and cells[col_index] == EMPTY:
+                    cells[col_index] = tile_id
+                    self.column_counts[col_index] += 1
+
+    def clear_columns(self, first: int, last: int) -> None:
+        """
+        Remove tiles from a range of columns.
+
+        Args:
+            first (int): The first column of the range.
+            last (int): The last column of the range (inclusive).
+        """
+        first, last = max(first, self.first_col) - self.first_col, min(last, self.end_col() - 1) - self.first_col
+        if first > last:
+            return
+        empty = array('h', [EMPTY]) * (last - first + 1)
+        for cells in self.cells:
+            cells[first:last + 1] = empty
+        self.column_counts[first:last + 1] = array('i', [0]) * (last - first + 1)
+
+    def tile(self, col: int, row: int) -> LayerTile | None:
+        """
+        Args:
+            col (int): The column of the tile.
+            row (int): The row of the tile.
+
+        Returns:
+            LayerTile | None: The rectangle and the image of the tile, or None if the cell is empty.
+        """
+        if not self.first_col <= col < self.end_col():
+            return None
+        tile_id = self.cells[row][col - self.first_col]
+        if tile_id == EMPTY:
+            return None
+        return LayerTile(pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE), self.images[tile_id])
+
+    def tiles_in_columns(self, first: int, last: int) -> list:
+        """
+        Get tiles from a range of columns.
+
+        Args:
+            first (int): The first column of the range.
+            last (int): The last column of the range (inclusive).
+
+        Returns:
+            list: Tiles placed in the given columns, row by row.
+        """
+        return self.tiles_in_cells(max(first, self.first_col), min(last, self.end_col() - 1), 0, self.rows - 1)
+
+    def count_between(self, left: float, right: float) -> int:
+        """
+        Count tiles which horizontal center lies strictly between two x coordinates.
+
+        Args:
+            left (float): The left x coordinate.
+            right (float): The right x coordinate.
+
+        Returns:
+            int: Number of tiles between the given coordinates.
+        """
+        first = max(int((left - TILE_SIZE / 2) // TILE_SIZE) + 1, self.first_col) - self.first_col
+        last = min(int(-((TILE_SIZE / 2 - right) // TILE_SIZE)) - 1, self.end_col() - 1) - self.first_col
+        return sum(self.column_counts[first:last + 1]) if first <= last else 0
+
+    def tiles_in_rect(self, rect: pygame.Rect) -> list:
+        """
+        Get tiles overlapping the given rectangle.
+
+        Args:
+            rect (pygame.Rect): The rectangle to check.
+
+        Returns:
+            list: Tiles overlapping the rectangle, row by row.
+        """
+        return self.tiles_in_cells(
+            max(rect.left // TILE_SIZE, self.first_col),
+            min((rect.right - 1) // TILE_SIZE, self.end_col() - 1),
+            max(rect.top // TILE_SIZE, 0),
+            min((rect.bottom - 1) // TILE_SIZE, self.rows - 1)
+        )
+
+    def tiles_in_cells(self, first_col: int, last_col: int, first_row: int, last_row: int) -> list:
+        tiles = []
+        for row in range(first_row, last_row + 1):
+            cells = self.cells[row]
+            for col in range(first_col, last_col + 1):
+                tile_id = cells[col - self.first_col]
+                if tile_id != EMPTY:
+                    tiles.append(LayerTile(pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE),
+                                           self.images[tile_id]))
+        return tiles
@@ -0,0 +1,98 @@
+import io
+import os
+import pytest
+import pygame
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from tools import asset_pack
+from tools.asset_pack import AssetPack, build_pack, content_pack, open_content, content_modified
+
+
+class TestAssetPack():
+    @pytest.fixture()
+    def pack(self, tmp_path):
+        content = tmp_path / 'content'
+        (content / 'levels').mkdir(parents=True)
+        (content / 'graphics').mkdir()
+        (content / 'levels' / 'map.csv').write_text('1,-1\n-1,2\n', encoding='utf-8')
+        image = pygame.Surface((3, 2), flags=pygame.SRCALPHA)
+        image.fill((10, 20, 30, 255))
+        pygame.image.save(image, str(content / 'graphics' / 'b.png'))
+        pygame.image.save(image, str(content / 'graphics' / 'a.png'))
+
+        build_pack(str(content), str(tmp_path / 'content.pack'))
+        pack = AssetPack(str(tmp_path / 'content.pack'))
+        yield pack, str(content)
+        pack.close()
+
+    def test_asset_pack__files_sorted_by_name(self, pack):
+        pack, content = pack
+
+        assert pack.files(content + '/graphics') == [content + '/graphics/a.png', content + '/graphics/b.png']
+        assert pack.files(content + '/sounds') is None
+
+    def test_asset_pack__reads_text(self, pack):
+        pack, content = pack
+
+        with io.TextIOWrapper(io.BufferedReader(pack.open(content + '/levels/map.csv')), encoding='utf-8') as file:
+            assert file.read() == '1,-1\n-1,2\n'
+
+    def test_asset_pack__loads_image(self, pack):
+        pack, content = pack
+
+        image = pygame.image.load(pack.open(content + '/graphics/a.png'), 'a.png')
+
+        assert image.get_size() == (3, 2)
+        assert image.get_at((1, 1)) == (10, 20, 30, 255)
+
+    def test_asset_pack__rejects_other_files(self, tmp_path):
+        (tmp_path / 'other.pack').write_bytes(b'not a pack at all')
+
+        with pytest.raises(ValueError):
+            AssetPack(str(tmp_path / 'other.pack'))
+
+    @pytest.fixture()
+    def packed_content(self, pack, tmp_path):
+        pack, content = pack
+        with patch.object(asset_pack, '_pack', pack), patch.object(asset_pack, '_pack_opened', True):
+            yield content
+
+    def test_open_content__modified_file_from_folder(self, packed_content):
+        path = packed_content + '/levels/map.csv'
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('3,3\n')
+        packed_time = asset_pack.content_pack().modified(path)
+        os.utime(path, ns=(packed_time + 10 ** 9, packed_time + 10 ** 9))
+
+        with open_content(path) as file:
+            assert file.read() == b'3,3\n'
+        assert content_modified(path) == packed_time + 10 ** 9
+
+    def test_open_content__unchanged_or_missing_file_from_pack(self, packed_content):
+        path = packed_content + '/levels/map.csv'
+        with open_content(path) as file:
+            assert isinstance(file, asset_pack.PackedFile)
+
+        os.remove(path)
+
+        with open_content(path) as file:
+            assert file.read() == b'1,-1\n-1,2\n'
+        assert content_modified(path) == asset_pack.content_pack().modified(path)
+
+    def test_content_pack__opened_once_by_concurrent_callers(self, pack, tmp_path):
+        pack, _ = pack
+        opened = []
+
+        def open_pack(path):
+            opened.append(path)
+            return pack
+
+        with patch.object(asset_pack, '_pack', None), patch.object(asset_pack, '_pack_opened', False), \
+                patch.object(asset_pack, 'ASSET_PACK', True), \
+                patch.object(asset_pack, 'ASSET_PACK_PATH', str(tmp_path / 'content.pack')), \
+                patch.object(asset_pack, 'AssetPack', open_pack):
+            with ThreadPoolExecutor(8) as executor:
+                packs = list(executor.map(lambda _: content_pack(), range(32)))
+
+        assert len(opened) == 1
+        assert all(found is pack for found in packs)
@@ -0,0 +1,53 @@
+import pytest
+import pygame
+from tools.assets import AssetRegistry, asset_memory
+
+
+def load_surface(width):
+    return pygame.Surface((width, 1), flags=pygame.SRCALPHA)
+
+
+class TestAssetRegistry():
+    @pytest.fixture()
+    def registry(self):
+        return AssetRegistry(budget=400, loaders={'surface': load_surface})
+
+    def test_acquire__returns_shared_asset(self, registry):
+        first = registry.acquire('surface', 10)
+        second = registry.acquire('surface', 10)
+
+        assert first is second
+        assert registry.references[('surface', 10)] == 2
+
+    def test_release__keeps_asset_within_budget(self, registry):
+        asset = registry.acquire('surface', 10)
+        registry.release('surface', 10)
+
+        assert registry.get('surface', 10) is asset
+        assert registry.references[('surface', 10)] == 0
+
+    def test_evict__drops_least_recently_used_unreferenced(self, registry):
+        registry.get('surface', 40)
+        registry.get('surface', 30)
+        registry.get('surface', 40)
+        registry.get('surface', 50)
+
+        assert list(registry.entries) == [('surface', 40), ('surface', 50)]
+        assert registry.memory() == 360
+
+    def test_evict__keeps_referenced_assets(self, registry):
+        registry.acquire('surface', 60)
+        registry.acquire('surface', 60)
+        registry.get('surface', 50)
+
+        assert list(registry.entries) == [('surface', 60)]
+        registry.release('surface', 60)
+        assert ('surface', 60) in registry.entries
+        registry.release('surface', 60)
+        assert ('surface', 60) in registry.entries
+
+    def test_asset_memory__counts_subsurfaces_once(self):
+        page = pygame.Surface((10, 10), flags=pygame.SRCALPHA)
+        frames = {'idle': [page.subsurface((0, 0, 5, 5)), page.subsurface((5, 5, 5, 5))]}
+
+        assert asset_memory(frames) == 400
@@ -0,0 +1,48 @@
+import pytest
+import pygame
+from tools.atlas import pack_animations, shelf_layout
+
+
+class TestAtlas():
+    @pytest.fixture(autouse=True)
+    def display(self):
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+
+    def test_shelf_layout__rects_do_not_overlap(self):
+        sizes = [(30, 40), (50, 20), (64, 64), (10, 10), (64, 30), (20, 64)]
+        placements, page_sizes = shelf_layout(sizes, page_size=128)
+
+        for index, (page, rect) in enumerate(placements):
+            assert rect.size == sizes[index]
+            assert pygame.Rect((0, 0), page_sizes[page]).contains(rect)
+            for other_page, other_rect in placements[index + 1:]:
+                assert page != other_page or not rect.colliderect(other_rect)
+
+    def test_shelf_layout__opens_new_page_when_full(self):
+        placements, page_sizes = shelf_layout([(60, 60)] * 5, page_size=128)
+
+        assert len(page_sizes) == 2
+        assert [page for page, _ in placements] == [0, 0, 0, 0, 1]
+
+    def test_shelf_layout__big_rect_gets_own_page(self):
+        placements, page_sizes = shelf_layout([(10, 10), (300, 20)], page_size=128)
+
+        assert page_sizes[placements[1][0]] == (300, 20)
+        assert placements[0][0] != placements[1][0]
+
+    def test_pack_animations__keeps_frames(self):
+        frames = []
+        for color in ((255, 0, 0, 255), (0, 255, 0, 128), (0, 0, 255, 0)):
+            frame = pygame.Surface((12, 20), flags=pygame.SRCALPHA)
+            frame.fill(color)
+            frames.append(frame)
+        animations = {'idle': frames[:2], 'run': []}
+        flipped = {'idle': frames[2:], 'run': []}
+
+        packed, packed_flipped = pack_animations((animations, flipped))
+
+        assert packed['run'] == [] and len(packed['idle']) == 2
+        assert packed['idle'][0].get_parent() is packed_flipped['idle'][0].get_parent()
+        for frame, packed_frame in zip(frames, packed['idle'] + packed_flipped['idle']):
+            assert pygame.image.tobytes(frame, 'RGBA') == pygame.image.tobytes(packed_frame, 'RGBA')
@@ -0,0 +1,46 @@
+import pytest
+import pygame
+from unittest.mock import patch
+from combat.fighting import FightManager, Hit, Thunder
+
+
+class TestAttackPools():
+    @pytest.fixture()
+    def manager(self):
+        with patch('combat.fighting.sounds'):
+            return FightManager()
+
+    def test_spawn__reuses_killed_attack(self, manager):
+        image = pygame.Surface((10, 10))
+        hit = manager.spawn(Hit, ('sword', 'player'), (0, 0), 10, 'player', 1, image)
+        manager.sword_hits.add(hit)
+        hit.character_collided.append(5)
+        hit.kill()
+
+        reused = manager.spawn(Hit, ('sword', 'player'), (50, 60), 20, 'player', 1, image)
+
+        assert reused is hit
+        assert reused.rect.topleft == (50, 60)
+        assert reused.damage == 20
+        assert reused.character_collided == []
+        assert manager.pools[('sword', 'player')] == []
+
+    def test_thunder_attack__shares_images(self, manager):
+        manager.thunder_attack('player', 1, pygame.Rect(100, 100, 20, 20), 30, True)
+        manager.thunder_attack('player', 1, pygame.Rect(400, 100, 20, 20), 30, True)
+        first, second = manager.thunder_hits.sprites()
+
+        for _ in range(40):
+            first.update()
+
+        assert first.images is second.images
+        assert first.image is first.images[1] and second.image is second.images[0]
+
+    def test_clear_groups__returns_attacks_to_pools(self, manager):
+        manager.thunder_attack('player', 1, pygame.Rect(100, 100, 20, 20), 30, True)
+        thunder = manager.thunder_hits.sprites()[0]
+
+        manager.clear_groups()
+
+        assert manager.pools[('thunder',)] == [thunder]
+        assert isinstance(thunder, Thunder) and not thunder.alive()
@@ -0,0 +1,109 @@
+import random
+import pytest
+import pygame.rect
+import pygame.math
+from terrain.collision_mesh import CollisionMesh
+from terrain.collisions import check_collisions, check_grid_collisions
+from terrain.tile_layer import TileLayer, EMPTY
+from tools.settings import TILE_SIZE
+
+
+class MockCharacter():
+    def __init__(self, rect, direction, speed=3, gravity=0.8):
+        self.collision_rect = pygame.Rect(rect)
+        self.direction = pygame.math.Vector2(direction)
+        self.speed = speed
+        self.gravity = gravity
+        self.on_left = False
+        self.on_right = False
+        self.on_ground = False
+
+    def apply_gravity(self):
+        self.direction.y += self.gravity
+        self.collision_rect.y += self.direction.y
+
+    def state(self):
+        return (tuple(self.collision_rect), tuple(self.direction), self.on_left, self.on_right, self.on_ground)
+
+
+def check_tile_collisions(character, tiles):
+    # Collisions against single tiles, as they were checked before tiles were merged
+    character.collision_rect.x += character.direction.x * character.speed
+    for tile in tiles:
+        if tile.colliderect(character.collision_rect):
+            if tile.centerx < character.collision_rect.centerx:
+                character.collision_rect.left = tile.right
+                character.on_right = False
+                character.on_left = True
+            elif tile.centerx > character.collision_rect.centerx:
+                character.collision_rect.right = tile.left
+                character.on_right = True
+                character.on_left = False
+    character.apply_gravity()
+    for tile in tiles:
+        if tile.colliderect(character.collision_rect):
+            if character.direction.y > 0 and tile.centery > character.collision_rect.centery:
+                character.collision_rect.bottom = tile.top
+                character.direction.y = 0
+                character.on_ground = True
+            elif character.direction.y < 0 and tile.centery < character.collision_rect.centery:
+                character.collision_rect.top = tile.bottom
+                character.direction.y = 0
+    if character.on_ground and character.direction.y < 0 or character.direction.y > 1:
+        character.on_ground = False
+
+
+class TestCollisionMesh():
+    @pytest.fixture()
+    def layer(self):
+        layout = [[EMPTY] * 12 for _ in range(6)]
+        layout[5] = [1] * 5 + [EMPTY] + [2] * 6
+        layout[3][2:5] = [3, 3, 3]
+        return TileLayer(12, 6, [None] * 12, layout)
+
+    def test_collision_mesh__merges_rows(self, layer):
+        mesh = CollisionMesh(layer)
+
+        assert [tuple(rect) for rect in mesh] == [
+            (2 * TILE_SIZE, 3 * TILE_SIZE, 3 * TILE_SIZE, TILE_SIZE),
+            (0, 5 * TILE_SIZE, 5 * TILE_SIZE, TILE_SIZE),
+            (6 * TILE_SIZE, 5 * TILE_SIZE, 6 * TILE_SIZE, TILE_SIZE)
+        ]
+
+    def test_update_columns__joins_and_splits_runs(self, layer):
+        mesh = CollisionMesh(layer)
+
+        layer.fill([[EMPTY]] * 5 + [[4]], 'collideable', 5)
+        mesh.update_columns(layer, 5, 5)
+        assert len(mesh) == 2
+
+        layer.clear_columns(3, 3)
+        mesh.update_columns(layer, 3, 3)
+        assert [rect.width // TILE_SIZE for rect in mesh] == [1, 1, 3, 8]
+
+    def test_rects_in_rect__row_by_row(self, layer):
+        mesh = CollisionMesh(layer)
+        rects = mesh.rects_in_rect(pygame.Rect(4 * TILE_SIZE, 3 * TILE_SIZE, 3 * TILE_SIZE, 3 * TILE_SIZE))
+
+        assert [rect.topleft for rect in rects] == [(2 * TILE_SIZE, 3 * TILE_SIZE), (0, 5 * TILE_SIZE),
+                                                    (6 * TILE_SIZE, 5 * TILE_SIZE)]
+
+    def test_check_collisions__same_as_single_tiles(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            layout = [[rng.choice([EMPTY, 1, 1]) for _ in range(10)] for _ in range(8)]
+            layer = TileLayer(10, 8, [None] * 2, layout)
+            mesh = CollisionMesh(layer)
+            area = pygame.Rect(0, 0, 10 * TILE_SIZE, 8 * TILE_SIZE)
+            for _ in range(20):
+                rect = (rng.randrange(-20, 10 * TILE_SIZE), rng.randrange(-20, 8 * TILE_SIZE),
+                        rng.randrange(10, 3 * TILE_SIZE), rng.randrange(10, 3 * TILE_SIZE))
+                direction = (rng.choice([-1, 0, 1]), rng.uniform(-16, 16))
+                merged, grid, single = [MockCharacter(rect, direction) for _ in range(3)]
+
+                check_collisions(merged, mesh.rects_in_rect(area))
+                check_grid_collisions(grid, layer)
+                check_tile_collisions(single, [tile.rect for tile in layer.tiles_in_rect(area)])
+
+                assert merged.state() == single.state()
+                assert grid.state() == single.state()
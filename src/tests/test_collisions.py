@@ -2,7 +2,11 @@ import pytest
 import pygame.rect
 import pygame.math
 import pygame.sprite
-from terrain.collisions import horizontal_movement_collision, vertical_movement_collision
+from terrain.collisions import horizontal_movement_collision, vertical_movement_collision, check_grid_collisions, \
+    check_collisions, sweep_grid, time_of_impact
+from terrain.tile_layer import TileLayer, EMPTY
+from terrain.collision_mesh import CollisionMesh
+from tools.settings import TILE_SIZE
 
 class MockCharacter():
     def __init__(self):
@@ -37,7 +41,7 @@ class TestCollisions():
             sprite.rect.center = (16, 16)
         character.collision_rect.center = (50, 16)
 
-        horizontal_movement_collision(character, sprites)
+        horizontal_movement_collision(character, [sprite.rect for sprite in sprites])
 
         assert character.collision_rect.left == 32
         assert not character.on_right
@@ -50,7 +54,7 @@ class TestCollisions():
             sprite.rect.center = (64, 16)
         character.collision_rect.center = (50, 16)
 
-        horizontal_movement_collision(character, sprites)
+        horizontal_movement_collision(character, [sprite.rect for sprite in sprites])
 
         assert character.collision_rect.right == 48
         assert character.on_right
@@ -66,7 +70,7 @@ class TestCollisions():
         character.collision_rect.centerx = 64
         character.collision_rect.bottom = 101
 
-        vertical_movement_collision(character, sprites)
+        vertical_movement_collision(character, [sprite.rect for sprite in sprites])
 
         assert character.collision_rect.bottom == 100
         assert character.on_ground
@@ -82,8 +86,64 @@ class TestCollisions():
         character.collision_rect.centerx = 64
         character.collision_rect.top = 100
 
-        vertical_movement_collision(character, sprites)
+        vertical_movement_collision(character, [sprite.rect for sprite in sprites])
 
         assert character.collision_rect.top == 101
         assert not character.on_ground
         assert character.direction.y == 0
+
+    def test_grid_collisions__landed_on_cell(self):
+        layer = TileLayer(4, 4, [None], [[EMPTY] * 4, [EMPTY] * 4, [EMPTY, 0, 0, EMPTY], [EMPTY] * 4])
+        character = MockCharacter()
+        character.collision_rect.midbottom = (TILE_SIZE * 2, TILE_SIZE * 2)
+        character.direction.y = 1
+        character.apply_gravity = lambda: character.collision_rect.move_ip(0, 5)
+
+        check_grid_collisions(character, layer)
+
+        assert character.collision_rect.bottom == TILE_SIZE * 2
+        assert character.on_ground
+
+    def test_grid_collisions__outside_of_layer(self):
+        layer = TileLayer(4, 4, [None], [[0] * 4] * 4)
+        character = MockCharacter()
+        character.collision_rect.topleft = (-500, -500)
+        character.direction.x = 1
+
+        check_grid_collisions(character, layer)
+
+        assert character.collision_rect.topleft == (-499, -500)
+
+    def test_time_of_impact__moving_into_obstacle(self):
+        rect = pygame.Rect(0, 0, 10, 10)
+
+        assert time_of_impact(rect, 40, 0, pygame.Rect(30, 5, 10, 10)) == 0.5
+        assert time_of_impact(rect, 40, 0, pygame.Rect(30, 10, 10, 10)) is None
+        assert time_of_impact(rect, 10, 0, pygame.Rect(30, 5, 10, 10)) is None
+
+    def test_sweep_grid__stops_fast_rect_at_first_cell(self):
+        layer = TileLayer(8, 1, [None], [[EMPTY, EMPTY, EMPTY, 0, EMPTY, 0, EMPTY, EMPTY]])
+        rect = pygame.Rect(10, 20, 5, 5)
+
+        time, cell = sweep_grid(rect, 6 * TILE_SIZE, 0, layer)
+
+        assert cell.x == 3 * TILE_SIZE
+        assert rect.right + 6 * TILE_SIZE * time == 3 * TILE_SIZE
+
+    def test_collisions__fast_fall_lands_on_tile(self):
+        layer = TileLayer(4, 8, [None], [[EMPTY] * 4] * 5 + [[0] * 4] + [[EMPTY] * 4] * 2)
+        mesh = CollisionMesh(layer)
+        for mode in ('mesh', 'grid'):
+            character = MockCharacter()
+            character.collision_rect.bottom = 4 * TILE_SIZE
+            character.direction.y = 3 * TILE_SIZE
+            character.apply_gravity = lambda: character.collision_rect.move_ip(0, character.direction.y)
+
+            if mode == 'mesh':
+                check_collisions(character, mesh.rects_in_rect(character.collision_rect.inflate(0, 8 * TILE_SIZE)))
+            else:
+                check_grid_collisions(character, layer)
+
+            assert character.collision_rect.bottom == 5 * TILE_SIZE
+            assert character.on_ground
+            assert character.direction.y == 0
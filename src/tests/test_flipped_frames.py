@@ -0,0 +1,32 @@
+import pygame
+from unittest.mock import patch
+from tools.flipped_frames import FlippedFrames
+
+
+class TestFlippedFrames():
+    @staticmethod
+    def make_frame():
+        frame = pygame.Surface((2, 1))
+        frame.set_at((0, 0), (255, 0, 0))
+        frame.set_at((1, 0), (0, 0, 255))
+        return frame
+
+    def test_flipped_frames__mirrors_frames(self):
+        flipped = FlippedFrames({'idle': [self.make_frame()]})
+
+        frame = flipped['idle'][0]
+
+        assert frame.get_at((0, 0)) == (0, 0, 255, 255)
+        assert frame.get_at((1, 0)) == (255, 0, 0, 255)
+
+    def test_flipped_frames__flips_on_first_use_only(self):
+        flipped = FlippedFrames({'idle': [self.make_frame()], 'stun': [self.make_frame()]})
+
+        with patch('pygame.transform.flip', wraps=pygame.transform.flip) as mock_flip:
+            first = flipped['idle']
+            second = flipped['idle']
+
+        assert first is second
+        assert mock_flip.call_count == 1
+        assert list(flipped) == ['idle', 'stun']
+        assert 'stun' not in flipped.flipped
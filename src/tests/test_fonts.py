@@ -0,0 +1,33 @@
+import pytest
+import pygame
+from unittest.mock import patch
+from tools import fonts
+from tools.fonts import LazyFont, font_path
+
+
+class TestFonts():
+    @pytest.fixture(autouse=True)
+    def cache_path(self, tmp_path):
+        with patch.object(fonts, 'FONT_CACHE_PATH', str(tmp_path / 'fonts.json')), \
+                patch.object(fonts, '_font_paths', None):
+            yield tmp_path / 'fonts.json'
+
+    def test_lazy_font__loaded_on_first_use(self):
+        with patch('pygame.font.match_font', return_value=None) as match_font:
+            font = LazyFont('arial', 15)
+            match_font.assert_not_called()
+
+            image = font.render('text', True, (255, 255, 255))
+
+        match_font.assert_called_once_with('arial')
+        assert image.get_height() == font.get_height()
+
+    def test_font_path__cached_across_runs(self, cache_path):
+        with patch('pygame.font.match_font', return_value=None) as match_font:
+            font_path('arial')
+        assert cache_path.exists()
+
+        with patch.object(fonts, '_font_paths', None), \
+                patch('pygame.font.match_font', return_value=None) as match_font:
+            assert font_path('arial') is None
+        match_font.assert_not_called()
@@ -0,0 +1,60 @@
+import pytest
+import pygame
+from unittest.mock import MagicMock, patch
+from tools import frame_cache
+from tools.frame_cache import cached_frames, load_frames, save_frames
+
+
+class TestFrameCache():
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path):
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+        with patch.object(frame_cache, 'CACHE_DIR', str(tmp_path / 'cache')):
+            yield tmp_path / 'cache'
+
+    @pytest.fixture()
+    def source(self, tmp_path):
+        path = tmp_path / 'frame.png'
+        path.write_bytes(b'source image')
+        return str(path)
+
+    @staticmethod
+    def make_frame(color, size=(3, 2)):
+        frame = pygame.Surface(size, flags=pygame.SRCALPHA)
+        frame.fill(color)
+        return frame
+
+    def test_save_frames__round_trip(self, cache_dir):
+        frames = [self.make_frame((10, 20, 30, 255)), self.make_frame((1, 2, 3, 0), (5, 4))]
+        save_frames(str(cache_dir / 'key.bin'), frames)
+
+        loaded = load_frames(str(cache_dir / 'key.bin'))
+
+        assert [frame.get_size() for frame in loaded] == [(3, 2), (5, 4)]
+        assert [pygame.image.tobytes(frame, 'RGBA') for frame in loaded] == \
+               [pygame.image.tobytes(frame, 'RGBA') for frame in frames]
+
+    def test_load_frames__truncated_file(self, cache_dir):
+        save_frames(str(cache_dir / 'key.bin'), [self.make_frame((10, 20, 30, 255))])
+        data = (cache_dir / 'key.bin').read_bytes()
+        (cache_dir / 'key.bin').write_bytes(data[:-5])
+
+        assert load_frames(str(cache_dir / 'key.bin')) is None
+
+    def test_cached_frames__builds_only_once(self, source):
+        build = MagicMock(return_value=[self.make_frame((10, 20, 30, 255))])
+
+        cached_frames(source, (1.5, False), build)
+        frames = cached_frames(source, (1.5, False), build)
+
+        build.assert_called_once()
+        assert frames[0].get_at((0, 0)) == (10, 20, 30, 255)
+
+    def test_cached_frames__parameters_are_part_of_key(self, source):
+        build = MagicMock(return_value=[self.make_frame((10, 20, 30, 255))])
+
+        cached_frames(source, (1.5, False), build)
+        cached_frames(source, (1.5, True), build)
+
+        assert build.call_count == 2
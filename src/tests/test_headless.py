@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import patch
+from headless import HeadlessGame
+from management.profiler import Profiler
+
+
+class MockLevel:
+    """
+    Level which follows the order of Level.update: the death scene is created, then game_over is set.
+    """
+    def __init__(self, level, surface, game):
+        self.game = game
+        self.profiler = Profiler()
+        self.player_steps = 0
+        self.configure_level()
+
+    def update(self):
+        if not self.game_over:
+            self.player_steps += 1
+            if self.player_dead:
+                self.game.create_death_scene()
+                self.game_over = True
+
+    def clear_groups(self, player=False):
+        pass
+
+    def configure_level(self, player=False):
+        self.game_over = False
+        self.player_dead = False
+
+
+class TestHeadless():
+    @pytest.fixture()
+    def game(self):
+        with patch('headless.Level', MockLevel), patch('headless.set_clock'):
+            yield HeadlessGame()
+
+    def test_update__player_moves_again_after_death(self, game):
+        game.update()
+        game.level.player_dead = True
+        game.update()
+        assert game.deaths == 1
+        assert game.level.game_over
+
+        game.update()
+        game.update()
+
+        assert not game.level.game_over
+        assert game.level.player_steps == 4
@@ -0,0 +1,57 @@
+import pytest
+import pygame
+from types import SimpleNamespace
+from unittest.mock import patch
+from entities import enemy_animations
+from entities.enemy_animations import EnemyAnimations, draw_health_bars
+from tools.settings import GREY, RED
+
+
+def mock_enemy(x, y, current):
+    enemy = SimpleNamespace(properties=SimpleNamespace(dead={'status': False}, health={'current': current, 'max': 90}),
+                            movement=SimpleNamespace(collision_rect=pygame.Rect(x, y, 45, 85)))
+    enemy.animations = EnemyAnimations(enemy)
+    return enemy
+
+
+def draw_surface_bar(screen, enemy, offset):
+    """
+    Health bar drawn the way it was before the shared strips, from two new surfaces.
+    """
+    rect = enemy.movement.collision_rect
+    health = enemy.properties.health
+    hp_max = pygame.Surface((rect.width, 5))
+    hp_max.fill(GREY)
+    cur = pygame.Surface((health['current'] / health['max'] * rect.width, 5))
+    cur.fill(RED)
+    screen.blit(hp_max, (rect.left - offset.x, rect.top - 15 - offset.y))
+    screen.blit(cur, (rect.left - offset.x, rect.top - 15 - offset.y))
+
+
+class TestHealthBars():
+    @pytest.fixture()
+    def enemies(self):
+        offset = pygame.math.Vector2(100.5, 20)
+        return [(mock_enemy(300, 200, 90), offset), (mock_enemy(500, 200, 31), offset),
+                (mock_enemy(90, 30, 0), offset), (mock_enemy(870, 200, 45), pygame.math.Vector2(100, 20))]
+
+    def test_draw_health_bars__same_pixels_as_surfaces(self, enemies):
+        screen, expected = pygame.Surface((800, 400)), pygame.Surface((800, 400))
+
+        draw_health_bars(screen, enemies)
+        for enemy, offset in enemies:
+            draw_surface_bar(expected, enemy, offset)
+
+        assert pygame.image.tobytes(screen, 'RGB') == pygame.image.tobytes(expected, 'RGB')
+
+    def test_draw_health_bars__no_surfaces_after_first_frame(self, enemies):
+        screen = pygame.Surface((800, 400))
+        enemy_animations._bar_strips.clear()
+        draw_health_bars(screen, enemies)
+
+        with patch('pygame.Surface', wraps=pygame.Surface) as surface:
+            for enemy, _ in enemies:
+                enemy.properties.health['current'] -= 10
+            draw_health_bars(screen, enemies)
+
+        surface.assert_not_called()
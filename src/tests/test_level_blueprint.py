@@ -0,0 +1,101 @@
+import pytest
+import random
+import pygame
+from array import array
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from terrain import level
+from terrain.level import Level
+from terrain.level_blueprint import LevelBlueprint, StreamBlueprint
+from tools.settings import TILE_SIZE
+
+
+def mock_segment(path):
+    """
+    Segment which tiles depend on the file, so segments drawn in different order make different maps.
+    """
+    tile = sum(map(ord, path)) % 10
+    if 'elements' in path:
+        portal = 2 if 'render_end' in path else -1
+        return [array('h', [-1, -1, 0, -1]), array('h', [-1, portal, -1, -1]), array('h', [-1] * 4)]
+    return [array('h', [-1] * 4), array('h', [11] * 4), array('h', [tile] * 4)]
+
+
+class TestLevelBlueprint():
+    @pytest.fixture(autouse=True)
+    def segments(self):
+        with patch('terrain.map_generator.load_segment', mock_segment), \
+                patch('terrain.level_blueprint.load_segment', mock_segment):
+            yield
+
+    @pytest.fixture()
+    def level_map(self):
+        level_map = Level.__new__(Level)
+        level_map.current_level = 1
+        level_map.images = SimpleNamespace(terrain_tiles=[pygame.Surface((TILE_SIZE, TILE_SIZE))] * 12)
+        level_map.fight_manager = None
+        level_map.next_blueprint = None
+        level_map.portal_position = None
+        level_map.player = MagicMock()
+        level_map.get_player = lambda: level_map.player
+        return level_map
+
+    def test_blueprint__same_seed_same_layout(self):
+        first, second = LevelBlueprint(random.Random(7)), LevelBlueprint(random.Random(7))
+
+        assert first.terrain_layout == second.terrain_layout
+        assert first.terrain_elements_layout == second.terrain_elements_layout
+        assert first.chest_loot == second.chest_loot
+        assert first.enemy_layout == second.enemy_layout
+        assert first.enemy_kinds == second.enemy_kinds
+
+    def test_stream_blueprint__segment_drawn_again_is_the_same(self):
+        blueprint = StreamBlueprint(random.Random(7))
+        first = [blueprint.segment(index) for index in range(blueprint.segment_count())]
+
+        again = blueprint.segment(3)
+
+        assert again.terrain_layout == first[3].terrain_layout
+        assert (again.first_col, again.first_enemy) == (first[3].first_col, first[3].first_enemy)
+        assert again.enemy_layout == first[3].enemy_layout and again.enemy_kinds == first[3].enemy_kinds
+        assert again.chest_loot == first[3].chest_loot
+        assert [segment.terrain_layout for segment in first] == \
+               [segment.terrain_layout for segment in map(StreamBlueprint(random.Random(7)).segment, range(6))]
+
+    def test_stream_blueprint__draws_segments_on_demand(self):
+        blueprint = StreamBlueprint(random.Random(7))
+        assert blueprint.bounds == [0, 4]
+
+        last = blueprint.segment(blueprint.segment_count() - 1)
+
+        assert blueprint.bounds == [0, 4, 8, 12, 16, 20, 24]
+        assert blueprint.map_width() == 24 * TILE_SIZE
+        assert blueprint.first_enemies[-1] == last.first_enemy + len(last.enemy_layout[0])
+        assert last.enemy_kinds[blueprint.first_enemies[-1] - 1] == '3'
+        assert blueprint.portal_position == last.portal_position == (21 * TILE_SIZE, TILE_SIZE)
+
+    def test_stream_blueprint__endless_level_has_no_end(self):
+        blueprint = StreamBlueprint(random.Random(7), random_segments=None)
+
+        segments = [blueprint.segment(index) for index in range(50)]
+
+        assert blueprint.segment_count() is None
+        assert blueprint.portal_position is None
+        assert '3' not in [kind for segment in segments for kind in segment.enemy_kinds.values()]
+        assert sorted(enemy_id for segment in segments for enemy_id in segment.enemy_kinds) == \
+               list(range(blueprint.first_enemies[-1]))
+
+    def test_configure_level__uses_pregenerated_blueprint(self, level_map):
+        level_map.portal_position = (100 * TILE_SIZE, 0)
+        level_map.pregenerate_next_level(100 * TILE_SIZE)
+        blueprint = level_map.next_blueprint.result()
+
+        with patch.object(level, 'LEVEL_STREAMING', False), \
+                patch.object(level, 'LevelBlueprint') as new_blueprint, \
+                patch.object(level, 'create_tile_group', return_value=pygame.sprite.Group()):
+            level_map.configure_level(player=True)
+
+        new_blueprint.assert_not_called()
+        assert level_map.next_blueprint is None
+        assert level_map.portal_position == blueprint.portal_position
+        assert level_map.camera.border['right'] == blueprint.map_width()
@@ -0,0 +1,46 @@
+import pytest
+import pygame
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from terrain.level import Level
+from terrain.camera import Camera
+from terrain.chunks import TerrainChunks
+from combat.fighting import FightManager, Bullet
+from management.profiler import Profiler
+
+
+class TestLevelDraw():
+    @pytest.fixture()
+    def level(self):
+        level = Level.__new__(Level)
+        level.display_surface = pygame.Surface((1600, 900))
+        level.images = SimpleNamespace(background=pygame.Surface((1600, 900)))
+        level.images.background.fill((0, 0, 255))
+        level.camera = Camera(5000, 900)
+        level.terrain_chunks = TerrainChunks([])
+        with patch('combat.fighting.sounds'):
+            level.fight_manager = FightManager()
+        level.profiler = Profiler()
+        level.profiler.show = False
+        level.game_over = True
+        level.animations = []
+        level.near_elements = []
+        level.near_enemies = []
+        level.presented_offset = None
+        player = MagicMock()
+        player.properties.dead = {'status': True}
+        player.equipment.show = False
+        level.get_player = lambda: player
+        return level
+
+    def test_draw__attacks_over_background(self, level):
+        image = pygame.Surface((20, 5))
+        image.fill((255, 0, 0))
+        source = SimpleNamespace(status=SimpleNamespace(type='player', id=1, facing_right=True),
+                                 fighting=SimpleNamespace(arch={'range': 500, 'damage': 10}))
+        level.fight_manager.bullet_hits.add(Bullet('arrow', (100, 200), source, None, image))
+
+        level.draw()
+
+        assert level.display_surface.get_at((110, 202)) == (255, 0, 0)
+        assert level.display_surface.get_at((300, 300)) == (0, 0, 255)
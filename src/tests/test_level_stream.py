@@ -0,0 +1,245 @@
+import pytest
+import random
+import pygame
+from array import array
+from types import SimpleNamespace
+from unittest.mock import patch
+from terrain import level_stream
+from terrain.level_stream import LevelStream
+from terrain.chest import Chest
+from terrain.chunks import TerrainChunks
+from terrain.level_blueprint import StreamBlueprint
+from terrain.collision_mesh import CollisionMesh
+from terrain.items import Item
+from terrain.tile_layer import TileLayer
+from terrain.tiles import TileEquipment
+from tools.settings import TILE_SIZE
+
+COLUMNS = 50
+ROWS = 4
+CHEST_POSITION = (12 * TILE_SIZE, 2 * TILE_SIZE)
+
+
+class MockChest(pygame.sprite.Sprite):
+    def __init__(self, x, y):
+        super().__init__()
+        self.kind = 'chest'
+        self.rect = pygame.Rect(x, y, TILE_SIZE, TILE_SIZE)
+        self.equipment = TileEquipment(True)
+        self.equipment.content = [SimpleNamespace(owner=[self, 'chest'])]
+        Item.items.extend(self.equipment.content)
+        Chest.chests.append(self)
+
+
+class MockEnemy(pygame.sprite.Sprite):
+    def __init__(self, enemy_id, x):
+        super().__init__()
+        self.status = SimpleNamespace(id=enemy_id)
+        self.properties = SimpleNamespace(dead={'status': False})
+        self.movement = SimpleNamespace(collision_rect=pygame.Rect(x, 0, 40, 80))
+
+
+class MockBlueprint:
+    """
+    Blueprint with fixed segments cut out of whole layouts. Enemies belong to the segment of their position.
+    """
+    def __init__(self, segment_columns, enemy_positions, terrain_layout=None, elements_layout=None):
+        self.bounds = [0]
+        for columns in segment_columns:
+            self.bounds.append(self.bounds[-1] + columns)
+        self.enemy_positions = enemy_positions
+        self.terrain_layout = terrain_layout
+        self.elements_layout = elements_layout
+
+    def segment_count(self):
+        return len(self.bounds) - 1
+
+    def segment(self, index):
+        first, last = self.bounds[index], self.bounds[index + 1]
+        ids = [enemy_id for enemy_id, position in enumerate(self.enemy_positions)
+               if first * TILE_SIZE <= position < last * TILE_SIZE]
+        return SimpleNamespace(first_col=first, columns=last - first,
+                               terrain_layout=[row[first:last] for row in self.terrain_layout or []],
+                               terrain_elements_layout=[row[first:last] for row in self.elements_layout or []],
+                               first_enemy=ids[0] if ids else 0,
+                               enemy_layout=[[self.enemy_positions[enemy_id] for enemy_id in ids]],
+                               chest_loot={}, enemy_kinds={}, portal_position=None)
+
+    def map_width(self):
+        return self.bounds[-1] * TILE_SIZE
+
+
+def mock_segment(path):
+    columns = 10 if 'start' in path else 20
+    if 'elements' in path:
+        return [array('h', [-1] * columns) for _ in range(ROWS)]
+    return [array('h', [-1] * columns), array('h', [-1] * columns), array('h', [11] * columns),
+            array('h', [0] * columns)]
+
+
+def mock_level(columns=0):
+    collideable_tiles = TileLayer(columns, ROWS, [pygame.Surface((TILE_SIZE, TILE_SIZE)) for _ in range(12)])
+    return SimpleNamespace(terrain_tiles=TileLayer(columns, ROWS, collideable_tiles.images, kind='terrain'),
+                           collideable_tiles=collideable_tiles,
+                           collision_mesh=CollisionMesh(collideable_tiles),
+                           terrain_chunks=TerrainChunks([]),
+                           camera=SimpleNamespace(border={'right': 0}), portal_position=None,
+                           images=None, fight_manager=None,
+                           terrain_elements_sprite=pygame.sprite.Group(),
+                           enemy_sprites=pygame.sprite.Group())
+
+
+def mock_tile_group(layout, kind, images, level, fighting, blueprint=None, first_col=0):
+    group = pygame.sprite.Group()
+    for row_index, row in enumerate(layout):
+        for col_index, val in enumerate(row):
+            if val == -1:
+                continue
+            if kind == 'enemies':
+                group.add(MockEnemy(first_col + col_index, val))
+            else:
+                group.add(MockChest((first_col + col_index) * TILE_SIZE, row_index * TILE_SIZE))
+    return group
+
+
+class TestLevelStream():
+    @pytest.fixture()
+    def stream(self):
+        blueprint = MockBlueprint([10, 20, 10, 10], [5 * TILE_SIZE, 12 * TILE_SIZE, 25 * TILE_SIZE, 45 * TILE_SIZE])
+        stream = LevelStream(None, blueprint)
+        stream.load = lambda segment: stream.loaded.setdefault(segment, {})
+        stream.unload = lambda segment: stream.loaded.pop(segment)
+        return stream
+
+    def test_level_stream__segment_bounds(self, stream):
+        assert stream.bounds == [0, 10, 30, 40, 50]
+        assert stream.segment_at(29 * TILE_SIZE) == 1
+        assert stream.segment_at(100 * TILE_SIZE) == 3
+
+    def test_update__keeps_segments_around_player(self, stream):
+        with patch.object(level_stream, 'LEVEL_STREAM_AHEAD', 1), patch.object(level_stream, 'LEVEL_STREAM_BEHIND', 0):
+            stream.update(0)
+            assert stream.loaded_segments() == [0, 1]
+
+            stream.update(35 * TILE_SIZE)
+            assert stream.loaded_segments() == [2, 3]
+
+
+class TestLevelStreamSegments():
+    @pytest.fixture()
+    def stream(self):
+        terrain_layout = [[-1] * COLUMNS, [-1] * COLUMNS, [11] * COLUMNS, [0] * COLUMNS]
+        elements_layout = [[-1] * COLUMNS for _ in range(ROWS)]
+        elements_layout[CHEST_POSITION[1] // TILE_SIZE][CHEST_POSITION[0] // TILE_SIZE] = 0
+        blueprint = MockBlueprint([10, 20, 10, 10], [5 * TILE_SIZE, 12 * TILE_SIZE, 25 * TILE_SIZE, 45 * TILE_SIZE],
+                                  terrain_layout, elements_layout)
+        level = mock_level()
+        Item.items, Chest.chests = [], []
+        with patch.object(level_stream, 'create_tile_group', mock_tile_group):
+            stream = LevelStream(level, blueprint)
+            for segment in range(3):
+                stream.load(segment)
+            yield stream
+        Item.items, Chest.chests = [], []
+
+    @staticmethod
+    def enemy_ids(stream):
+        return sorted(enemy.status.id for enemy in stream.level.enemy_sprites)
+
+    @staticmethod
+    def chest(stream):
+        return [sprite for sprite in stream.level.terrain_elements_sprite if sprite.kind == 'chest'][0]
+
+    def test_unload__records_looted_chest(self, stream):
+        chest = self.chest(stream)
+        chest.equipment.collected = True
+        left_item = SimpleNamespace(owner=[chest, 'chest'])
+        chest.equipment.content = [left_item]
+
+        stream.unload(1)
+        assert stream.looted_chests == {CHEST_POSITION: (True, [left_item])}
+        assert Chest.chests == []
+
+        stream.load(1)
+        restored = self.chest(stream)
+        assert restored is not chest
+        assert restored.equipment.collected and restored.equipment.content == [left_item]
+        assert left_item.owner[0] is restored
+        assert stream.looted_chests == {}
+
+    def test_unload__discards_items_of_untouched_chest(self, stream):
+        items = list(self.chest(stream).equipment.content)
+
+        stream.unload(1)
+
+        assert stream.looted_chests == {}
+        assert not any(item in Item.items for item in items)
+
+    def test_unload__dead_enemy_is_not_created_again(self, stream):
+        enemy = [enemy for enemy in stream.level.enemy_sprites if enemy.status.id == 1][0]
+        enemy.properties.dead['status'] = True
+
+        stream.unload(1)
+        assert stream.dead_enemies == {1}
+        assert self.enemy_ids(stream) == [0]
+
+        stream.load(1)
+        assert self.enemy_ids(stream) == [0, 2]
+
+    def test_unload__enemy_stays_in_segment_it_walked_into(self, stream):
+        enemy = [enemy for enemy in stream.level.enemy_sprites if enemy.status.id == 2][0]
+        enemy.movement.collision_rect.centerx = 35 * TILE_SIZE
+
+        stream.unload(1)
+        assert enemy.alive() and enemy in stream.loaded[2]['enemies']
+
+        stream.load(1)
+        assert self.enemy_ids(stream) == [0, 1, 2]
+
+        stream.unload(2)
+        assert not enemy.alive() and stream.dead_enemies == set()
+
+    def test_unload__rebakes_shared_edge_chunks(self, stream):
+        chunks = stream.level.terrain_chunks
+        chunk_size = chunks.chunk_size
+        edge = stream.bounds[1] * TILE_SIZE
+        assert edge % chunk_size
+
+        stream.unload(1)
+
+        chunk = chunks.chunks[(edge // chunk_size, 0)]
+        floor_y = 3 * TILE_SIZE + TILE_SIZE // 2
+        assert chunk.get_at((edge % chunk_size - TILE_SIZE // 2, floor_y)).a == 255
+        assert chunk.get_at((edge % chunk_size + TILE_SIZE // 2, floor_y)).a == 0
+        assert stream.level.collision_mesh.rects_in_rect(pygame.Rect(edge, 0, 20 * TILE_SIZE, ROWS * TILE_SIZE)) == []
+
+    def test_unload__layers_keep_only_loaded_columns(self, stream):
+        stream.unload(0)
+
+        for layer in (stream.level.terrain_tiles, stream.level.collideable_tiles):
+            assert (layer.first_col, layer.columns) == (10, 30)
+        assert stream.level.collideable_tiles.tile(5, 3) is None
+        assert stream.level.collideable_tiles.tile(12, 3) is not None
+        assert stream.level.camera.border['right'] == 50 * TILE_SIZE
+
+
+class TestLevelStreamEndless():
+    def test_update__memory_doesnt_grow_with_the_level(self):
+        with patch('terrain.level_blueprint.load_segment', mock_segment), \
+                patch.object(level_stream, 'create_tile_group', mock_tile_group), \
+                patch.object(level_stream, 'LEVEL_STREAM_AHEAD', 2), patch.object(level_stream, 'LEVEL_STREAM_BEHIND', 1):
+            blueprint = StreamBlueprint(random.Random(3), random_segments=None)
+            level = mock_level()
+            stream = LevelStream(level, blueprint)
+            sizes = []
+            for x_pos in range(0, 300 * 20 * TILE_SIZE, 10 * TILE_SIZE):
+                stream.update(x_pos)
+                sizes.append((level.collideable_tiles.columns, len(level.collision_mesh), len(level.enemy_sprites)))
+
+        assert blueprint.segment_count() is None and len(blueprint.bounds) > 300
+        assert stream.loaded_segments() == [299, 300, 301, 302]
+        assert max(columns for columns, _, _ in sizes) == 4 * 20
+        assert max(runs for _, runs, _ in sizes) <= 2 * ROWS
+        assert max(enemies for _, _, enemies in sizes) <= 3 * 4 + 1
+        assert level.collideable_tiles.tile(10 + 298 * 20, 3) is not None
+        assert level.collideable_tiles.tile(10 + 298 * 20 - 1, 3) is None
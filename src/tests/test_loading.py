@@ -0,0 +1,39 @@
+import pytest
+import pygame
+from unittest.mock import patch
+from tools.loading import ParallelLoader
+
+
+class TestParallelLoader():
+    @pytest.fixture(autouse=True)
+    def display(self):
+        pygame.display.init()
+        pygame.display.set_mode((1, 1))
+
+    @pytest.fixture()
+    def folder(self, tmp_path):
+        for index, width in enumerate((4, 6, 8)):
+            image = pygame.Surface((width, 2), flags=pygame.SRCALPHA)
+            image.fill((index * 50, 0, 0, 255))
+            pygame.image.save(image, str(tmp_path / f'{index}.png'))
+        return str(tmp_path)
+
+    @patch('tools.loading.cached_frames', side_effect=lambda path, params, build: build())
+    def test_run__keeps_order_of_jobs(self, mock_cache, folder):
+        loader = ParallelLoader(workers=3)
+        frames = loader.folder(folder, scale=2)
+        image = loader.image(folder + '/1.png', (3, 3), flip=True)
+        loader.run()
+
+        assert [frame.get_size() for frame in loader.frames(frames)] == [(8, 4), (12, 4), (16, 4)]
+        assert [frame.get_at((0, 0)).r for frame in loader.frames(frames)] == [0, 50, 100]
+        assert loader.frames(image)[0].get_size() == (3, 3)
+
+    @patch('tools.loading.cached_frames', side_effect=lambda path, params, build: build())
+    def test_run__reports_progress(self, mock_cache, folder):
+        progress = []
+        loader = ParallelLoader(lambda done, total: progress.append((done, total)))
+        loader.folder(folder)
+        loader.run()
+
+        assert progress == [(0, 3), (1, 3), (2, 3), (3, 3)]
@@ -0,0 +1,54 @@
+import pytest
+import pygame
+from unittest.mock import patch
+from management.presentation import Presentation
+
+
+class TestPresentation():
+    @pytest.fixture()
+    def presentation(self):
+        screen = pygame.Surface((1600, 900))
+        return Presentation(screen, dirty_rects=True)
+
+    @patch('pygame.display.update')
+    def test_present__first_frame_is_full(self, mock_update, presentation):
+        presentation.add([pygame.Rect(10, 10, 20, 20)])
+        presentation.present()
+
+        mock_update.assert_called_once_with()
+
+    @patch('pygame.display.update')
+    def test_present__updates_current_and_previous_rects(self, mock_update, presentation):
+        presentation.present()
+        presentation.add([pygame.Rect(10, 10, 20, 20)])
+        presentation.present()
+        presentation.add([pygame.Rect(50, 50, 20, 20)])
+        presentation.present()
+
+        assert mock_update.call_args.args[0] == [pygame.Rect(10, 10, 20, 20), pygame.Rect(50, 50, 20, 20)]
+
+    @patch('pygame.display.update')
+    def test_present__rects_are_clipped_to_screen(self, mock_update, presentation):
+        presentation.present()
+        presentation.add([pygame.Rect(1590, -10, 20, 20), None])
+        presentation.present()
+
+        assert mock_update.call_args.args[0] == [pygame.Rect(1590, 0, 10, 10)]
+
+    @patch('pygame.display.update')
+    def test_present__full_update_when_scene_changed_everything(self, mock_update, presentation):
+        presentation.present()
+        presentation.add([pygame.Rect(10, 10, 20, 20)])
+        presentation.add(None)
+        presentation.present()
+
+        assert mock_update.call_args.args == ()
+
+    @patch('pygame.display.update')
+    def test_present__full_update_when_disabled(self, mock_update):
+        presentation = Presentation(pygame.Surface((1600, 900)), dirty_rects=False)
+        presentation.present()
+        presentation.add([pygame.Rect(10, 10, 20, 20)])
+        presentation.present()
+
+        assert mock_update.call_args.args == ()
@@ -0,0 +1,43 @@
+import pytest
+from unittest.mock import patch
+from management.profiler import Profiler, percentile
+
+
+class TestProfiler():
+    @pytest.fixture()
+    def profiler(self):
+        return Profiler(phases=('player', 'enemies'), history=100)
+
+    def test_percentile__returns_nearest_rank(self):
+        values = list(range(1, 101))
+
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([3.0], 99) == 3.0
+
+    @patch('management.profiler.perf_counter', side_effect=[1.0, 1.002, 2.0, 2.001])
+    def test_measure__adds_phase_time_in_frame(self, mock_counter, profiler):
+        with profiler.measure('player'):
+            pass
+        with profiler.measure('player'):
+            pass
+        profiler.end_frame()
+
+        assert profiler.history['player'][0] == pytest.approx(3.0)
+        assert profiler.history['enemies'][0] == 0.0
+        assert profiler.current['player'] == 0.0
+
+    def test_stats__average_and_percentiles(self, profiler):
+        profiler.history['player'].extend(range(100, 0, -1))
+
+        average, p95, p99 = profiler.stats('player')
+
+        assert average == pytest.approx(50.5)
+        assert p95 == 95
+        assert p99 == 99
+
+    def test_stats__history_is_limited(self, profiler):
+        for _ in range(150):
+            profiler.end_frame()
+
+        assert len(profiler.history['player']) == 100
@@ -0,0 +1,48 @@
+import pytest
+import pygame
+from unittest.mock import MagicMock, patch
+from tools import support
+from tools.support import render_text, text_cache_info
+
+
+class TestRenderText():
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        support._text_cache.clear()
+        yield
+        support._text_cache.clear()
+
+    @pytest.fixture()
+    def font(self):
+        font = MagicMock()
+        font.render.side_effect = lambda text, antialias, color: pygame.Surface((len(text), 10))
+        return font
+
+    def test_render_text__reuses_rendered_surface(self, font):
+        before = text_cache_info()
+        first = render_text(font, 'FPS: 60', (255, 255, 255))
+        second = render_text(font, 'FPS: 60', [255, 255, 255])
+        after = text_cache_info()
+
+        assert first is second
+        font.render.assert_called_once()
+        assert after['hits'] - before['hits'] == 1
+        assert after['misses'] - before['misses'] == 1
+
+    def test_render_text__color_is_part_of_key(self, font):
+        render_text(font, 'wizard', (255, 255, 255))
+        render_text(font, 'wizard', (0, 0, 0))
+
+        assert font.render.call_count == 2
+
+    @patch('tools.support.TEXT_CACHE_SIZE', 2)
+    def test_render_text__drops_least_recently_used(self, font):
+        render_text(font, 'a', (0, 0, 0))
+        render_text(font, 'b', (0, 0, 0))
+        render_text(font, 'a', (0, 0, 0))
+        render_text(font, 'c', (0, 0, 0))
+        render_text(font, 'a', (0, 0, 0))
+        render_text(font, 'b', (0, 0, 0))
+
+        assert [call.args[0] for call in font.render.call_args_list] == ['a', 'b', 'c', 'b']
+        assert text_cache_info()['size'] == 2
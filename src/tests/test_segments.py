@@ -0,0 +1,38 @@
+import os
+import pytest
+from unittest.mock import patch
+from tools import segments
+from tools.segments import compile_segment, load_segment, compiled_path
+
+
+class TestSegments():
+    @pytest.fixture()
+    def csv_path(self, tmp_path):
+        path = tmp_path / 'render_1_terrain.csv'
+        path.write_text('-1,-1,11\n3,4,-1\n', encoding='utf-8')
+        return str(path)
+
+    def test_load_segment__from_compiled_file(self, csv_path):
+        compile_segment(csv_path)
+
+        with patch.object(segments, 'parse_segment') as parse_segment:
+            segment = load_segment(csv_path)
+
+        parse_segment.assert_not_called()
+        assert [list(row) for row in segment] == [[-1, -1, 11], [3, 4, -1]]
+
+    def test_load_segment__stale_compiled_file(self, csv_path):
+        compile_segment(csv_path)
+        with open(csv_path, 'w', encoding='utf-8') as file:
+            file.write('1,2,3\n')
+        modified = os.stat(compiled_path(csv_path)).st_mtime_ns
+        os.utime(csv_path, ns=(modified + 10 ** 9, modified + 10 ** 9))
+
+        assert [list(row) for row in load_segment(csv_path)] == [[1, 2, 3]]
+
+    def test_compile_segment__rows_of_different_lengths(self, tmp_path):
+        path = tmp_path / 'broken.csv'
+        path.write_text('1,2\n3\n', encoding='utf-8')
+
+        with pytest.raises(ValueError):
+            compile_segment(str(path))
@@ -0,0 +1,49 @@
+import wave
+import pytest
+import pygame
+from tools.sounds import SoundBank
+from tools.settings import SOUND_FREE_CHANNELS
+
+
+class TestSoundBank():
+    @pytest.fixture(autouse=True)
+    def mixer(self):
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            pytest.skip('no audio device')
+        yield
+        pygame.mixer.quit()
+
+    @pytest.fixture()
+    def path(self, tmp_path):
+        path = str(tmp_path / 'beep.wav')
+        with wave.open(path, 'wb') as file:
+            file.setnchannels(1)
+            file.setsampwidth(2)
+            file.setframerate(22050)
+            file.writeframes(b'\x00\x10' * 22050)
+        return path
+
+    def test_load__decodes_once(self, path):
+        bank = SoundBank()
+
+        assert bank.load(path) is bank.load(path)
+
+    def test_play__limits_voices(self, path):
+        bank = SoundBank()
+
+        channels = [bank.play(path, 0.5, voices=2) for _ in range(3)]
+
+        assert channels[0] is not None and channels[1] is not None
+        assert channels[2] is None
+        assert pygame.mixer.get_num_channels() >= 2
+
+    def test_pool__reserves_separate_channels(self, path):
+        bank = SoundBank()
+
+        first = bank.pool(path, 2)
+        second = bank.pool('other.wav', 1)
+
+        assert (len(first), len(second), bank.reserved) == (2, 1, 3)
+        assert pygame.mixer.get_num_channels() >= 3 + SOUND_FREE_CHANNELS
@@ -0,0 +1,40 @@
+import pytest
+import pygame.rect
+from types import SimpleNamespace
+from combat.spatial_hash import SpatialHash
+
+
+def mock_enemy(enemy_id, x, dead=False):
+    return SimpleNamespace(status=SimpleNamespace(id=enemy_id),
+                           properties=SimpleNamespace(dead={'status': dead}),
+                           movement=SimpleNamespace(collision_rect=pygame.Rect(x, 0, 40, 80)))
+
+
+class TestSpatialHash():
+    @pytest.fixture()
+    def enemies(self):
+        return [mock_enemy(0, 1000), mock_enemy(1, 90), mock_enemy(2, 120, dead=True), mock_enemy(3, 230),
+                mock_enemy(4, 5000)]
+
+    def test_query__only_near_living_enemies(self, enemies):
+        spatial_hash = SpatialHash(100)
+        spatial_hash.rebuild(enemies)
+
+        found = spatial_hash.query(pygame.Rect(100, 0, 50, 50))
+
+        assert [enemy.status.id for enemy in found] == [1]
+
+    def test_query__keeps_order_across_buckets(self, enemies):
+        spatial_hash = SpatialHash(100)
+        spatial_hash.rebuild(enemies)
+
+        found = spatial_hash.query(pygame.Rect(0, 0, 1100, 50))
+
+        assert [enemy.status.id for enemy in found] == [0, 1, 3]
+
+    def test_get__finds_dead_enemies_by_id(self, enemies):
+        spatial_hash = SpatialHash(100)
+        spatial_hash.rebuild(enemies)
+
+        assert spatial_hash.get(2) is enemies[2]
+        assert spatial_hash.get(7) is None
@@ -0,0 +1,66 @@
+import pytest
+import pygame.rect
+from terrain.tile_layer import TileLayer, BACKGROUND_TILE, EMPTY
+from tools.settings import TILE_SIZE
+
+
+class TestTileLayer():
+    @pytest.fixture()
+    def layer(self):
+        layout = [[EMPTY] * 10 for _ in range(8)]
+        layout[5] = [col % 3 for col in range(10)]
+        layout[4][3] = 7
+        layout[4][4] = BACKGROUND_TILE
+        return TileLayer(10, 8, [f'image {tile_id}' for tile_id in range(12)], layout, 'collideable')
+
+    def test_tile_layer__indexes_all_tiles(self, layer):
+        assert len(layer) == 11
+        assert layer.tile(3, 4).image == 'image 7'
+        assert layer.tile(4, 4) is None
+        assert layer.tile(0, 0) is None
+
+    def test_tile_layer__terrain_kind_takes_background_tiles(self, layer):
+        background = TileLayer(10, 8, layer.images)
+        background.fill([list(cells) for cells in layer.cells[:4]] + [[EMPTY] * 4 + [BACKGROUND_TILE]], 'terrain')
+
+        assert [tile.rect.topleft for tile in background] == [(4 * TILE_SIZE, 4 * TILE_SIZE)]
+
+    def test_tiles_in_columns__returns_only_given_columns(self, layer):
+        tiles = layer.tiles_in_columns(2, 3)
+
+        assert len(tiles) == 3
+        assert all(2 <= tile.rect.x // TILE_SIZE <= 3 for tile in tiles)
+
+    def test_count_between__uses_tile_centers(self, layer):
+        assert layer.count_between(TILE_SIZE / 2, TILE_SIZE * 2 + TILE_SIZE / 2) == 1
+
+    def test_tiles_in_rect__returns_overlapping_tiles(self, layer):
+        rect = pygame.Rect(3 * TILE_SIZE + 10, 4 * TILE_SIZE + 10, 20, TILE_SIZE)
+        tiles = layer.tiles_in_rect(rect)
+
+        assert len(tiles) == 2
+        assert all(tile.rect.colliderect(rect) for tile in tiles)
+
+    def test_tiles_in_rect__outside_of_map(self, layer):
+        assert layer.tiles_in_rect(pygame.Rect(-200, -200, 50, 50)) == []
+
+    def test_clear_columns__drops_tiles_of_columns(self, layer):
+        layer.clear_columns(3, 4)
+
+        assert layer.tile(3, 4) is None
+        assert layer.tiles_in_columns(3, 4) == []
+        assert len(layer) == 8
+
+    def test_set_window__keeps_tiles_of_overlapping_columns(self, layer):
+        layer.set_window(2, 12)
+
+        assert (layer.first_col, layer.columns) == (2, 11)
+        assert layer.tile(3, 4).image == 'image 7'
+        assert layer.tile(1, 5) is None and layer.tiles_in_columns(0, 1) == []
+        assert len(layer) == 9
+        assert layer.count_between(0, 20 * TILE_SIZE) == 9
+
+        layer.fill([[EMPTY] * 3, [EMPTY] * 3, [EMPTY] * 3, [EMPTY] * 3, [EMPTY] * 3, [1, 1, 1]], 'collideable', 11)
+
+        row = layer.tiles_in_rect(pygame.Rect(0, 5 * TILE_SIZE, 20 * TILE_SIZE, 1))
+        assert [tile.rect.x // TILE_SIZE for tile in row] == [2, 3, 4, 5, 6, 7, 8, 9, 11, 12]
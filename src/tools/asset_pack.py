@@ -0,0 +1,277 @@
+"""
+This module packs the content folder into a single indexed file and reads
+assets from it through a memory map.
+
+The pack starts with a header and a JSON index mapping paths of files
+(e.g. 'content/graphics/ui/wallpaper.png') to their offsets, lengths and
+modification times, followed by the data of all files. At runtime the pack is
+mapped into memory once, and every asset is read as a file-like view of the
+map, without opening, seeking and closing files one by one.
+
+The pack is optional: if it doesn't exist (or ASSET_PACK is off), or a file
+isn't in it, assets are read from the content folder as before. A file which
+has been changed in the content folder since the pack was built (its
+modification time differs from the one in the index) is also read from the
+folder, so edited assets are used without rebuilding the pack.
+
+Build step (run from the folder containing `content/`):
+    python -m tools.asset_pack [content folder] [pack path]
+
+Functions:
+- `build_pack(content_path, pack_path)`:
+Packs all files of a folder into a pack file.
+- `open_content(path)`:
+Opens an asset for reading in binary mode, from the pack if possible.
+- `content_files(path)`:
+Returns paths of files in a content folder, sorted by name.
+- `content_modified(path)`:
+Returns the modification time of an asset in nanoseconds.
+
+Classes:
+- `AssetPack`:
+Memory-mapped pack file.
+- `PackedFile`:
+Read-only file-like object over a part of the memory map.
+"""
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from tools.settings import ASSET_PACK, ASSET_PACK_PATH
+
+MAGIC = b'APAK'
+PACK_VERSION = 1
+HEADER = struct.Struct('<4sII')
+
+
+def normalize(path: str) -> str:
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+def build_pack(content_path: str = 'content', pack_path: str = ASSET_PACK_PATH) -> int:
+    """
+    Args:
+    - content_path (str): The path to the folder with assets.
+    - pack_path (str): The path to the pack file to write.
+
+    Returns:
+    - int: Number of packed files.
+    """
+    paths = []
+    for folder, folders, files in os.walk(content_path):
+        folders.sort()
+        paths.extend(os.path.join(folder, file) for file in sorted(files))
+
+    index = {}
+    offset = 0
+    for path in paths:
+        stat = os.stat(path)
+        index[normalize(path)] = [offset, stat.st_size, stat.st_mtime_ns]
+        offset += stat.st_size
+    index_data = json.dumps(index).encode('utf-8')
+
+    temporary_path = f'{pack_path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as pack:
+        pack.write(HEADER.pack(MAGIC, PACK_VERSION, len(index_data)))
+        pack.write(index_data)
+        for path in paths:
+            with open(path, 'rb') as file:
+                pack.write(file.read())
+    os.replace(temporary_path, pack_path)
+    return len(paths)
+
+
+class PackedFile(io.RawIOBase):
+    """
+    Read-only, seekable file over a memoryview. Reading copies bytes straight from the memory map.
+    """
+    def __init__(self, view: memoryview) -> None:
+        super().__init__()
+        self.view = view
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), len(self.view) - self.position)
+        if size <= 0:
+            return 0
+        buffer[:size] = self.view[self.position:self.position + size]
+        self.position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.position = max(offset, 0)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+
+class AssetPack:
+    """
+    Memory-mapped pack of assets.
+    """
+    def __init__(self, path: str = ASSET_PACK_PATH) -> None:
+        """
+        Args:
+        - path (str): The path to the pack file.
+
+        Raises:
+        - ValueError: If the file isn't a pack of this version.
+        """
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, index_length = HEADER.unpack_from(self.map)
+            if magic != MAGIC or version != PACK_VERSION:
+                raise ValueError(f'{path} is not an asset pack of version {PACK_VERSION}')
+            self.index = json.loads(self.map[HEADER.size:HEADER.size + index_length])
+        except (struct.error, ValueError):
+            self.map.close()
+            raise
+        self.data = memoryview(self.map)[HEADER.size + index_length:]
+
+        self.folders = {}
+        for file in self.index:
+            folder, _ = file.rsplit('/', 1)
+            self.folders.setdefault(folder, []).append(file)
+        for files in self.folders.values():
+            files.sort()
+
+    def __contains__(self, path: str) -> bool:
+        return normalize(path) in self.index
+
+    def open(self, path: str) -> PackedFile:
+        offset, length, _ = self.index[normalize(path)]
+        return PackedFile(self.data[offset:offset + length])
+
+    def files(self, folder: str) -> list[str] | None:
+        """
+        Returns:
+        - list[str] | None: Paths of files directly in the folder, or None if the folder isn't in the pack.
+        """
+        return self.folders.get(normalize(folder))
+
+    def modified(self, path: str) -> int:
+        return self.index[normalize(path)][2]
+
+    def close(self) -> None:
+        """
+        Unmap the pack. Files opened from it must not be used anymore.
+        """
+        self.data.release()
+        self.map.close()
+
+
+_pack = None
+_pack_opened = False
+_pack_lock = threading.Lock()
+
+
+def content_pack() -> AssetPack | None:
+    """
+    Returns:
+    - AssetPack | None: The pack of assets, opened on first use, or None if there is no valid pack.
+    """
+    global _pack, _pack_opened
+    if not _pack_opened:
+        # Loader and level generator threads can ask for the pack at the same time:
+        with _pack_lock:
+            if not _pack_opened:
+                if ASSET_PACK and os.path.exists(ASSET_PACK_PATH):
+                    try:
+                        _pack = AssetPack(ASSET_PACK_PATH)
+                    except (OSError, ValueError):
+                        _pack = None
+                _pack_opened = True
+    return _pack
+
+
+def packed(pack: AssetPack | None, path: str) -> bool:
+    """
+    Args:
+    - pack (AssetPack | None): The pack of assets.
+    - path (str): The path to the asset.
+
+    Returns:
+    - bool: True if the asset should be read from the pack: it is packed, and the file in the content folder
+      is missing or hasn't been modified since the pack was built.
+    """
+    if pack is None or path not in pack:
+        return False
+    try:
+        return os.stat(path).st_mtime_ns == pack.modified(path)
+    except OSError:
+        return True
+
+
+def open_content(path: str):
+    """
+    Args:
+    - path (str): The path to the asset, e.g. 'content/graphics/ui/wallpaper.png'.
+
+    Returns:
+    - A binary file-like object with the content of the asset.
+    """
+    pack = content_pack()
+    if packed(pack, path):
+        return pack.open(path)
+    return open(path, 'rb')
+
+
+def content_files(path: str) -> list[str]:
+    """
+    Args:
+    - path (str): The path to the folder containing assets.
+
+    Returns:
+    - list[str]: Paths of files from the folder, sorted by name.
+    """
+    pack = content_pack()
+    # Files may have been added to or removed from the folder since the pack was built:
+    files = pack.files(path) if pack is not None and not os.path.isdir(path) else None
+    if files is not None:
+        return [path + '/' + file.rsplit('/', 1)[1] for file in files]
+    files = []
+    for _, __, folder_files in os.walk(path):
+        for file in sorted(folder_files):
+            files.append(path + '/' + file)
+    return files
+
+
+def content_modified(path: str) -> int:
+    """
+    Args:
+    - path (str): The path to the asset.
+
+    Returns:
+    - int: The modification time of the asset in nanoseconds, taken from the pack index
+      only if the file isn't in the content folder.
+
+    Raises:
+    - OSError: If the asset doesn't exist.
+    """
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        pack = content_pack()
+        if pack is not None and path in pack:
+            return pack.modified(path)
+        raise
+
+
+if __name__ == '__main__':
+    count = build_pack(*sys.argv[1:3])
+    print(f'Packed {count} files')
@@ -0,0 +1,166 @@
+"""
+This module defines the AssetRegistry class, a process-wide store of loaded
+images and animations shared by all the objects which use them.
+
+Assets are identified by a kind and loading parameters, e.g.
+`('image', path, size, flip)` or `('animations', path, names, scale)`.
+Objects owning an asset `acquire` it when they are created and `release` it
+when they are removed. Assets which nobody holds stay loaded, so they can be
+reused, until the memory budget is exceeded; then the least recently used of
+them are dropped. `get` returns a shared asset without holding it, for code
+which uses an asset only for a moment.
+
+Usage:
+    self.image = assets.acquire('image', 'content/graphics/weapons/arrow.png', None, True)
+    ...
+    assets.release('image', 'content/graphics/weapons/arrow.png', None, True)
+"""
+from collections import OrderedDict
+from collections.abc import Mapping
+import pygame
+from tools.settings import ASSET_MEMORY_BUDGET
+from tools.support import import_image, scale_image, import_character_assets
+from tools.atlas import pack_animations
+from tools.flipped_frames import FlippedFrames
+
+
+def load_image(path: str, size: tuple[int, int] | None = None, flip: bool = False) -> pygame.Surface:
+    """
+    :param path: path to the image file
+    :param size: size to scale the image to, or None to keep the size of the file
+    :param flip: whether to flip the image horizontally
+    :return: loaded image
+    """
+    image = import_image(path)
+    if flip:
+        image = pygame.transform.flip(image, True, False)
+    if size is not None:
+        image = scale_image(image, size)
+    return image
+
+
+def load_animations(path: str, names: tuple[str, ...], scale: float) -> tuple[dict, FlippedFrames]:
+    """
+    :param path: path to the folder with animation folders
+    :param names: names of animations (folders)
+    :param scale: scale of frames
+    :return: animations packed into an atlas and their lazily flipped version
+    """
+    animations = import_character_assets({name: [] for name in names}, path, scale=scale)
+    animations = pack_animations((animations,))[0]
+    return animations, FlippedFrames(animations)
+
+
+LOADERS = {
+    'image': load_image,
+    'animations': load_animations
+}
+
+
+class AssetRegistry:
+    """
+    Shared assets with reference counts, evicted from the least recently used when over the memory budget.
+    """
+    def __init__(self, budget: int = ASSET_MEMORY_BUDGET, loaders: dict = None) -> None:
+        """
+        :param budget: memory in bytes which unreferenced assets may take together with the referenced ones
+        :param loaders: functions loading assets of each kind
+        """
+        self.budget = budget
+        self.loaders = LOADERS if loaders is None else loaders
+        self.entries = OrderedDict()
+        self.references = {}
+        self.sizes = {}
+
+    def get(self, kind: str, *params):
+        """
+        Get a shared asset, loading it if needed, without holding a reference to it.
+
+        :param kind: kind of the asset
+        :param params: parameters of the loader
+        :return: the asset
+        """
+        key = (kind, *params)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        asset = self.loaders[kind](*params)
+        self.entries[key] = asset
+        self.references[key] = 0
+        self.sizes[key] = asset_memory(asset)
+        self.evict()
+        return asset
+
+    def acquire(self, kind: str, *params):
+        """
+        Get a shared asset and hold a reference to it until it is released.
+
+        :param kind: kind of the asset
+        :param params: parameters of the loader
+        :return: the asset
+        """
+        asset = self.get(kind, *params)
+        self.references[(kind, *params)] += 1
+        return asset
+
+    def release(self, kind: str, *params) -> None:
+        """
+        Drop a reference to an asset. The asset stays loaded until the memory budget is exceeded.
+
+        :param kind: kind of the asset
+        :param params: parameters of the loader
+        """
+        key = (kind, *params)
+        if self.references.get(key, 0) == 0:
+            return
+        self.references[key] -= 1
+        if self.references[key] == 0:
+            self.sizes[key] = asset_memory(self.entries[key])
+            self.evict()
+
+    def memory(self) -> int:
+        """
+        :return: memory in bytes taken by loaded assets
+        """
+        return sum(self.sizes.values())
+
+    def evict(self) -> None:
+        """
+        Drop the least recently used unreferenced assets until the memory fits in the budget.
+        """
+        total = self.memory()
+        for key in list(self.entries):
+            if total <= self.budget:
+                break
+            if self.references[key] == 0:
+                total -= self.sizes.pop(key)
+                del self.entries[key]
+                del self.references[key]
+
+
+def asset_memory(asset) -> int:
+    """
+    Estimate the memory of pixels of an asset. Subsurfaces are counted as their parent surfaces, once.
+
+    :param asset: a surface, or a container of surfaces
+    :return: memory in bytes
+    """
+    surfaces = {}
+    stack = [asset]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, pygame.Surface):
+            while item.get_parent() is not None:
+                item = item.get_parent()
+            surfaces[id(item)] = item
+        elif isinstance(item, FlippedFrames):
+            stack.append(item.source)
+            stack.extend(item.flipped.values())
+        elif isinstance(item, Mapping):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return sum(surface.get_width() * surface.get_height() * surface.get_bytesize() for surface in surfaces.values())
+
+
+assets = AssetRegistry()
@@ -0,0 +1,85 @@
+"""
+This module packs animation frames into texture atlases.
+
+All frames of a character (both facings) are copied into a few large surfaces
+(pages) and replaced with subsurfaces of these pages. Subsurfaces can be used
+everywhere a frame was used before. The position of a frame in its page is
+available with `Surface.get_offset()` and the page with `Surface.get_parent()`.
+
+Functions:
+- `pack_animations(animation_sets, page_size)`:
+Packs frames of animation dictionaries into atlas pages and returns dictionaries with subsurfaces.
+- `shelf_layout(sizes, page_size)`:
+Places rectangles of given sizes on shelves of pages.
+"""
+import pygame
+from tools.settings import ATLAS_PAGE_SIZE, ATLAS_PADDING
+
+
+def pack_animations(animation_sets: tuple[dict, ...], page_size: int = ATLAS_PAGE_SIZE) -> tuple[dict, ...]:
+    """
+    Packs frames of animation dictionaries into atlas pages.
+
+    Args:
+    - animation_sets (tuple[dict, ...]): Dictionaries mapping animation names to lists of frames.
+    - page_size (int): The maximal width and height of a page.
+
+    Returns:
+    - tuple[dict, ...]: Dictionaries with the same animations, with frames replaced by subsurfaces of pages.
+    """
+    frames = [frame for animations in animation_sets for frame_list in animations.values() for frame in frame_list]
+    if not frames:
+        return animation_sets
+    placements, page_sizes = shelf_layout([frame.get_size() for frame in frames], page_size)
+
+    pages = [pygame.Surface(size, flags=pygame.SRCALPHA) for size in page_sizes]
+    for frame, (page_index, rect) in zip(frames, placements):
+        pages[page_index].blit(frame, rect.topleft)
+    pages = [page.convert_alpha() for page in pages]
+    regions = [pages[page_index].subsurface(rect) for page_index, rect in placements]
+
+    packed_sets = []
+    regions = iter(regions)
+    for animations in animation_sets:
+        packed_sets.append({name: [next(regions) for _ in frame_list] for name, frame_list in animations.items()})
+    return tuple(packed_sets)
+
+
+def shelf_layout(sizes: list[tuple[int, int]], page_size: int = ATLAS_PAGE_SIZE) -> tuple[list, list]:
+    """
+    Places rectangles on pages, in rows (shelves) filled from left to right, starting with the highest rectangles.
+    A rectangle bigger than a page gets its own page.
+
+    Args:
+    - sizes (list[tuple[int, int]]): Sizes of rectangles.
+    - page_size (int): The maximal width and height of a page.
+
+    Returns:
+    - tuple[list, list]: Placements (page index and rectangle) in the order of sizes, and sizes of pages.
+    """
+    placements = [None] * len(sizes)
+    page_sizes = []
+    current = None
+    shelf_x = shelf_y = shelf_height = 0
+
+    for index in sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True):
+        width, height = sizes[index]
+        if width > page_size or height > page_size:
+            page_sizes.append((width, height))
+            placements[index] = (len(page_sizes) - 1, pygame.Rect(0, 0, width, height))
+            continue
+        if current is not None and shelf_x + width > page_size:
+            shelf_x = 0
+            shelf_y += shelf_height + ATLAS_PADDING
+            shelf_height = 0
+        if current is None or shelf_y + height > page_size:
+            page_sizes.append((0, 0))
+            current = len(page_sizes) - 1
+            shelf_x = shelf_y = shelf_height = 0
+        placements[index] = (current, pygame.Rect(shelf_x, shelf_y, width, height))
+        shelf_x += width + ATLAS_PADDING
+        shelf_height = max(shelf_height, height)
+        page_sizes[current] = (max(page_sizes[current][0], shelf_x - ATLAS_PADDING),
+                               max(page_sizes[current][1], shelf_y + height))
+
+    return placements, page_sizes
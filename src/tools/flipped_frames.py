@@ -0,0 +1,32 @@
+"""
+This module defines the FlippedFrames class, which mirrors animation frames
+horizontally on first use instead of loading the flipped set from disk.
+"""
+from collections.abc import Mapping
+import pygame
+
+
+class FlippedFrames(Mapping):
+    """
+    Dictionary of animations mirroring frames of the source animations.
+    Frames of an animation are flipped when the animation is used for the first time and then kept.
+    """
+    def __init__(self, animations: dict) -> None:
+        """
+        :param animations: dictionary mapping animation names to lists of frames
+        """
+        self.source = animations
+        self.flipped = {}
+
+    def __getitem__(self, name: str) -> list:
+        frames = self.flipped.get(name)
+        if frames is None:
+            frames = [pygame.transform.flip(frame, True, False) for frame in self.source[name]]
+            self.flipped[name] = frames
+        return frames
+
+    def __iter__(self):
+        return iter(self.source)
+
+    def __len__(self) -> int:
+        return len(self.source)
@@ -0,0 +1,108 @@
+"""
+This module defines the LazyFont class, a handle of a system font which is
+looked up and loaded when it's used for the first time.
+
+Looking up a system font by name (`pygame.font.SysFont`) may scan all fonts
+installed in the system. LazyFont does it only when the font is needed, and
+keeps paths of found fonts in a small cache file, so the next launch of the
+game loads them directly.
+
+Usage:
+    FONT_SMALL = LazyFont('arial', 15)
+    ...
+    image = FONT_SMALL.render('text', True, WHITE)
+"""
+import json
+import os
+from contextlib import suppress
+import pygame
+
+FONT_CACHE_PATH = os.path.join('.cache', 'fonts.json')
+
+_font_paths = None
+
+
+def font_path(name: str) -> str | None:
+    """
+    Finds the file of a system font, like `pygame.font.SysFont` does.
+
+    Args:
+    - name (str): Name of the font (or comma separated names).
+
+    Returns:
+    - str | None: The path to the font file, or None for the default pygame font.
+    """
+    global _font_paths
+    if _font_paths is None:
+        _font_paths = load_font_paths()
+    if name in _font_paths:
+        path = _font_paths[name]
+        if path is None or os.path.exists(path):
+            return path
+    path = pygame.font.match_font(name)
+    _font_paths[name] = path
+    save_font_paths(_font_paths)
+    return path
+
+
+def load_font_paths() -> dict:
+    """
+    Returns:
+    - dict: Paths of fonts found in previous launches of the game, by names.
+    """
+    try:
+        with open(FONT_CACHE_PATH, encoding='utf-8') as file:
+            paths = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return paths if isinstance(paths, dict) else {}
+
+
+def save_font_paths(paths: dict) -> None:
+    """
+    Stores paths of found fonts. The game still works if the cache can't be written.
+
+    Args:
+    - paths (dict): Paths of fonts by names.
+    """
+    temporary_path = f'{FONT_CACHE_PATH}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_PATH), exist_ok=True)
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(paths, file)
+        os.replace(temporary_path, FONT_CACHE_PATH)
+    except OSError:
+        with suppress(OSError):
+            os.remove(temporary_path)
+
+
+class LazyFont:
+    """
+    Handle of a system font, loaded on first use. Attributes of pygame.font.Font
+    (render, size, get_height...) are available directly on the handle.
+    """
+    def __init__(self, name: str, size: int) -> None:
+        """
+        Args:
+        - name (str): Name of the system font.
+        - size (int): Size of the font.
+        """
+        self.name = name
+        self.size_points = size
+        self._font = None
+
+    @property
+    def font(self) -> pygame.font.Font:
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.Font(font_path(self.name), self.size_points)
+        return self._font
+
+    def __getattr__(self, attribute: str):
+        if attribute.startswith('_'):
+            raise AttributeError(attribute)
+        return getattr(self.font, attribute)
+
+    def __repr__(self) -> str:
+        return f'LazyFont({self.name!r}, {self.size_points})'
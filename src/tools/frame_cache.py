@@ -0,0 +1,124 @@
+"""
+This module keeps processed (decoded, cut, scaled and flipped) frames on disk,
+so the next launch of the game can load raw pixels instead of decoding and
+scaling the source images again.
+
+Cached frames are stored in a versioned directory, one file for every source
+image and processing parameters. The file name is a hash of the source path,
+its modification time and the parameters, so changed images are processed
+again automatically. Bumping FRAME_CACHE_VERSION invalidates the whole cache.
+
+Functions:
+- `cached_frames(path, params, build)`:
+Returns frames of a source image from the cache or builds and stores them.
+"""
+import hashlib
+import os
+import struct
+from contextlib import suppress
+import pygame
+from tools.settings import FRAME_CACHE, FRAME_CACHE_PATH, FRAME_CACHE_VERSION
+from tools.asset_pack import content_modified
+
+CACHE_DIR = os.path.join(FRAME_CACHE_PATH, f'v{FRAME_CACHE_VERSION}')
+MAGIC = b'FRMC'
+HEADER = struct.Struct('<4sI')
+FRAME_HEADER = struct.Struct('<II')
+
+
+def cached_frames(path: str, params: tuple, build) -> list:
+    """
+    Returns frames made from a source image, loading them from the cache if possible.
+
+    Args:
+    - path (str): The path to the source image.
+    - params (tuple): Parameters of processing (e.g. scale and flip), part of the cache key.
+    - build (Callable[[], list]): Function which processes the source image into frames.
+
+    Returns:
+    - list: A list of Pygame surfaces.
+    """
+    if not FRAME_CACHE:
+        return build()
+    key = cache_key(path, params)
+    if key is None:
+        return build()
+    cache_path = os.path.join(CACHE_DIR, key + '.bin')
+    frames = load_frames(cache_path)
+    if frames is None:
+        frames = build()
+        save_frames(cache_path, frames)
+    return frames
+
+
+def cache_key(path: str, params: tuple) -> str | None:
+    """
+    Args:
+    - path (str): The path to the source image.
+    - params (tuple): Parameters of processing.
+
+    Returns:
+    - str | None: The key of cached frames, or None if the source image doesn't exist.
+    """
+    try:
+        modified = content_modified(path)
+    except OSError:
+        return None
+    source = '|'.join([os.path.normpath(path), str(modified), repr(params)])
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+
+def load_frames(cache_path: str) -> list | None:
+    """
+    Loads frames stored as raw RGBA pixels. Frames are not converted to the display format,
+    so they can be loaded on a worker thread.
+
+    Args:
+    - cache_path (str): The path to the cache file.
+
+    Returns:
+    - list | None: A list of Pygame surfaces, or None if there are no valid cached frames.
+    """
+    try:
+        with open(cache_path, 'rb') as file:
+            data = file.read()
+        magic, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            return None
+        frames = []
+        position = HEADER.size
+        for _ in range(count):
+            width, height = FRAME_HEADER.unpack_from(data, position)
+            position += FRAME_HEADER.size
+            length = width * height * 4
+            if position + length > len(data):
+                return None
+            pixels = data[position:position + length]
+            position += length
+            frames.append(pygame.image.frombytes(pixels, (width, height), 'RGBA'))
+        return frames
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def save_frames(cache_path: str, frames: list) -> None:
+    """
+    Stores frames as raw RGBA pixels. The game still works if the cache can't be written.
+
+    Args:
+    - cache_path (str): The path to the cache file.
+    - frames (list): A list of Pygame surfaces.
+    """
+    data = [HEADER.pack(MAGIC, len(frames))]
+    for frame in frames:
+        data.append(FRAME_HEADER.pack(*frame.get_size()))
+        data.append(pygame.image.tobytes(frame, 'RGBA'))
+    temporary_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(temporary_path, 'wb') as file:
+            file.write(b''.join(data))
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        with suppress(OSError):
+            os.remove(temporary_path)
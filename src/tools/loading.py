@@ -0,0 +1,178 @@
+"""
+This module decodes images on a thread pool.
+
+Decoding, cutting, flipping and scaling of images (or reading them from the
+frame cache) runs on worker threads. Converting surfaces to the display format
+has to be done on the main thread, so it is done there as soon as every job
+is finished, while the other jobs are still running.
+
+Images are read with `open_content`, from the asset pack if there is one.
+
+Functions:
+- `read_image(path)`:
+Decodes an image file without any processing.
+- `decode_image(path, size, flip)`, `decode_frame(path, scale, flip)`, `decode_cut_graphics(path, size)`:
+Decode images without converting them to the display format. Safe to call from worker threads.
+
+Classes:
+- `ParallelLoader`:
+Collects decoding jobs and runs them on a thread pool.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import pygame
+from tools.settings import SCALE, LOADING_WORKERS
+from tools.frame_cache import cached_frames
+from tools.asset_pack import open_content, content_files
+
+
+def read_image(path: str) -> pygame.surface.Surface:
+    """
+    Args:
+    - path (str): The path to the image file.
+
+    Returns:
+    - pygame.surface.Surface: The decoded image, not converted to the display format.
+    """
+    with open_content(path) as file:
+        return pygame.image.load(file, path)
+
+
+def decode_image(path: str, size: tuple[int, int] | None = None, flip: bool = False) -> pygame.surface.Surface:
+    """
+    Decodes an image, flips it and scales it to the given size.
+
+    Args:
+    - path (str): The path to the image file.
+    - size (tuple[int, int] | None): The size to scale the image to, or None to keep its size.
+    - flip (bool): Whether to flip the image horizontally.
+
+    Returns:
+    - pygame.surface.Surface: The decoded image, not converted to the display format.
+    """
+    image = read_image(path)
+    if flip:
+        image = pygame.transform.flip(image, True, False)
+    if size is not None:
+        image = pygame.transform.scale(image, size)
+    return image
+
+
+def decode_frame(path: str, scale: float = SCALE, flip: bool = False) -> pygame.surface.Surface:
+    """
+    Decodes an animation frame, flips and scales it.
+
+    Args:
+    - path (str): The path to the image file.
+    - scale (float): The scaling factor for the image.
+    - flip (bool): Whether to flip the image horizontally.
+
+    Returns:
+    - pygame.surface.Surface: The decoded frame, not converted to the display format.
+    """
+    image = read_image(path)
+    if flip:
+        image = pygame.transform.flip(image, True, False)
+    return pygame.transform.scale(image, (int(image.get_width()*scale), int(image.get_height()*scale)))
+
+
+def decode_cut_graphics(path: str, size: tuple[int, int]) -> list:
+    """
+    Decodes an image and divides it into tiles.
+
+    Args:
+    - path (str): The path to the image file.
+    - size (tuple[int, int]): The size of each tile (width, height).
+
+    Returns:
+    - list: Tiles from the image, not converted to the display format.
+    """
+    surface = read_image(path)
+    tile_num_x = int(surface.get_size()[0] / size[0])
+    tile_num_y = int(surface.get_size()[1] / size[1])
+
+    cut_tiles = []
+    for row in range(tile_num_y):
+        for col in range(tile_num_x):
+            new_surf = pygame.Surface(size, flags=pygame.SRCALPHA)
+            new_surf.blit(surface, (0, 0), pygame.Rect(col * size[0], row * size[1], size[0], size[1]))
+            cut_tiles.append(new_surf)
+    return cut_tiles
+
+
+def cached_frame(path: str, scale: float, flip: bool) -> list:
+    return cached_frames(path, ('frame', scale, flip), lambda: [decode_frame(path, scale, flip)])
+
+
+def cached_cut_graphics(path: str, size: tuple[int, int], tile_size: tuple[int, int] | None = None) -> list:
+    tiles = cached_frames(path, ('cut', tuple(size)), lambda: decode_cut_graphics(path, size))
+    if tile_size is not None:
+        tiles = [pygame.transform.scale(tile, tile_size) for tile in tiles]
+    return tiles
+
+
+class ParallelLoader:
+    """
+    Collects image decoding jobs and runs them on a thread pool.
+
+    Every job returns a list of surfaces. Jobs are identified by numbers returned when they are added,
+    and their converted surfaces are available with `frames` after `run`.
+    """
+    def __init__(self, progress=None, workers: int | None = LOADING_WORKERS) -> None:
+        """
+        Args:
+        - progress (Callable[[int, int], None] | None): Called on the main thread with numbers of finished and all jobs.
+        - workers (int | None): Number of threads, None for the default of ThreadPoolExecutor.
+        """
+        self.progress = progress
+        self.workers = workers
+        self.jobs = []
+        self.results = []
+
+    def add(self, function, *args) -> list[int]:
+        """
+        Args:
+        - function (Callable[..., list]): Function decoding surfaces, safe to run on a worker thread.
+        - args: Arguments of the function.
+
+        Returns:
+        - list[int]: Numbers of added jobs.
+        """
+        self.jobs.append((function, args))
+        return [len(self.jobs) - 1]
+
+    def image(self, path: str, size: tuple[int, int] | None = None, flip: bool = False) -> list[int]:
+        return self.add(lambda: [decode_image(path, size, flip)])
+
+    def folder(self, path: str, scale: float = SCALE, flip: bool = False) -> list[int]:
+        jobs = []
+        for file in content_files(path):
+            jobs.extend(self.add(cached_frame, file, scale, flip))
+        return jobs
+
+    def cut_graphics(self, path: str, size: tuple[int, int], tile_size: tuple[int, int] | None = None) -> list[int]:
+        return self.add(cached_cut_graphics, path, size, tile_size)
+
+    def run(self) -> None:
+        """
+        Run all jobs and convert their surfaces to the display format on the main thread.
+        """
+        total = len(self.jobs)
+        self.results = [None] * total
+        if self.progress:
+            self.progress(0, total)
+        with ThreadPoolExecutor(self.workers) as pool:
+            futures = {pool.submit(function, *args): index for index, (function, args) in enumerate(self.jobs)}
+            for done, future in enumerate(as_completed(futures), 1):
+                self.results[futures[future]] = [surface.convert_alpha() for surface in future.result()]
+                if self.progress:
+                    self.progress(done, total)
+
+    def frames(self, jobs: list[int]) -> list:
+        """
+        Args:
+        - jobs (list[int]): Numbers of jobs.
+
+        Returns:
+        - list: Converted surfaces of the jobs, in the order of jobs.
+        """
+        return [surface for job in jobs for surface in self.results[job]]
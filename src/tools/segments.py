@@ -0,0 +1,148 @@
+"""
+This module compiles CSV level segments into a compact binary format and
+loads segments as rows of integers.
+
+A compiled segment is stored next to its CSV file, with the `.seg` extension.
+It starts with a header (magic bytes, version, number of rows and columns)
+followed by all the cells as little-endian 16-bit integers. Rows of a loaded
+segment are `array('h')` objects, so segments are joined with array
+concatenation and cells are compared as numbers.
+
+A compiled segment older than its CSV file is ignored and the CSV file is
+parsed instead, so edited segments work before they are compiled again.
+
+Build step (run from the folder containing `content/`):
+    python -m tools.segments [levels folder]
+
+Functions:
+- `load_segment(path)`:
+Loads a segment from its compiled file if it's up to date, otherwise from the CSV file.
+- `compile_segment(path)`:
+Compiles a CSV segment into its `.seg` file.
+- `compile_segments(folder)`:
+Compiles all CSV segments in a folder and its subfolders.
+"""
+import os
+import struct
+import sys
+from array import array
+from tools.asset_pack import open_content, content_modified
+from tools.support import import_csv_file
+
+MAGIC = b'SEGM'
+SEGMENT_VERSION = 1
+HEADER = struct.Struct('<4sHII')
+
+
+def compiled_path(path: str) -> str:
+    """
+    Args:
+    - path (str): The path to the CSV segment.
+
+    Returns:
+    - str: The path to the compiled segment.
+    """
+    return os.path.splitext(path)[0] + '.seg'
+
+
+def parse_segment(path: str) -> list[array]:
+    """
+    Args:
+    - path (str): The path to the CSV segment.
+
+    Returns:
+    - list[array]: Rows of the segment.
+    """
+    return [array('h', map(int, row)) for row in import_csv_file(path)]
+
+
+def load_compiled(path: str) -> list[array] | None:
+    """
+    Args:
+    - path (str): The path to the compiled segment.
+
+    Returns:
+    - list[array] | None: Rows of the segment, or None if the file isn't a valid compiled segment.
+    """
+    try:
+        with open_content(path) as file:
+            data = file.read()
+        magic, version, rows, columns = HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return None
+    if magic != MAGIC or version != SEGMENT_VERSION or len(data) != HEADER.size + rows * columns * 2:
+        return None
+    cells = array('h')
+    cells.frombytes(data[HEADER.size:])
+    if sys.byteorder == 'big':
+        cells.byteswap()
+    return [cells[row * columns:(row + 1) * columns] for row in range(rows)]
+
+
+def load_segment(path: str) -> list[array]:
+    """
+    Loads a segment, from its compiled file if it's up to date.
+
+    Args:
+    - path (str): The path to the CSV segment.
+
+    Returns:
+    - list[array]: Rows of the segment.
+    """
+    binary_path = compiled_path(path)
+    try:
+        up_to_date = content_modified(binary_path) >= content_modified(path)
+    except OSError:
+        up_to_date = False
+    if up_to_date:
+        segment = load_compiled(binary_path)
+        if segment is not None:
+            return segment
+    return parse_segment(path)
+
+
+def compile_segment(path: str) -> str:
+    """
+    Args:
+    - path (str): The path to the CSV segment.
+
+    Returns:
+    - str: The path to the compiled segment.
+
+    Raises:
+    - ValueError: If rows of the segment have different lengths.
+    """
+    segment = parse_segment(path)
+    columns = len(segment[0]) if segment else 0
+    if any(len(row) != columns for row in segment):
+        raise ValueError(f'Rows of {path} have different lengths')
+    cells = array('h')
+    for row in segment:
+        cells.extend(row)
+    if sys.byteorder == 'big':
+        cells.byteswap()
+    binary_path = compiled_path(path)
+    with open(binary_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, SEGMENT_VERSION, len(segment), columns))
+        file.write(cells.tobytes())
+    return binary_path
+
+
+def compile_segments(folder: str = 'content/levels') -> list[str]:
+    """
+    Args:
+    - folder (str): The folder with CSV segments.
+
+    Returns:
+    - list[str]: Paths of compiled segments.
+    """
+    compiled = []
+    for path, _, files in os.walk(folder):
+        for file in sorted(files):
+            if file.endswith('.csv'):
+                compiled.append(compile_segment(os.path.join(path, file)))
+    return compiled
+
+
+if __name__ == '__main__':
+    print(f'Compiled {len(compile_segments(*sys.argv[1:2]))} segments')
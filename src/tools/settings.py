@@ -1,22 +1,28 @@
-import pygame.font
+import pygame
 from tools.game_data import SWORD_NAMES, BOW_NAMES, ARMOR_NAMES
-pygame.font.init()
+from tools.fonts import LazyFont
 
 # --- Sounds --------------------------------------------------------------------------------
 SOUND_PLAY_MUSIC = False
+SOUND_MUSIC_PATH = 'content/sounds/background.mp3'
 SOUND_MUSIC_VOLUME = 0.03
 SOUND_SPAWN_PATH = 'content/sounds/enemies/spawn.mp3'
 SOUND_SPAWN_VOLUME = 0.03
-
-# --- Fonts ---------------------------------------------------------------------------------
-FONT_BIG = pygame.font.SysFont('content/fonts/arial.ttf', 72)
-FONT_NORMAL = pygame.font.SysFont('content/fonts/ARCADEPI.ttf', 30)
-FONT_SMALL = pygame.font.SysFont('arial', 15)
-FONT_UI_FRAME = pygame.font.SysFont('arial', 11)
-FONT_UI_EQUIPMENT_ACTIVE = pygame.font.SysFont('arial', 15)
-FONT_DEATH = pygame.font.SysFont('content/fonts/ARCADEPI.ttf', 70)
-FONT_FPS = pygame.font.SysFont('arial', 30)
-FONT_BUTTON = pygame.font.SysFont('arial', 25)
+SOUND_SPAWN_VOICES = 3
+SOUND_SHIELD_BLOCK_PATH = 'content/sounds/character/shield_block.mp3'
+SOUND_SHIELD_BLOCK_VOLUME = 0.05
+SOUND_SHIELD_BLOCK_VOICES = 2
+SOUND_FREE_CHANNELS = 8  # Channels left for sounds without a limit of voices
+
+# --- Fonts (loaded on first use) ----------------------------------------------------------
+FONT_BIG = LazyFont('content/fonts/arial.ttf', 72)
+FONT_NORMAL = LazyFont('content/fonts/ARCADEPI.ttf', 30)
+FONT_SMALL = LazyFont('arial', 15)
+FONT_UI_FRAME = LazyFont('arial', 11)
+FONT_UI_EQUIPMENT_ACTIVE = LazyFont('arial', 15)
+FONT_DEATH = LazyFont('content/fonts/ARCADEPI.ttf', 70)
+FONT_FPS = LazyFont('arial', 30)
+FONT_BUTTON = LazyFont('arial', 25)
 
 # Colors:
 WHITE = (255, 255, 255)
@@ -114,11 +120,41 @@ ENEMY_IMMUNITY_FROM_HIT = 300
 ENEMY_DEATH_LATENCY = 700
 
 BULLET_DEFAULT_SPEED = {'arrow': 10*SCALE, 'death_bullet': 5*SCALE}
+FIGHT_HASH_BUCKET_SIZE = 256  # Width of buckets which enemies are sorted into for hit checks
 
 # Frames Per Seconds:
 FPS = 60
 FPS_SHOW_POS = (60, 25)
 
+# Simulation:
+SIMULATION_FPS = 60
+SIMULATION_STEP = 1 / SIMULATION_FPS
+SIMULATION_MAX_STEPS = 5
+
+# Display:
+DIRTY_RECTS = False
+TEXT_CACHE_SIZE = 512
+LOADING_BAR_SIZE = (400, 12)
+LOADING_BAR_SPACE = 60
+LOADING_REFRESH_TIME = 50
+
+# Frame cache:
+FRAME_CACHE = True
+FRAME_CACHE_PATH = '.cache/frames'
+FRAME_CACHE_VERSION = 1
+
+# Texture atlas:
+ATLAS_PAGE_SIZE = 2048
+ATLAS_PADDING = 1
+
+# Asset pack (built with `python -m tools.asset_pack`, used if it exists):
+ASSET_PACK = True
+ASSET_PACK_PATH = 'content.pack'
+
+# Assets:
+ASSET_MEMORY_BUDGET = 64 * 1024 ** 2
+LOADING_WORKERS = None  # None - default number of threads of ThreadPoolExecutor
+
 # Buttons:
 BUTTON_SIZE = (200, 40)
 BUTTONS_SPACE = 40
@@ -136,6 +172,8 @@ FIREPLACE_PATH = 'content/graphics/terrain/fireplace/'
 CHEST_PATH = 'content/graphics/terrain/chest/'
 PORTAL_PATH = 'content/graphics/terrain/portal/'
 CORPSE_PATH = 'content/graphics/terrain/corpse/1.png'
+TERRAIN_CHUNK_SIZE = 16
+COLLISION_MODE = 'mesh'  # 'mesh': merged runs of tiles near characters, 'grid': only the cells under characters
 
 # Items:
 ITEM_LEVEL_WEIGHT = [0.6, 0.25, 0.15]
@@ -187,6 +225,11 @@ LEVEL_AREA_DISTANCE = 3000
 LEVEL_SPAWN = 1500
 LEVEL_SPAWN_HEIGHT = 300
 LEVEL_SPAWN_SPACE = 400
+LEVEL_PREGENERATE_DISTANCE = 2000
+LEVEL_RANDOM_SEGMENTS = 4  # Segments between the start and the end of a level, None for endless (only with LEVEL_STREAMING)
+LEVEL_STREAMING = False  # Create sprites only for segments around the player
+LEVEL_STREAM_AHEAD = 2  # Segments ahead of the player with sprites
+LEVEL_STREAM_BEHIND = 1  # Segments behind the player with sprites
 
 # Keyboard:
 KEY_DELAY = 400
@@ -200,3 +243,11 @@ SHOW_HIT_RECTANGLES = True
 SHOW_PLAYER_STATUS = False
 SHOW_ENEMY_STATUS = True
 SHOW_STATUS_SPACE = 6
+
+SHOW_PROFILER = True
+PROFILER_TOGGLE_KEY = pygame.K_F3
+PROFILER_PHASES = ('fight', 'damage', 'terrain', 'elements', 'player', 'enemies', 'ui', 'debug')
+PROFILER_HISTORY = 120
+PROFILER_POSITION = (750, 660)
+PROFILER_BAR_WIDTH = 200
+PROFILER_FRAME_BUDGET = 1000 / FPS
@@ -0,0 +1,83 @@
+"""
+This module defines the SoundBank class, which decodes every sound once and
+shares it between all the objects playing it.
+
+A sound can be limited to a number of voices (instances playing at once).
+Limited sounds get their own pools of reserved mixer channels, so e.g. a crowd
+of enemies spawning together plays at most a few spawn sounds and never takes
+all the channels from other sounds. When all voices of a sound are busy, the
+next play is skipped.
+
+Usage:
+    sounds.play(SOUND_SPAWN_PATH, SOUND_SPAWN_VOLUME, SOUND_SPAWN_VOICES)
+"""
+import pygame
+from tools.asset_pack import open_content
+from tools.settings import SOUND_FREE_CHANNELS
+
+
+class SoundBank:
+    """
+    Shared decoded sounds with pools of reserved channels for sounds with a limited number of voices.
+    """
+    def __init__(self) -> None:
+        self.sounds = {}
+        self.pools = {}
+        self.reserved = 0
+
+    def load(self, path: str) -> pygame.mixer.Sound:
+        """
+        Get a sound, decoding it on first use.
+
+        :param path: path to the sound file
+        :return: shared sound
+        """
+        sound = self.sounds.get(path)
+        if sound is None:
+            with open_content(path) as file:
+                sound = pygame.mixer.Sound(file)
+            self.sounds[path] = sound
+        return sound
+
+    def play(self, path: str, volume: float = 1.0, voices: int = None, loops: int = 0) -> pygame.mixer.Channel | None:
+        """
+        Play a sound.
+
+        :param path: path to the sound file
+        :param volume: volume of this play
+        :param voices: maximal number of instances of the sound playing at once, None for no limit
+        :param loops: number of repeats, -1 to repeat forever
+        :return: channel playing the sound, or None if all voices are busy
+        """
+        sound = self.load(path)
+        if voices is None:
+            channel = sound.play(loops)
+        else:
+            channel = next((channel for channel in self.pool(path, voices) if not channel.get_busy()), None)
+            if channel is not None:
+                channel.play(sound, loops)
+        if channel is not None:
+            channel.set_volume(volume)
+        return channel
+
+    def pool(self, path: str, voices: int) -> list:
+        """
+        Get reserved channels of a sound, reserving them on first use.
+
+        :param path: path to the sound file
+        :param voices: number of channels
+        :return: list of channels
+        """
+        channels = self.pools.get(path)
+        if channels is None:
+            first = self.reserved
+            self.reserved += voices
+            if pygame.mixer.get_num_channels() < self.reserved + SOUND_FREE_CHANNELS:
+                pygame.mixer.set_num_channels(self.reserved + SOUND_FREE_CHANNELS)
+            pygame.mixer.set_reserved(self.reserved)
+            channels = [pygame.mixer.Channel(index) for index in range(first, self.reserved)]
+            self.pools[path] = channels
+        return channels
+
+
+sounds = SoundBank()
@@ -4,13 +4,14 @@ image processing, and logging.
 
 Functions:
 - `import_csv_file(path)`:
-Imports a CSV file and returns its content as a list.
+Imports a CSV file and returns its content as a list. Reads the asset pack if there is one.
 - `import_cut_graphics(path: str, size: tuple[int, int]) -> list`:
-Loads an image, divides it into tiles, and returns a list of surfaces.
+Loads an image, divides it into tiles, and returns a list of surfaces. Uses the frame cache.
 - `import_character_assets(animations, path, scale: float = SCALE, flip: bool = False)`:
 Imports character animation assets.
 - `import_folder(path: str, scale: float = SCALE, flip: bool = False)`:
 Imports images from a folder, scales and flips them as needed, and returns a list of surfaces.
+Images are decoded on a thread pool and use the frame cache.
 - `get_new_image_size_scale(width: int, new_width: int) -> float`:
 Calculates the scale factor for resizing images.
 - `import_image(path: str) -> pygame.surface.Surface`:
@@ -19,22 +20,31 @@ Imports an image file as a Pygame surface.
 Scales a Pygame surface to a specified size.
 - `create_bar(size, color)`:
 Creates a Pygame surface representing a colored bar of a specified size and color.
+- `render_text(font, text, text_col, antialias=True)`:
+Renders text, reusing surfaces of recently rendered texts from a bounded LRU cache.
+- `text_cache_info()`:
+Returns hit and miss counters of the rendered text cache.
 - `draw_text(surface, text, font, text_col, x, y)`:
 Draws text on a Pygame surface with a specified font, color, and position.
 - `logs_wrapper(func)`:
 A decorator that logs function calls, arguments, and return values to a file.
 - `puts(text)`:
 Logs a message to the console with a timestamp.
+- `set_clock(clock)`:
+Replaces the source of game time returned by `now()`, e.g. with a simulated clock.
 
 This module provides essential functions for handling Pygame graphics,
 image processing, and logging.
 """
+from collections import OrderedDict
 from csv import reader
-from os import walk
+from io import BufferedReader, TextIOWrapper
 from datetime import datetime
 import pygame
 from pygame.math import Vector2
-from tools.settings import SCALE, BUTTON_SIZE
+from tools.settings import SCALE, BUTTON_SIZE, TEXT_CACHE_SIZE
+from tools.loading import ParallelLoader, cached_cut_graphics, read_image
+from tools.asset_pack import open_content
 
 
 def import_csv_file(path) -> list[list]:
@@ -48,7 +58,7 @@ def import_csv_file(path) -> list[list]:
     - list: A list representing the content of the CSV file, where each row is a sub-list.
     """
     terrain_map = []
-    with open(path, encoding='utf-8') as map:
+    with TextIOWrapper(BufferedReader(open_content(path)), encoding='utf-8') as map:
         level = reader(map, delimiter = ',')
         for row in level:
             terrain_map.append(list(row))
@@ -66,24 +76,7 @@ def import_cut_graphics(path: str, size: tuple[int, int]) -> list:
     Returns:
     - list: A list of Pygame surfaces, each representing a tile from the image.
     """
-    surface = pygame.image.load(path).convert_alpha()
-    tile_num_x = int(surface.get_size()[0] / size[0])
-    tile_num_y = int(surface.get_size()[1] / size[1])
-
-    cut_tiles = []
-    for row in range(tile_num_y):
-        for col in range(tile_num_x):
-            x_pos = col * size[0]
-            y_pos = row * size[1]
-            new_surf = pygame.Surface(size, flags = pygame.SRCALPHA)
-            new_surf.blit(
-                surface,
-                (0, 0),
-                pygame.Rect(x_pos, y_pos, size[0], size[1])
-            )
-            cut_tiles.append(new_surf)
-
-    return cut_tiles
+    return [tile.convert_alpha() for tile in cached_cut_graphics(path, size)]
 
 
 def import_character_assets(animations, path,
@@ -100,9 +93,11 @@ def import_character_assets(animations, path,
     Returns:
     - dict: The updated animations dictionary with imported assets.
     """
-    for animation in animations.keys():
-        full_path = path + animation
-        animations[animation] = import_folder(full_path, scale, flip)
+    loader = ParallelLoader()
+    jobs = {animation: loader.folder(path + animation, scale, flip) for animation in animations.keys()}
+    loader.run()
+    for animation, animation_jobs in jobs.items():
+        animations[animation] = loader.frames(animation_jobs)
 
     return animations
 
@@ -119,22 +114,10 @@ def import_folder(path: str, scale: float = SCALE, flip: bool = False):
     Returns:
     - list: A list of Pygame surfaces, each representing an imported and processed image.
     """
-    surface_list = []
-
-    for _, __, image_files in walk(path):
-        for image in sorted(image_files):
-            full_path = path + '/' + image
-
-            image_surf = pygame.image.load(full_path).convert_alpha()
-            if flip:
-                image_surf = pygame.transform.flip(image_surf, True, False)
-            image_surf = scale_image(
-                image_surf,
-                (int(image_surf.get_width()*scale), int(image_surf.get_height()*scale))
-            )
-            surface_list.append(image_surf)
-
-    return surface_list
+    loader = ParallelLoader()
+    jobs = loader.folder(path, scale, flip)
+    loader.run()
+    return loader.frames(jobs)
 
 
 def get_new_image_size_scale(width: int, new_width: int) -> float:
@@ -161,7 +144,7 @@ def import_image(path: str) -> pygame.surface.Surface:
     Returns:
     - pygame.surface.Surface: The loaded image as a Pygame surface.
     """
-    return pygame.image.load(path).convert_alpha()
+    return read_image(path).convert_alpha()
 
 
 def scale_image(image: pygame.surface.Surface, size: tuple[int, int]) -> pygame.surface.Surface:
@@ -212,12 +195,28 @@ def calculate_animation_speed(fps: int, length: int, cooldown: int) -> float:
     return 1 / temp
 
 
+_clock = None
+
+
+def set_clock(clock) -> None:
+    """
+    Replaces the source of game time returned by `now()`.
+
+    Args:
+    - clock (Callable[[], int] | None): function returning milliseconds, or None to use pygame ticks.
+    """
+    global _clock
+    _clock = clock
+
+
 def now() -> int:
     """
 
     Returns:
     - int: ticks
     """
+    if _clock is not None:
+        return _clock()
     return pygame.time.get_ticks()
 
 
@@ -255,6 +254,49 @@ def cursor() -> tuple[int, int]:
 
 
 # Drawing function:
+_text_cache = OrderedDict()
+_text_cache_counters = {'hits': 0, 'misses': 0}
+
+
+def render_text(font, text, text_col, antialias=True) -> pygame.surface.Surface:
+    """
+    Renders text with a font, reusing surfaces of recently rendered texts.
+    The least recently used surface is dropped when the cache is full.
+    Returned surfaces are shared, so they must not be modified.
+
+    Args:
+    - font: The Pygame font for rendering the text.
+    - text (str): The text to be rendered.
+    - text_col: The color of the text.
+    - antialias (bool): Whether the text is antialiased.
+
+    Returns:
+    - pygame.surface.Surface: The rendered text.
+    """
+    key = (font, text, tuple(text_col), antialias)
+    image = _text_cache.get(key)
+    if image is not None:
+        _text_cache.move_to_end(key)
+        _text_cache_counters['hits'] += 1
+        return image
+    _text_cache_counters['misses'] += 1
+    image = font.render(text, antialias, text_col)
+    _text_cache[key] = image
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return image
+
+
+def text_cache_info() -> dict:
+    """
+    Returns statistics of the rendered text cache.
+
+    Returns:
+    - dict: numbers of cache hits and misses and the current size of the cache.
+    """
+    return {**_text_cache_counters, 'size': len(_text_cache)}
+
+
 def draw_text(surface, text, font, text_col, x_pos, y_pos, left=False):
     """
     Draws text on a Pygame surface with a specified font, color, and position.
@@ -266,12 +308,14 @@ def draw_text(surface, text, font, text_col, x_pos, y_pos, left=False):
     - text_col: The color of the text.
     - x (int): The x-coordinate of the text's center.
     - y (int): The y-coordinate of the text's center.
+
+    Returns:
+    - pygame.Rect: The area of the surface changed by the text.
     """
-    img = font.render(text, True, text_col)
+    img = render_text(font, text, text_col)
     if not left:
-        surface.blit(img, (x_pos - img.get_width() / 2, y_pos - img.get_height() / 2))
-    else:
-        surface.blit(img, (x_pos, y_pos))
+        return surface.blit(img, (x_pos - img.get_width() / 2, y_pos - img.get_height() / 2))
+    return surface.blit(img, (x_pos, y_pos))
 
 
 def logs_wrapper(func):